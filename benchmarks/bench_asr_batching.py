@@ -0,0 +1,40 @@
+# benchmarks/bench_asr_batching.py
+import os
+import sys
+import time
+
+# Add the project root to the path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.demo_utils import setup_demo_assets, warmup, run_asr_on_files
+
+AUDIO_FILENAME = os.getenv("ASR_BENCH_AUDIO", "Voice_input.m4a")
+N_FILES = int(os.getenv("ASR_BENCH_FILES", "16"))
+BATCH_SIZES = [int(size) for size in os.getenv("ASR_BENCH_BATCH_SIZES", "1,2,4,8,16").split(",")]
+
+
+if __name__ == "__main__":
+    assets = setup_demo_assets()
+    warmup(['asr', 'xlit', 'ner'])
+    if not assets.get('asr_available'):
+        print(" ERROR: ASR model could not be loaded.")
+        sys.exit(1)
+
+    paths = [AUDIO_FILENAME] * N_FILES
+    # Warm-up pass so the first measured batch size does not pay one-off allocation costs
+    run_asr_on_files(paths[:1], assets, batch_size=1)
+
+    print(f"--- ASR BATCH THROUGHPUT ({N_FILES} x {AUDIO_FILENAME}) ---")
+    print("\t".join(["Batch_Size", "Wall_sec", "Audio_sec", "Audio_sec/Wall_sec", "Mean_Batch_Latency"]))
+    for batch_size in BATCH_SIZES:
+        start = time.perf_counter()
+        results = run_asr_on_files(paths, assets, batch_size=batch_size)
+        wall = time.perf_counter() - start
+
+        failures = [r for r in results if r[0].startswith("ERROR")]
+        if failures:
+            print(f"{batch_size}\tFAILED: {failures[0][0]}")
+            continue
+        audio_sec = sum(r[2] for r in results)
+        print(f"{batch_size}\t{wall:.3f}\t{audio_sec:.1f}\t{audio_sec / wall:.2f}\t"
+              f"{sum(r[1] for r in results) / len(results):.3f}")
@@ -0,0 +1,50 @@
+# benchmarks/bench_asr_pool.py
+import os
+import sys
+import time
+
+# Add the project root to the path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.asr_pool import ASRWorkerPool, _process_memory_kb
+from models.demo_utils import setup_demo_assets, warmup
+
+AUDIO_FILENAME = os.getenv("ASR_POOL_BENCH_AUDIO", "Voice_input.m4a")
+JOBS_PER_WORKER = int(os.getenv("ASR_POOL_BENCH_JOBS_PER_WORKER", "4"))
+CPU_COUNT = os.cpu_count() or 1
+WORKER_COUNTS = [int(count) for count in os.getenv(
+    "ASR_POOL_BENCH_WORKERS", ",".join(str(2 ** i) for i in range(CPU_COUNT.bit_length()) if 2 ** i <= CPU_COUNT)
+).split(",")]
+
+
+if __name__ == "__main__":
+    # Loaded once here; every pool below forks from this process, so no pool pays the load again
+    assets = setup_demo_assets()
+    warmup(['asr', 'xlit'])
+    if not assets.get('asr_available'):
+        print(" ERROR: ASR model could not be loaded.")
+        sys.exit(1)
+    loaded_rss_mb = _process_memory_kb(os.getpid())[0] / 1024
+
+    print(f"--- ASR WORKER POOL ({AUDIO_FILENAME}, {JOBS_PER_WORKER} jobs/worker, {CPU_COUNT} cores, "
+          f"single process with models loaded: {loaded_rss_mb:.0f} MB RSS) ---")
+    print("\t".join(["Workers", "Threads/worker", "Jobs", "Wall_sec", "Jobs/sec", "Audio_sec/Wall_sec",
+                     "Workers_RSS_MB", "Workers_PSS_MB", "Separate_processes_MB"]))
+    for workers in WORKER_COUNTS:
+        with ASRWorkerPool(workers=workers) as pool:
+            pool.map([AUDIO_FILENAME] * workers)  # fork the workers and warm each one
+            jobs = [AUDIO_FILENAME] * (workers * JOBS_PER_WORKER)
+            start = time.perf_counter()
+            results = pool.map(jobs)
+            wall = time.perf_counter() - start
+            memory = pool.memory_stats()
+
+        failures = [result for result in results if result[0].startswith("ERROR")]
+        if failures:
+            print(f"{workers}\tFAILED: {failures[0][0]}")
+            continue
+        audio_sec = sum(result[2] for result in results)
+        # PSS charges each shared page once across the pool; RSS charges it to every worker
+        print(f"{workers}\t{pool.threads_per_worker}\t{len(jobs)}\t{wall:.2f}\t{len(jobs) / wall:.2f}\t"
+              f"{audio_sec / wall:.2f}\t{memory['workers_rss_mb']:.0f}\t{memory['workers_pss_mb']:.0f}\t"
+              f"{workers * loaded_rss_mb:.0f}")
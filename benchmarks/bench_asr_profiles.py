@@ -0,0 +1,84 @@
+# benchmarks/bench_asr_profiles.py
+import io
+import os
+import sys
+import time
+
+# Add the project root to the path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.demo_utils import ASR_CPU_PROFILES, DEMO_ASSETS, setup_demo_assets, run_asr_on_file
+
+AUDIO_FILENAME = os.getenv("ASR_BENCH_AUDIO", "Voice_input.m4a")
+ITERATIONS = int(os.getenv("ASR_PROFILE_BENCH_ITERATIONS", "3"))
+PROFILES = os.getenv("ASR_PROFILE_BENCH_PROFILES", ",".join(ASR_CPU_PROFILES)).split(",")
+REFERENCE_PROFILE = "fp32"
+
+
+def word_error_rate(reference: str, hypothesis: str):
+    """Word-level Levenshtein distance divided by the reference length."""
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / max(1, len(ref))
+
+
+def model_size_mb(model):
+    """Serialized state_dict size, i.e. the weights a process has to hold for this profile."""
+    import torch
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / 1e6
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("nan")
+
+
+if __name__ == "__main__":
+    if REFERENCE_PROFILE in PROFILES:
+        # The reference transcript must exist before WER drift can be computed
+        PROFILES.remove(REFERENCE_PROFILE)
+        PROFILES.insert(0, REFERENCE_PROFILE)
+
+    reference_transcript = None
+    print(f"--- ASR CPU PROFILES ({AUDIO_FILENAME}, {ITERATIONS} runs each) ---")
+    print("\t".join(["Profile", "Load_sec", "Mean_Latency", "RTF", "Model_MB", "RSS_MB", "WER_vs_fp32"]))
+    for profile in PROFILES:
+        assets = setup_demo_assets(asr_profile=profile)
+        DEMO_ASSETS.load('asr')
+        if not assets.get('asr_available'):
+            print(f"{profile}\tFAILED: ASR model could not be loaded.")
+            continue
+
+        transcript, _, audio_duration, _ = run_asr_on_file(AUDIO_FILENAME, assets)  # warm-up
+        if transcript.startswith("ERROR"):
+            print(f"{profile}\tFAILED: {transcript}")
+            continue
+
+        latencies = []
+        for _ in range(ITERATIONS):
+            start = time.perf_counter()
+            transcript, _, audio_duration, _ = run_asr_on_file(AUDIO_FILENAME, assets)
+            latencies.append(time.perf_counter() - start)
+        mean_latency = sum(latencies) / len(latencies)
+
+        if profile == REFERENCE_PROFILE:
+            reference_transcript = transcript
+        drift = word_error_rate(reference_transcript, transcript) if reference_transcript is not None else float("nan")
+
+        print(f"{profile}\t{DEMO_ASSETS.load_times['asr']:.2f}\t{mean_latency:.3f}\t"
+              f"{mean_latency / max(audio_duration, 1e-9):.3f}\t{model_size_mb(assets['asr_model']):.1f}\t"
+              f"{rss_mb():.0f}\t{drift:.3f}")
@@ -0,0 +1,82 @@
+# benchmarks/bench_audio_decode.py
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+import numpy as np
+
+# Add the project root to the path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.audio_utils import ASR_SAMPLING_RATE, decode_audio
+
+SAMPLE_AUDIO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "sample_audio", "Voice_input.m4a")
+SYNTHETIC_MINUTES = float(os.getenv("DECODE_BENCH_MINUTES", "2"))
+REPEATS = int(os.getenv("DECODE_BENCH_REPEATS", "3"))
+
+
+def legacy_decode(path: str):
+    """The original pydub round trip from run_asr_on_file (assumes 16-bit mono)."""
+    from pydub import AudioSegment
+    audio = AudioSegment.from_file(path)
+    if audio.frame_rate != ASR_SAMPLING_RATE:
+        audio = audio.set_frame_rate(ASR_SAMPLING_RATE)
+    return np.array(audio.get_array_of_samples()).astype(np.float32) / 32768.0
+
+
+def write_synthetic_wav(directory: str):
+    """Stereo 44.1 kHz 24-bit WAV of SYNTHETIC_MINUTES minutes (the format the legacy path mishandles)."""
+    import soundfile as sf
+    sr = 44100
+    n = int(SYNTHETIC_MINUTES * 60 * sr)
+    rng = np.random.default_rng(0)
+    stereo = (rng.standard_normal((n, 2)) * 0.1).astype(np.float32)
+    path = os.path.join(directory, "synthetic_stereo_24bit.wav")
+    sf.write(path, stereo, sr, subtype="PCM_24")
+    return path
+
+
+def measure(decoder, source):
+    """Returns (best decode seconds, peak traced bytes, output samples)."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        speech = decoder(source)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    speech = decoder(source)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, len(speech)
+
+
+if __name__ == "__main__":
+    print(f"--- AUDIO DECODE BENCHMARK (best of {REPEATS}) ---")
+    print("\t".join(["Input", "Decoder", "Audio_min", "Decode_sec", "Sec/Audio_min", "Peak_MB/Audio_min"]))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        inputs = [("sample m4a", SAMPLE_AUDIO)]
+        try:
+            inputs.append(("stereo 24-bit wav", write_synthetic_wav(tmp_dir)))
+        except ImportError:
+            print(" soundfile not installed: skipping synthetic WAV input")
+
+        for label, path in inputs:
+            with open(path, "rb") as f:
+                payload = f.read()
+            decoders = [
+                ("legacy pydub", legacy_decode, path),
+                ("decode_audio(path)", decode_audio, path),
+                ("decode_audio(bytes)", decode_audio, payload),
+            ]
+            for name, decoder, source in decoders:
+                try:
+                    seconds, peak, samples = measure(decoder, source)
+                except Exception as e:
+                    print(f"{label}\t{name}\tFAILED: {type(e).__name__}: {e}")
+                    continue
+                minutes = samples / ASR_SAMPLING_RATE / 60 or float("nan")
+                print(f"{label}\t{name}\t{minutes:.2f}\t{seconds:.3f}\t{seconds / minutes:.3f}\t"
+                      f"{peak / 1e6 / minutes:.1f}")
@@ -0,0 +1,59 @@
+# benchmarks/bench_contact_scanner.py
+import os
+import sys
+import time
+
+# Add the project root to the path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_nlp_fast_path import legacy_run_nlp_fast_path
+from models.nlp_core import run_nlp_fast_path
+from models.contact_scanner import scan_contact_fields
+
+ITERATIONS = int(os.getenv("CONTACT_BENCH_ITERATIONS", "2000"))
+
+# Dictated contact details as they come out of ASR
+DICTATED_TRANSCRIPTS = [
+    "Schedule a business visit with Ravi Kumar, his email is ravi dot kumar at gmail dot com.",
+    "Book an operation visit with Asha Rao, number is nine eight two zero double one three four five six.",
+    "Business meeting with Peter Jones, reach him on plus nine one nine eight seven six five four three two one zero.",
+    "Operation visit with Meera Shah regarding KYC, mail meera underscore shah at acme dot co dot in.",
+    "Business visit with John Smith, call 98200 12345 or write to john.smith@example.com.",
+]
+
+
+if __name__ == "__main__":
+    print(f"--- CONTACT SCANNER BENCHMARK ({len(DICTATED_TRANSCRIPTS)} transcripts x {ITERATIONS} iterations) ---")
+    print("\t".join(["Version", "Method", "Lead_Name", "Email", "Phone"]))
+
+    stayed_local = 0
+    for transcript in DICTATED_TRANSCRIPTS:
+        print(f"{transcript}")
+        data = None
+        for version, func in (("legacy", legacy_run_nlp_fast_path), ("now", run_nlp_fast_path)):
+            data, _ = func(transcript)
+            row = data or {}
+            print("\t".join([
+                version, "NLP_RULES" if data else "MERCURY_dLLM",
+                row.get("lead_name", "-"), row.get("email", "-"), row.get("phone_number", "-")
+            ]))
+        if data and (data["email"] != "N/A" or data["phone_number"] != "N/A"):
+            stayed_local += 1
+
+    lowered = [transcript.lower() for transcript in DICTATED_TRANSCRIPTS]
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        for text in lowered:
+            scan_contact_fields(text)
+    scan_latency = (time.perf_counter() - start) / (ITERATIONS * len(lowered))
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        for transcript in DICTATED_TRANSCRIPTS:
+            run_nlp_fast_path(transcript)
+    path_latency = (time.perf_counter() - start) / (ITERATIONS * len(DICTATED_TRANSCRIPTS))
+
+    print("---------------------------------------------------------------")
+    print(f" Contact details extracted on the fast path: {stayed_local}/{len(DICTATED_TRANSCRIPTS)}")
+    print(f" Mean contact scan latency: {scan_latency * 1e6:.2f} us")
+    print(f" Mean full fast path latency: {path_latency * 1e6:.2f} us")
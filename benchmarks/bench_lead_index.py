@@ -0,0 +1,106 @@
+# benchmarks/bench_lead_index.py
+import os
+import sys
+import time
+import random
+import tempfile
+
+# Add the project root to the path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_suite import percentile
+from models.lead_index import LeadIndex, normalize_name
+
+LEAD_COUNT = int(os.getenv("LEAD_BENCH_COUNT", "1000000"))
+QUERY_COUNT = int(os.getenv("LEAD_BENCH_QUERIES", "2000"))
+TOP_K = 5
+
+# Syllables for synthetic romanized Indian names; gives a token vocabulary in the tens of thousands
+ONSETS = ["", "b", "bh", "ch", "d", "dh", "g", "h", "j", "k", "kh", "l", "m", "n", "p", "r", "s", "sh", "t", "v"]
+VOWELS = ["a", "aa", "e", "i", "ee", "o", "u", "oo", "ai"]
+CODAS = ["", "", "n", "r", "l", "sh", "t", "m"]
+COMMON_SURNAMES = ["sharma", "patel", "kumar", "singh", "shah", "gupta", "reddy", "iyer", "nair", "das"]
+HONORIFICS = ["", "", "", "Mr. ", "Mrs. ", "Dr. ", "Shri "]
+VARIANTS = [("sh", "s"), ("aa", "a"), ("ee", "i"), ("oo", "u"), ("bh", "b"), ("v", "w"), ("th", "t")]
+
+
+def synth_token(rng: random.Random):
+    return "".join(rng.choice(ONSETS) + rng.choice(VOWELS) + rng.choice(CODAS) for _ in range(rng.randint(2, 3)))
+
+
+def synth_leads(count: int, rng: random.Random):
+    first_names = [synth_token(rng) for _ in range(20000)]
+    surnames = [synth_token(rng) for _ in range(30000)] + COMMON_SURNAMES * 500
+    for lead_id in range(count):
+        name = f"{rng.choice(HONORIFICS)}{rng.choice(first_names).title()} {rng.choice(surnames).title()}"
+        yield {"name": name, "Lead_ID": f"L{lead_id}", "Status": "Active"}
+
+
+def misspell(name: str, rng: random.Random):
+    """ASR-style corruption: a transliteration variant or a dropped/doubled letter, plus an honorific."""
+    tokens = normalize_name(name)
+    i = rng.randrange(len(tokens))
+    token = tokens[i]
+    applicable = [(a, b) for a, b in VARIANTS if a in token]
+    if applicable and rng.random() < 0.6:
+        a, b = rng.choice(applicable)
+        token = token.replace(a, b, 1)
+    elif len(token) > 3:
+        j = rng.randrange(1, len(token) - 1)
+        token = token[:j] + token[j + 1:] if rng.random() < 0.5 else token[:j] + token[j] + token[j:]
+    tokens[i] = token
+    return rng.choice(HONORIFICS) + " ".join(tokens)
+
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    leads = list(synth_leads(LEAD_COUNT, rng))
+
+    # 1. Build and persist
+    start = time.perf_counter()
+    index = LeadIndex.build(leads)
+    build_sec = time.perf_counter() - start
+    path = os.path.join(tempfile.mkdtemp(), "leads.idx")
+    start = time.perf_counter()
+    index.save(path)
+    save_sec = time.perf_counter() - start
+    del index
+
+    # 2. Memory-mapped load (what each worker does)
+    start = time.perf_counter()
+    index = LeadIndex.load(path)
+    load_ms = 1000 * (time.perf_counter() - start)
+
+    # 3. Lookups: corrupted names of random leads; a hit is any top-k lead with the same normalized name
+    targets = [rng.randrange(LEAD_COUNT) for _ in range(QUERY_COUNT)]
+    queries = [misspell(leads[t]["name"], rng) for t in targets]
+    for query in queries[:50]:
+        index.search(query, TOP_K)  # fault in the hot pages
+
+    latencies, hits_at_1, hits_at_k = [], 0, 0
+    for target, query in zip(targets, queries):
+        start = time.perf_counter()
+        results = index.search(query, TOP_K)
+        latencies.append(time.perf_counter() - start)
+        expected = normalize_name(leads[target]["name"])
+        names = [normalize_name(index.name(lead_id)) for _, lead_id in results]
+        hits_at_1 += bool(names) and names[0] == expected
+        hits_at_k += expected in names
+
+    latencies.sort()
+    print(f"--- LEAD INDEX ({LEAD_COUNT} leads, {QUERY_COUNT} misspelled queries, top-{TOP_K}) ---")
+    print(f"Build: {build_sec:.1f}s, save: {save_sec:.2f}s, file: {os.path.getsize(path) / 2**20:.1f} MiB, "
+          f"mmap load: {load_ms:.2f} ms, vocabulary: {len(index.token_trigram_counts)} tokens")
+    print("\t".join(["p50_us", "p95_us", "p99_us", "max_us", "Recall@1", f"Recall@{TOP_K}"]))
+    print(f"{1e6 * percentile(latencies, 50):.0f}\t{1e6 * percentile(latencies, 95):.0f}\t"
+          f"{1e6 * percentile(latencies, 99):.0f}\t{1e6 * latencies[-1]:.0f}\t"
+          f"{hits_at_1 / QUERY_COUNT:.3f}\t{hits_at_k / QUERY_COUNT:.3f}")
+    os.remove(path)
+
+    # 4. Edge case: an empty lead table round-trips through save/load and matches nothing
+    empty_path = os.path.join(os.path.dirname(path), "empty.idx")
+    LeadIndex.build([]).save(empty_path)
+    empty = LeadIndex.load(empty_path)
+    assert len(empty) == 0 and empty.search("Ravi Kumar") == [] and empty.lookup("Ravi Kumar") is None
+    os.remove(empty_path)
+    print("Empty index save/load: OK")
@@ -0,0 +1,62 @@
+# benchmarks/bench_mercury_streaming.py
+import os
+import sys
+import time
+
+# Add the project root to the path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_suite import summarize
+from benchmarks.mercury_standin import MercuryStandIn, start_standin_server
+from main import get_benchmark_tests
+from models.llm_fallback import MercuryClient, stream_max_tokens
+
+# Stand-in generation model: fixed time-to-first-token plus a per-token cost, as a decoder behaves
+LATENCY_SPEC = os.getenv("STREAM_BENCH_LATENCY", "fixed:0.05")
+TOKEN_LATENCY = float(os.getenv("STREAM_BENCH_TOKEN_LATENCY", "0.004"))
+ITERATIONS = int(os.getenv("STREAM_BENCH_ITERATIONS", "5"))
+MALFORMED_RATE = float(os.getenv("STREAM_BENCH_MALFORMED_RATE", "0.2"))
+REFERENCE_DATE = "2025-01-15"
+EARLY_FIELDS = ("lead_name", "date")
+
+
+def run_mode(stream: bool, transcripts):
+    """Returns per-request total latencies, time to first field and time to lead_name+date, plus failures."""
+    server, url = start_standin_server(MercuryStandIn(latency=LATENCY_SPEC, token_latency=TOKEN_LATENCY,
+                                                      malformed_rate=MALFORMED_RATE, seed=0))
+    client = MercuryClient(api_key="standin", endpoint=url, stream=stream)
+    client.extract(transcripts[0], current_date=REFERENCE_DATE)  # warm the connection pool
+
+    totals, first_field, early_fields, failures = [], [], [], 0
+    for _ in range(ITERATIONS):
+        for transcript in transcripts:
+            arrivals = {}
+            start = time.perf_counter()
+            data, latency = client.extract(transcript, current_date=REFERENCE_DATE,
+                                           on_field=lambda name, _: arrivals.setdefault(name, time.perf_counter() - start))
+            if data is None:
+                failures += 1
+                continue
+            totals.append(latency)
+            # Without streaming nothing is usable before the whole response has been parsed
+            first_field.append(min(arrivals.values()) if arrivals else latency)
+            early_fields.append(max(arrivals[name] for name in EARLY_FIELDS) if arrivals else latency)
+    stats = server.standin.snapshot_stats()
+    client.close()
+    server.shutdown()
+    return totals, first_field, early_fields, failures, stats
+
+
+if __name__ == "__main__":
+    transcripts = [case['transcript'] for case in get_benchmark_tests()]
+    print(f"--- MERCURY STREAMING (stand-in {LATENCY_SPEC} + {1000 * TOKEN_LATENCY:.1f} ms/token, "
+          f"{MALFORMED_RATE:.0%} malformed, {ITERATIONS} x {len(transcripts)} requests, "
+          f"stream max_tokens {stream_max_tokens()}) ---")
+    print("\t".join(["Mode", "Total_p50_ms", "Total_p95_ms", "First_Field_p50_ms",
+                     "Lead+Date_p50_ms", "Failures", "Truncated"]))
+    for mode, stream in (("buffered", False), ("streaming", True)):
+        totals, first_field, early_fields, failures, stats = run_mode(stream, transcripts)
+        total = summarize(totals, 1.0)
+        print(f"{mode}\t{total['p50_ms']:.1f}\t{total['p95_ms']:.1f}\t"
+              f"{summarize(first_field, 1.0)['p50_ms']:.1f}\t"
+              f"{summarize(early_fields, 1.0)['p50_ms']:.1f}\t{failures}\t{stats['truncated']}")
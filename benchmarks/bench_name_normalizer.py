@@ -0,0 +1,72 @@
+# benchmarks/bench_name_normalizer.py
+import os
+import re
+import sys
+import json
+import time
+
+# Add the project root to the path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.demo_utils import setup_demo_assets, warmup, normalize_transcript_names, normalize_transcript_names_batch
+from models.name_normalizer import get_transliteration_memo
+
+ROUNDS = int(os.getenv("XLIT_BENCH_ROUNDS", "50"))
+BATCH_SIZE = int(os.getenv("XLIT_BENCH_BATCH_SIZE", "64"))
+TEST_CASES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "test_cases.json")
+
+
+def legacy_normalize(transcript: str, transliterate, scheme):
+    """Old per-word loop: uncompiled re.match twice and one transliterate call per capitalized word."""
+    normalized_words = []
+    for word in transcript.split():
+        if word[0].isupper() and len(word) > 2 and re.match(r'^[A-Za-z]+$', word):
+            try:
+                normalized_word = transliterate(word, scheme, scheme)
+                if normalized_word and re.match(r'^[A-Za-z\s]+$', normalized_word):
+                    normalized_words.append(normalized_word.capitalize())
+                    continue
+            except Exception:
+                pass
+        normalized_words.append(word)
+    return " ".join(normalized_words)
+
+
+if __name__ == "__main__":
+    assets = setup_demo_assets()
+    warmup(['xlit'])
+    if not assets.get('xlit_engine_available'):
+        print(" ERROR: transliteration engine could not be loaded.")
+        sys.exit(1)
+    transliterate, scheme = assets['xlit_transliterate'], assets['xlit_scheme']
+
+    with open(TEST_CASES_PATH) as f:
+        transcripts = [case['transcript'] for case in json.load(f)] * ROUNDS
+    tokens = sum(len(transcript.split()) for transcript in transcripts)
+
+    # 1. Legacy: every transcript, every word, every time
+    start = time.perf_counter()
+    legacy = [legacy_normalize(transcript, transliterate, scheme) for transcript in transcripts]
+    legacy_sec = time.perf_counter() - start
+
+    # 2. Memoized, one transcript at a time (cold memo)
+    memo = get_transliteration_memo()
+    memo.clear()
+    start = time.perf_counter()
+    single = [normalize_transcript_names(transcript) for transcript in transcripts]
+    single_sec = time.perf_counter() - start
+
+    # 3. Memoized batch entry point (cold memo), distinct words deduplicated per batch
+    memo.clear()
+    start = time.perf_counter()
+    batched = []
+    for batch_start in range(0, len(transcripts), BATCH_SIZE):
+        batched.extend(normalize_transcript_names_batch(transcripts[batch_start:batch_start + BATCH_SIZE]))
+    batched_sec = time.perf_counter() - start
+
+    print(f"--- NAME NORMALIZATION ({len(transcripts)} transcripts, {tokens} tokens) ---")
+    print("\t".join(["Mode", "Total_ms", "Tokens/sec"]))
+    print(f"legacy per-word\t{1000 * legacy_sec:.1f}\t{tokens / legacy_sec:,.0f}")
+    print(f"memoized single\t{1000 * single_sec:.1f}\t{tokens / single_sec:,.0f}")
+    print(f"memoized batch ({BATCH_SIZE})\t{1000 * batched_sec:.1f}\t{tokens / batched_sec:,.0f}")
+    print(f"Outputs identical to legacy: {legacy == single == batched}; memo: {memo.snapshot_stats()}")
@@ -0,0 +1,95 @@
+# benchmarks/bench_nlp_fast_path.py
+import os
+import re
+import sys
+import time
+
+# Add the project root to the path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import get_benchmark_tests
+from models.nlp_core import (
+    COMPLEX_PATTERNS, START_MARKERS, STOP_MARKERS, run_nlp_fast_path, run_nlp_fast_path_batch
+)
+from models.schema import VisitDetails
+
+ITERATIONS = int(os.getenv("NLP_BENCH_ITERATIONS", "2000"))
+
+
+# --- LEGACY IMPLEMENTATION (reference for output parity and speedup) ---
+
+def legacy_run_nlp_fast_path(transcript: str):
+    """The original per-pattern / list-scan fast path, kept verbatim for comparison."""
+    start_time = time.perf_counter()
+    nlp_output = {field: "N/A" for field in VisitDetails.model_fields.keys()}
+
+    for pattern in COMPLEX_PATTERNS:
+        if re.search(pattern, transcript, re.IGNORECASE):
+            return None, (time.perf_counter() - start_time)
+
+    words = transcript.lower().split()
+    name_candidate = "N/A"
+
+    for marker in START_MARKERS:
+        if marker in words:
+            start_index = words.index(marker) + 1
+            name_words = []
+            for word in words[start_index:]:
+                if word in STOP_MARKERS:
+                    break
+                name_words.append(word)
+            if name_words:
+                name_candidate = ' '.join(name_words).title()
+                break
+
+    visit_type_match = False
+    if re.search(r'\b(business)\b', transcript, re.IGNORECASE):
+        nlp_output['visit_type'] = "BUSINESS"
+        visit_type_match = True
+    elif re.search(r'\b(operation)\b', transcript, re.IGNORECASE):
+        nlp_output['visit_type'] = "OPERATION"
+        visit_type_match = True
+
+    if name_candidate != "N/A" and visit_type_match:
+        nlp_output['lead_name'] = name_candidate
+        nlp_output['title'] = transcript[:40].strip() + "..."
+        return nlp_output, (time.perf_counter() - start_time)
+
+    return None, (time.perf_counter() - start_time)
+
+
+def time_throughput(func, transcripts, iterations):
+    """Returns transcripts/sec for `func` over `iterations` passes of the corpus."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(transcripts)
+    elapsed = time.perf_counter() - start
+    return (len(transcripts) * iterations) / elapsed
+
+
+if __name__ == "__main__":
+    transcripts = [case['transcript'] for case in get_benchmark_tests()]
+    if not transcripts:
+        sys.exit(1)
+
+    # 1. Output parity on tests/test_cases.json
+    legacy_outputs = [legacy_run_nlp_fast_path(t)[0] for t in transcripts]
+    # resolve_temporal=False runs the legacy rule set (no temporal resolution, contact scan or strict names)
+    batch_outputs, batch_latencies = run_nlp_fast_path_batch(transcripts, resolve_temporal=False)
+    mismatches = [i + 1 for i, (a, b) in enumerate(zip(legacy_outputs, batch_outputs)) if a != b]
+
+    print(f"--- NLP FAST PATH BENCHMARK ({len(transcripts)} cases x {ITERATIONS} iterations) ---")
+    print(f" Output parity: {'IDENTICAL' if not mismatches else f'MISMATCH on cases {mismatches}'}")
+
+    # 2. Throughput
+    legacy_tps = time_throughput(lambda ts: [legacy_run_nlp_fast_path(t) for t in ts], transcripts, ITERATIONS)
+    single_tps = time_throughput(lambda ts: [run_nlp_fast_path(t, resolve_temporal=False) for t in ts], transcripts, ITERATIONS)
+    # A convenience loop over the single path: expect the same rate, it shares no work between items
+    batch_tps = time_throughput(lambda ts: run_nlp_fast_path_batch(ts, resolve_temporal=False), transcripts, ITERATIONS)
+
+    print(f" Legacy:        {legacy_tps:12,.0f} transcripts/sec")
+    print(f" Compiled:      {single_tps:12,.0f} transcripts/sec ({single_tps / legacy_tps:.2f}x)")
+    print(f" Compiled batch:{batch_tps:12,.0f} transcripts/sec ({batch_tps / legacy_tps:.2f}x)")
+    print(f" Mean per-item latency (batch): {sum(batch_latencies) / len(batch_latencies) * 1e6:.2f} us")
+
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,105 @@
+# benchmarks/bench_silence_trim.py
+import io
+import os
+import sys
+import time
+import difflib
+import numpy as np
+
+# Add the project root to the path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import demo_utils
+from models.demo_utils import setup_demo_assets, warmup, run_asr_on_file, _load_audio_source
+from models.audio_utils import (
+    ASR_SAMPLING_RATE, WHISPER_WINDOW_SEC, detect_speech_regions, plan_asr_windows, trim_silence
+)
+
+AUDIO_FILENAME = os.getenv("TRIM_BENCH_AUDIO", "Voice_input.m4a")
+ITERATIONS = int(os.getenv("TRIM_BENCH_ITERATIONS", "3"))
+# Background noise of the inserted silence (field recordings are never digitally silent)
+NOISE_DBFS = -60.0
+
+
+def silence(seconds: float, rng):
+    return (rng.standard_normal(int(seconds * ASR_SAMPLING_RATE)) * 10 ** (NOISE_DBFS / 20)).astype(np.float32)
+
+
+def field_recordings(speech: np.ndarray):
+    """The sample note as recorded, with long lead-in/tail silence, and as a long note with pauses."""
+    rng = np.random.default_rng(0)
+    return [
+        ("sample as-is", speech),
+        ("6s lead + 6s tail", np.concatenate([silence(6, rng), speech, silence(6, rng)])),
+        ("3 notes, 10s pauses", np.concatenate([silence(5, rng), speech, silence(10, rng), speech,
+                                                silence(10, rng), speech, silence(5, rng)])),
+    ]
+
+
+def decode_passes(speech: np.ndarray, trimmed: bool):
+    """Number of 30 s Whisper encoder passes the buffer costs."""
+    if trimmed:
+        speech, offset_map = trim_silence(speech, ASR_SAMPLING_RATE)
+        if len(speech) / ASR_SAMPLING_RATE <= WHISPER_WINDOW_SEC:
+            return 1
+        return len(plan_asr_windows(offset_map.trimmed_regions(), ASR_SAMPLING_RATE))
+    if len(speech) / ASR_SAMPLING_RATE <= WHISPER_WINDOW_SEC:
+        return 1
+    return len(plan_asr_windows(detect_speech_regions(speech, ASR_SAMPLING_RATE), ASR_SAMPLING_RATE))
+
+
+def to_wav_bytes(speech: np.ndarray):
+    import soundfile as sf
+    buffer = io.BytesIO()
+    sf.write(buffer, speech, ASR_SAMPLING_RATE, format="WAV", subtype="FLOAT")
+    return buffer.getvalue()
+
+
+def word_drift(reference: str, hypothesis: str):
+    """1 - word-level similarity of the two transcripts (0.0 = identical words)."""
+    return 1.0 - difflib.SequenceMatcher(None, reference.lower().split(), hypothesis.lower().split()).ratio()
+
+
+def timed_asr(audio: bytes, assets, trim: bool):
+    demo_utils.ASR_TRIM_SILENCE = trim
+    latencies = []
+    for _ in range(ITERATIONS):
+        transcript, latency, audio_duration, speech_duration = run_asr_on_file(audio, assets)
+        latencies.append(latency)
+    return transcript, float(np.median(latencies)), speech_duration
+
+
+if __name__ == "__main__":
+    sample, error = _load_audio_source(AUDIO_FILENAME)
+    if error:
+        print(f" ERROR: {error}")
+        sys.exit(1)
+    recordings = field_recordings(sample)
+
+    # 1. VAD / trimming cost and the work it removes (no model needed)
+    print(f"--- SILENCE TRIMMING ({AUDIO_FILENAME}) ---")
+    print("\t".join(["Recording", "File_sec", "Speech_sec", "Removed", "Trim_ms", "Passes_raw", "Passes_trimmed"]))
+    for name, speech in recordings:
+        start = time.perf_counter()
+        trimmed, _ = trim_silence(speech, ASR_SAMPLING_RATE)
+        trim_ms = 1000 * (time.perf_counter() - start)
+        print(f"{name}\t{len(speech) / ASR_SAMPLING_RATE:.2f}\t{len(trimmed) / ASR_SAMPLING_RATE:.2f}\t"
+              f"{1 - len(trimmed) / len(speech):.0%}\t{trim_ms:.2f}\t"
+              f"{decode_passes(speech, False)}\t{decode_passes(speech, True)}")
+
+    # 2. End-to-end ASR latency and transcript drift, untrimmed vs trimmed
+    assets = setup_demo_assets()
+    warmup(['asr', 'xlit'])
+    if not assets.get('asr_available'):
+        print(" ERROR: ASR model could not be loaded.")
+        sys.exit(1)
+    run_asr_on_file(to_wav_bytes(sample), assets)  # warm-up
+
+    print(f"\n--- ASR LATENCY (median of {ITERATIONS}) ---")
+    print("\t".join(["Recording", "Raw_sec", "Trimmed_sec", "Speedup", "Word_Drift"]))
+    for name, speech in recordings:
+        audio = to_wav_bytes(speech)
+        raw_text, raw_latency, _ = timed_asr(audio, assets, trim=False)
+        trimmed_text, trimmed_latency, _ = timed_asr(audio, assets, trim=True)
+        print(f"{name}\t{raw_latency:.3f}\t{trimmed_latency:.3f}\t{raw_latency / trimmed_latency:.2f}x\t"
+              f"{word_drift(raw_text, trimmed_text):.1%}")
@@ -0,0 +1,59 @@
+# benchmarks/bench_startup.py
+import os
+import sys
+import json
+import subprocess
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AUDIO_FILENAME = os.getenv("STARTUP_BENCH_AUDIO", "Voice_input.m4a")
+
+# Each scenario runs in a fresh interpreter so module and model caches start cold
+SCENARIO_TEMPLATE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+import models.demo_utils as demo_utils
+t_import = time.perf_counter() - t0
+t1 = time.perf_counter()
+assets = demo_utils.setup_demo_assets(eager={eager})
+t_setup = time.perf_counter() - t1
+transcript = None
+if {transcribe}:
+    transcript, _, _, _ = demo_utils.run_asr_on_file({audio!r}, assets)
+print(json.dumps({{
+    "import_sec": t_import,
+    "setup_sec": t_setup,
+    "first_transcript_sec": time.perf_counter() - t0,
+    "load_times": assets.load_times,
+    "transcript": transcript,
+}}))
+"""
+
+
+def run_scenario(eager: bool, transcribe: bool):
+    code = SCENARIO_TEMPLATE.format(root=PROJECT_ROOT, eager=eager, transcribe=transcribe, audio=AUDIO_FILENAME)
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=PROJECT_ROOT)
+    if completed.returncode != 0:
+        print(completed.stderr.strip().splitlines()[-1] if completed.stderr else "scenario failed")
+        return None
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    print("--- STARTUP BENCHMARK (fresh interpreter per scenario) ---")
+
+    scenarios = [
+        ("Import only (lazy)", False, False),
+        ("Eager setup, no transcript", True, False),
+        ("Lazy: time-to-first-transcript", False, True),
+        ("Eager: time-to-first-transcript", True, True),
+    ]
+    for label, eager, transcribe in scenarios:
+        result = run_scenario(eager, transcribe)
+        if result is None:
+            print(f" {label}: FAILED")
+            continue
+        load_times = ", ".join(f"{name}={sec:.2f}s" for name, sec in sorted(result["load_times"].items())) or "none"
+        print(f" {label}:")
+        print(f"   import {result['import_sec']:.3f}s | setup {result['setup_sec']:.3f}s | "
+              f"total {result['first_transcript_sec']:.3f}s | components loaded: {load_times}")
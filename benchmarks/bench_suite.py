@@ -0,0 +1,294 @@
+# benchmarks/bench_suite.py
+"""
+Latency benchmark suite with percentiles and a regression baseline.
+
+    python benchmarks/bench_suite.py                              # run and print
+    python benchmarks/bench_suite.py --save benchmarks/baseline.json
+    python benchmarks/bench_suite.py --compare benchmarks/baseline.json   # exit 1 on regression
+
+Each stage runs BENCH_REPEATS times; the report keeps the median of every percentile across the
+repeats and its interquartile range, and --compare only flags a change larger than both that measured
+noise and a fraction of the baseline median.
+
+With PIPELINE_TELEMETRY=1 the per-stage histograms are embedded in the saved report and
+--metrics-out writes them in Prometheus text format.
+
+Stages: nlp (fast path), mercury (fallback client), asr, hybrid (full pipeline).
+Mercury and hybrid need MERCURY_API_ENDPOINT / MERCURY_API_KEY, or BENCH_MERCURY_STANDIN=1 to
+serve them from an in-process benchmarks/mercury_standin.py (latency via MERCURY_STANDIN_LATENCY);
+stages whose dependencies are unavailable are reported as skipped.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the project root to the path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import get_benchmark_tests, run_hybrid_extraction_pipeline
+from models.nlp_core import run_nlp_fast_path
+from models import telemetry
+
+# --- Suite knobs (overridable via environment) ---
+BENCH_STAGES = os.getenv("BENCH_STAGES", "nlp,mercury,asr,hybrid").split(",")
+BENCH_WARMUP = int(os.getenv("BENCH_WARMUP", "2"))
+BENCH_ITERATIONS = int(os.getenv("BENCH_ITERATIONS", "20"))
+BENCH_CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", "1"))
+BENCH_REFERENCE_DATE = os.getenv("BENCH_REFERENCE_DATE", "2025-01-15")
+BENCH_ASR_AUDIO = os.getenv("BENCH_ASR_AUDIO", "Voice_input.m4a")
+BENCH_ASR_ITERATIONS = int(os.getenv("BENCH_ASR_ITERATIONS", "3"))
+BENCH_MERCURY_STANDIN = os.getenv("BENCH_MERCURY_STANDIN", "0") == "1"
+# Independent runs per stage; percentiles are reported as the median across them
+BENCH_REPEATS = int(os.getenv("BENCH_REPEATS", "5"))
+# A percentile regresses when its median grows by more than
+#   max(THRESHOLD x baseline median, IQR_FACTOR x the larger run-to-run IQR, MIN_MS)
+# so the allowance scales with each stage: a 20 us nlp stage and a 3 s ASR stage are judged alike.
+# MIN_MS only absorbs timer granularity.
+BENCH_REGRESSION_THRESHOLD = float(os.getenv("BENCH_REGRESSION_THRESHOLD", "0.20"))
+BENCH_REGRESSION_IQR_FACTOR = float(os.getenv("BENCH_REGRESSION_IQR_FACTOR", "1.5"))
+BENCH_REGRESSION_MIN_MS = float(os.getenv("BENCH_REGRESSION_MIN_MS", "0.005"))
+COMPARED_PERCENTILES = ("p50_ms", "p95_ms", "p99_ms")
+
+
+# --- STATISTICS ---
+
+def percentile(sorted_samples, q: float):
+    """Linear-interpolated percentile of an already sorted list (q in [0, 100])."""
+    if not sorted_samples:
+        return float("nan")
+    position = (len(sorted_samples) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    return sorted_samples[lower] + (sorted_samples[upper] - sorted_samples[lower]) * (position - lower)
+
+
+def summarize(latencies, wall_sec: float):
+    """Latency samples (seconds) -> count, throughput and millisecond percentiles."""
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "throughput_per_sec": len(ordered) / wall_sec if wall_sec > 0 else float("nan"),
+        "mean_ms": 1000 * sum(ordered) / len(ordered) if ordered else float("nan"),
+        "p50_ms": 1000 * percentile(ordered, 50),
+        "p95_ms": 1000 * percentile(ordered, 95),
+        "p99_ms": 1000 * percentile(ordered, 99),
+        "max_ms": 1000 * ordered[-1] if ordered else float("nan"),
+    }
+
+
+def combine_repeats(summaries):
+    """
+    Per-repeat stage summaries -> the repeat with the median p50 (for its extra fields), with every
+    compared percentile replaced by its median across repeats and a `<percentile>_iqr` spread added.
+    """
+    if any("skipped" in summary for summary in summaries):
+        return next(summary for summary in summaries if "skipped" in summary)
+    ordered = sorted(summaries, key=lambda summary: summary["p50_ms"])
+    combined = dict(ordered[(len(ordered) - 1) // 2])
+    for key in COMPARED_PERCENTILES:
+        values = sorted(summary[key] for summary in summaries)
+        combined[key] = percentile(values, 50)
+        combined[f"{key}_iqr"] = percentile(values, 75) - percentile(values, 25)
+    combined["repeats"] = len(summaries)
+    return combined
+
+
+def run_timed(func, items, iterations: int, warmup: int, concurrency: int):
+    """
+    Calls `func(item)` over `items` for `warmup` untimed and `iterations` timed rounds.
+    Returns (per-call latencies, per-call results of the timed rounds, wall-clock seconds).
+    """
+    def timed_call(item):
+        start = time.perf_counter()
+        result = func(item)
+        return time.perf_counter() - start, result
+
+    workload = list(items)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for _ in range(warmup):
+            list(executor.map(timed_call, workload))
+        start = time.perf_counter()
+        outcomes = list(executor.map(timed_call, workload * iterations))
+        wall_sec = time.perf_counter() - start
+    return [latency for latency, _ in outcomes], [result for _, result in outcomes], wall_sec
+
+
+# --- STAGES ---
+# Each stage returns a summary dict, or {"skipped": reason}
+
+def bench_nlp_stage(transcripts):
+    latencies, results, wall_sec = run_timed(
+        lambda transcript: run_nlp_fast_path(transcript, reference_date=BENCH_REFERENCE_DATE),
+        transcripts, BENCH_ITERATIONS, BENCH_WARMUP, BENCH_CONCURRENCY
+    )
+    summary = summarize(latencies, wall_sec)
+    summary["hit_rate"] = sum(1 for data, _ in results if data) / len(results)
+    return summary
+
+
+def _mercury_configured():
+    from config import MERCURY_API_KEY, MERCURY_API_ENDPOINT
+    return BENCH_MERCURY_STANDIN or bool(MERCURY_API_KEY and MERCURY_API_ENDPOINT)
+
+
+def bench_mercury_stage(transcripts):
+    if not _mercury_configured():
+        return {"skipped": "MERCURY_API_ENDPOINT / MERCURY_API_KEY not set"}
+    from models.llm_fallback import extract_via_mercury_fallback
+    latencies, results, wall_sec = run_timed(
+        lambda transcript: extract_via_mercury_fallback(transcript, current_date=BENCH_REFERENCE_DATE),
+        transcripts, BENCH_ITERATIONS, BENCH_WARMUP, BENCH_CONCURRENCY
+    )
+    summary = summarize(latencies, wall_sec)
+    summary["success_rate"] = sum(1 for data, _ in results if data) / len(results)
+    return summary
+
+
+def bench_asr_stage(_transcripts):
+    from models.demo_utils import setup_demo_assets, warmup, run_asr_on_file
+    assets = setup_demo_assets()
+    warmup(['asr', 'xlit'])
+    if not assets.get('asr_available'):
+        return {"skipped": "ASR model could not be loaded"}
+    latencies, results, wall_sec = run_timed(
+        lambda audio: run_asr_on_file(audio, assets), [BENCH_ASR_AUDIO], BENCH_ASR_ITERATIONS, 1, 1
+    )
+    if any(result[0].startswith("ERROR") for result in results):
+        return {"skipped": results[0][0]}
+    summary = summarize(latencies, wall_sec)
+    summary["rtf"] = (sum(latencies) / len(latencies)) / max(results[0][2], 1e-9)
+    return summary
+
+
+def bench_hybrid_stage(transcripts):
+    if not _mercury_configured():
+        return {"skipped": "MERCURY_API_ENDPOINT / MERCURY_API_KEY not set"}
+    # The extraction cache would turn every repetition after the first into a cache hit
+    latencies, results, wall_sec = run_timed(
+        lambda transcript: run_hybrid_extraction_pipeline(transcript, BENCH_REFERENCE_DATE, use_cache=False),
+        transcripts, BENCH_ITERATIONS, BENCH_WARMUP, BENCH_CONCURRENCY
+    )
+    summary = summarize(latencies, wall_sec)
+    summary["hit_rate"] = sum(1 for metrics in results if metrics["method"] == "NLP_RULES") / len(results)
+    summary["success_rate"] = sum(1 for metrics in results if metrics["success"]) / len(results)
+
+    # Per-method breakdown (fast path vs fallback)
+    by_method = {}
+    for latency, metrics in zip(latencies, results):
+        by_method.setdefault(metrics["method"], []).append(latency)
+    summary["methods"] = {method: summarize(samples, wall_sec) for method, samples in by_method.items()}
+    return summary
+
+
+STAGE_RUNNERS = {
+    "nlp": bench_nlp_stage,
+    "mercury": bench_mercury_stage,
+    "asr": bench_asr_stage,
+    "hybrid": bench_hybrid_stage,
+}
+
+
+# --- BASELINE COMPARISON ---
+
+def compare_to_baseline(report: dict, baseline: dict, threshold: float = BENCH_REGRESSION_THRESHOLD,
+                        min_ms: float = BENCH_REGRESSION_MIN_MS, iqr_factor: float = BENCH_REGRESSION_IQR_FACTOR):
+    """Returns a list of human-readable regressions (empty when every shared stage is within threshold)."""
+    regressions = []
+    for stage, current in report["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if not previous or "skipped" in current or "skipped" in previous:
+            continue
+        for key in COMPARED_PERCENTILES:
+            before, after = previous[key], current[key]
+            # Baselines saved before repeats were recorded carry no spread
+            noise = iqr_factor * max(previous.get(f"{key}_iqr", 0.0), current.get(f"{key}_iqr", 0.0))
+            if after - before > max(threshold * before, noise, min_ms):
+                regressions.append(f"{stage}.{key}: {before:.3f} -> {after:.3f} ms (+{100 * (after / before - 1):.0f}%)")
+    return regressions
+
+
+def print_report(report: dict):
+    print(f"--- BENCHMARK SUITE ({report['config']['iterations']} iterations x {report['config']['repeats']} repeats, "
+          f"concurrency {report['config']['concurrency']}; median across repeats) ---")
+    print("\t".join(["Stage", "Count", "Throughput/s", "p50_ms", "p95_ms", "p99_ms", "p99_iqr_ms", "Extra"]))
+    for stage, summary in report["stages"].items():
+        if "skipped" in summary:
+            print(f"{stage}\tSKIPPED: {summary['skipped']}")
+            continue
+        extras = ", ".join(f"{key}={summary[key]:.3f}" for key in ("hit_rate", "success_rate", "rtf") if key in summary)
+        print(f"{stage}\t{summary['count']}\t{summary['throughput_per_sec']:.1f}\t{summary['p50_ms']:.3f}\t"
+              f"{summary['p95_ms']:.3f}\t{summary['p99_ms']:.3f}\t{summary['p99_ms_iqr']:.3f}\t{extras}")
+        for method, method_summary in summary.get("methods", {}).items():
+            print(f"  {method}\t{method_summary['count']}\t-\t{method_summary['p50_ms']:.3f}\t"
+                  f"{method_summary['p95_ms']:.3f}\t{method_summary['p99_ms']:.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latency benchmark suite")
+    parser.add_argument("--save", help="write the results to this JSON baseline file")
+    parser.add_argument("--compare", help="compare against this JSON baseline; exit 1 on regression")
+    parser.add_argument("--metrics-out", help="write per-stage telemetry in Prometheus text format (PIPELINE_TELEMETRY=1)")
+    args = parser.parse_args()
+
+    TEST_CASES = get_benchmark_tests()
+    if not TEST_CASES:
+        sys.exit(1)
+    transcripts = [case['transcript'] for case in TEST_CASES]
+
+    standin_server = None
+    if BENCH_MERCURY_STANDIN:
+        from benchmarks.mercury_standin import MercuryStandIn, start_standin_server
+        from models.llm_fallback import MercuryClient, set_mercury_client
+        # Fixed seed: injected latencies are identical between the baseline run and the compared run
+        standin_server, standin_url = start_standin_server(MercuryStandIn(seed=0))
+        set_mercury_client(MercuryClient(api_key="standin", endpoint=standin_url))
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "iterations": BENCH_ITERATIONS, "warmup": BENCH_WARMUP, "concurrency": BENCH_CONCURRENCY,
+            "repeats": BENCH_REPEATS,
+            "reference_date": BENCH_REFERENCE_DATE, "cases": len(transcripts),
+            "mercury_standin": BENCH_MERCURY_STANDIN,
+            "python": platform.python_version(), "machine": platform.machine(), "cpu_count": os.cpu_count(),
+        },
+        "stages": {},
+    }
+    for stage in BENCH_STAGES:
+        runner = STAGE_RUNNERS.get(stage.strip())
+        if runner is None:
+            print(f" WARNING: unknown stage '{stage}' (choose from {', '.join(STAGE_RUNNERS)})")
+            continue
+        report["stages"][stage.strip()] = combine_repeats([runner(transcripts) for _ in range(max(1, BENCH_REPEATS))])
+
+    if standin_server:
+        report["standin_stats"] = standin_server.standin.snapshot_stats()
+        standin_server.shutdown()
+    if telemetry.is_enabled():
+        report["telemetry"] = telemetry.REGISTRY.snapshot()
+        if args.metrics_out:
+            with open(args.metrics_out, "w") as f:
+                f.write(telemetry.export_prometheus())
+    print_report(report)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline)
+        if regressions:
+            print(f"REGRESSIONS vs {args.compare} (max of {100 * BENCH_REGRESSION_THRESHOLD:.0f}% of the baseline, "
+                  f"{BENCH_REGRESSION_IQR_FACTOR:g}x IQR, {BENCH_REGRESSION_MIN_MS:g} ms):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"No regressions vs {args.compare}.")
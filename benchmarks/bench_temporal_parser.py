@@ -0,0 +1,61 @@
+# benchmarks/bench_temporal_parser.py
+import os
+import sys
+import time
+from datetime import datetime
+
+# Add the project root to the path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import get_benchmark_tests
+from models.nlp_core import run_nlp_fast_path, TEMPORAL_TRIGGER_RE
+from models.temporal_parser import resolve_temporal_expressions
+
+REFERENCE_DATE = os.getenv("TEMPORAL_BENCH_REFERENCE_DATE", datetime.now().strftime("%Y-%m-%d"))
+ITERATIONS = int(os.getenv("TEMPORAL_BENCH_ITERATIONS", "1000"))
+
+
+if __name__ == "__main__":
+    TEST_CASES = get_benchmark_tests()
+    if not TEST_CASES:
+        sys.exit(1)
+
+    print(f"--- LOCAL TEMPORAL PARSER BENCHMARK (reference date {REFERENCE_DATE}) ---")
+    print("\t".join(["Test_ID", "Expected", "Now", "Date", "Start_Time", "End_Time", "Transcript"]))
+
+    moved = 0
+    resolved = 0
+    llm_expected = 0
+    for i, test_case in enumerate(TEST_CASES):
+        transcript = test_case['transcript']
+        legacy_data, _ = run_nlp_fast_path(transcript, resolve_temporal=False)
+        data, _ = run_nlp_fast_path(transcript, reference_date=REFERENCE_DATE)
+        now_method = "NLP_RULES" if data else "MERCURY_dLLM"
+
+        if not legacy_data:
+            llm_expected += 1
+            moved += data is not None
+            # Temporal data resolved locally even if another rule (e.g. missing visit type) still needs the LLM
+            lowered = transcript.lower()
+            trigger_spans = [match.span() for match in TEMPORAL_TRIGGER_RE.finditer(lowered)]
+            resolved += resolve_temporal_expressions(lowered, trigger_spans, REFERENCE_DATE)[0] is not None
+
+        row = data or {}
+        print("\t".join([
+            str(test_case.get('id', i + 1)), test_case.get('expected_method', 'N/A'), now_method,
+            row.get('date', '-'), row.get('start_time', '-'), row.get('end_time', '-'), transcript
+        ]))
+
+    # Per-transcript cost of resolving temporal expressions locally
+    transcripts = [test_case['transcript'] for test_case in TEST_CASES]
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        for transcript in transcripts:
+            run_nlp_fast_path(transcript, reference_date=REFERENCE_DATE)
+    mean_latency = (time.perf_counter() - start) / (ITERATIONS * len(transcripts))
+
+    print("---------------------------------------------------------------")
+    print(f" Moved from MERCURY_dLLM to the local path: {moved}/{llm_expected} "
+          f"({(moved / llm_expected * 100) if llm_expected else 0:.1f}%)")
+    print(f" Temporal expressions resolved locally in LLM-bound cases: {resolved}/{llm_expected}")
+    print(f" Mean fast path latency with temporal resolution: {mean_latency * 1e6:.2f} us")
@@ -0,0 +1,106 @@
+# benchmarks/bench_transcript_cache.py
+import io
+import os
+import sys
+import time
+import atexit
+import random
+import shutil
+import tempfile
+import subprocess
+
+# Own cache file in a private (0700) temp dir, inherited by the fresh-process child, so the run
+# neither reads nor pollutes the user's cache
+if "TRANSCRIPT_CACHE_DB_PATH" not in os.environ:
+    BENCH_CACHE_DIR = tempfile.mkdtemp(prefix="bench_transcripts_")
+    atexit.register(shutil.rmtree, BENCH_CACHE_DIR, True)
+    os.environ["TRANSCRIPT_CACHE_DB_PATH"] = os.path.join(BENCH_CACHE_DIR, "transcripts.sqlite3")
+
+# Add the project root to the path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import soundfile as sf
+from models.audio_utils import ASR_SAMPLING_RATE
+from models.demo_utils import DEMO_ASSETS, setup_demo_assets, warmup, run_asr_on_file, _load_audio_source
+from models.transcript_cache import get_transcript_cache
+
+AUDIO_FILENAME = os.getenv("TRANSCRIPT_CACHE_BENCH_AUDIO", "Voice_input.m4a")
+DISTINCT_CLIPS = int(os.getenv("TRANSCRIPT_CACHE_BENCH_CLIPS", "4"))
+REQUESTS = int(os.getenv("TRANSCRIPT_CACHE_BENCH_REQUESTS", "20"))
+
+
+def build_workload(speech):
+    """
+    Distinct recordings (gain variants of the sample, so their PCM differs) and a request stream
+    in which they come back the way retries, re-uploads and backfills resubmit them.
+    """
+    clips = []
+    for i in range(DISTINCT_CLIPS):
+        buffer = io.BytesIO()
+        sf.write(buffer, speech * (1.0 - 0.05 * i), ASR_SAMPLING_RATE, format="WAV", subtype="FLOAT")
+        clips.append(buffer.getvalue())
+    rng = random.Random(7)
+    requests = list(range(DISTINCT_CLIPS)) + [rng.randrange(DISTINCT_CLIPS) for _ in range(REQUESTS - DISTINCT_CLIPS)]
+    rng.shuffle(requests)
+    return clips, requests
+
+
+def run_requests(clips, requests, use_cache: bool):
+    start = time.perf_counter()
+    for index in requests:
+        transcript = run_asr_on_file(clips[index], DEMO_ASSETS, use_cache=use_cache)[0]
+        if transcript.startswith("ERROR"):
+            print(f" {transcript}")
+            sys.exit(1)
+    return time.perf_counter() - start
+
+
+def fresh_process_hit(clip_path: str):
+    """Child process: one cached request with lazy assets. Prints wall time and whether the model loaded."""
+    start = time.perf_counter()
+    transcript = run_asr_on_file(clip_path, setup_demo_assets())[0]
+    print(f"{time.perf_counter() - start:.3f}\t{DEMO_ASSETS.is_loaded('asr')}\t{transcript[:40]}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--fresh-process":
+        fresh_process_hit(sys.argv[2])
+        sys.exit(0)
+
+    speech, error = _load_audio_source(AUDIO_FILENAME)
+    if error:
+        print(f" {error}")
+        sys.exit(1)
+    clips, requests = build_workload(speech)
+    cache = get_transcript_cache()
+    cache.clear()
+
+    assets = setup_demo_assets()
+    warmup(['asr', 'xlit'])
+    if not assets.get('asr_available'):
+        print(" ERROR: ASR model could not be loaded.")
+        sys.exit(1)
+    run_asr_on_file(clips[0], assets, use_cache=False)  # warm-up
+
+    # 1. Every request transcribed, as today
+    uncached_wall = run_requests(clips, requests, use_cache=False)
+    # 2. Same stream through the transcript cache (cold at the start)
+    cached_wall = run_requests(clips, requests, use_cache=True)
+    stats = cache.snapshot_stats()
+
+    print(f"--- TRANSCRIPT CACHE ({AUDIO_FILENAME}, {DISTINCT_CLIPS} distinct clips, {REQUESTS} requests) ---")
+    print("\t".join(["Mode", "Wall_sec", "Per_request_ms", "Hit_rate", "Saved_compute_sec"]))
+    print(f"uncached\t{uncached_wall:.2f}\t{uncached_wall / REQUESTS * 1000:.1f}\t-\t-")
+    print(f"cached\t{cached_wall:.2f}\t{cached_wall / REQUESTS * 1000:.1f}\t{stats['hit_rate']:.2f}\t"
+          f"{stats['saved_sec']:.2f}")
+
+    # 3. A new process with lazy assets and the on-disk tier warm: the model should never load
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+        f.write(clips[0])
+    try:
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), "--fresh-process", f.name],
+                                capture_output=True, text=True, check=True).stdout.strip().splitlines()[-1]
+    finally:
+        os.remove(f.name)
+    wall, asr_loaded, transcript = output.split("\t")
+    print(f"Fresh process, disk hit: {float(wall) * 1000:.1f} ms, ASR model loaded: {asr_loaded} ({transcript}...)")
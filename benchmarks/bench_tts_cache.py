@@ -0,0 +1,95 @@
+# benchmarks/bench_tts_cache.py
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+import numpy as np
+
+# Add the project root to the path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_suite import summarize
+from models.tts_cache import CONFIRMATION_TEMPLATE, ConfirmationSpeaker, OfflineSynthesizer, PhraseAudioCache
+
+CONFIRMATIONS = int(os.getenv("TTS_BENCH_CONFIRMATIONS", "200"))
+# Stand-in synthesis cost, used when no offline voice is installed: fixed start-up + per character
+STANDIN_FIXED_SEC = float(os.getenv("TTS_BENCH_STANDIN_FIXED_SEC", "0.05"))
+STANDIN_PER_CHAR_SEC = float(os.getenv("TTS_BENCH_STANDIN_PER_CHAR_SEC", "0.002"))
+STANDIN_SAMPLE_RATE = 22050
+
+LEAD_NAMES = ["Mr. George", "Anjori Sarabhai", "John Smith", "Dr. Patel", "Priya Sharma", "Rahul Mehta",
+              "Sunita Rao", "Peter Jones", "Kavya Iyer", "Arjun Nair", "Meera Kapoor", "Vikram Singh"]
+VISIT_TYPES = ["BUSINESS", "OPERATION"]
+METHODS = ["NLP_RULES", "MERCURY_dLLM", "CACHE_HIT"]
+
+
+class StandInSynthesizer:
+    """Sleeps for a modelled synthesis time and returns a tone of speech-like length (no TTS involved)."""
+    engine_id = "standin"
+
+    def synthesize(self, text: str):
+        time.sleep(STANDIN_FIXED_SEC + STANDIN_PER_CHAR_SEC * len(text))
+        samples = int(STANDIN_SAMPLE_RATE * 0.07 * len(text))
+        tone = 8000 * np.sin(2 * np.pi * 220 * np.arange(samples) / STANDIN_SAMPLE_RATE)
+        return tone.astype(np.int16), STANDIN_SAMPLE_RATE
+
+
+def make_confirmations(count: int, seed: int = 0):
+    """Visits as the pipeline produces them: a recurring set of leads, dates within the next month."""
+    rng = random.Random(seed)
+    return [{
+        "lead_name": rng.choice(LEAD_NAMES),
+        "visit_type": rng.choice(VISIT_TYPES),
+        "date": f"2025-01-{rng.randint(15, 31):02d}",
+        "extraction_method": rng.choice(METHODS),
+    } for _ in range(count)]
+
+
+def run_speaker(speaker, confirmations):
+    return [speaker.render(slots)[1] for slots in confirmations]
+
+
+if __name__ == "__main__":
+    try:
+        synthesizer = OfflineSynthesizer()
+    except Exception as e:
+        print(f" Offline TTS engine unavailable ({e}); using the stand-in synthesizer.")
+        synthesizer = StandInSynthesizer()
+
+    confirmations = make_confirmations(CONFIRMATIONS)
+    cache_dir = tempfile.mkdtemp(prefix="bench_tts_cache_")
+    try:
+        # 1. Old behaviour: the whole sentence synthesized for every confirmation
+        full_sentence = []
+        for slots in confirmations:
+            start = time.perf_counter()
+            synthesizer.synthesize(CONFIRMATION_TEMPLATE.format(**slots))
+            full_sentence.append(time.perf_counter() - start)
+
+        # 2. Cold: empty cache directory, template pre-rendered up front
+        cold_speaker = ConfirmationSpeaker(synthesizer, PhraseAudioCache(cache_dir))
+        prerender_sec = cold_speaker.prerender()
+        cold = run_speaker(cold_speaker, confirmations)
+
+        # 3. Warm disk: a new process over the same directory (empty memory tier)
+        disk_cache = PhraseAudioCache(cache_dir)
+        disk_speaker = ConfirmationSpeaker(synthesizer, disk_cache)
+        disk_speaker.prerender()
+        warm_disk = run_speaker(disk_speaker, confirmations)
+
+        # 4. Warm memory: the same process again
+        warm_memory = run_speaker(disk_speaker, confirmations)
+        stats = disk_cache.snapshot_stats()
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(f"--- TTS CONFIRMATION ({synthesizer.engine_id}, {CONFIRMATIONS} confirmations, "
+          f"{len(LEAD_NAMES)} leads, template pre-render {1000 * prerender_sec:.1f} ms) ---")
+    print("\t".join(["Mode", "p50_ms", "p95_ms", "Mean_ms", "Total_sec"]))
+    for mode, latencies in (("full sentence, no cache", full_sentence), ("fragments, cold cache", cold),
+                            ("fragments, warm disk", warm_disk), ("fragments, warm memory", warm_memory)):
+        result = summarize(latencies, 1.0)
+        print(f"{mode}\t{result['p50_ms']:.2f}\t{result['p95_ms']:.2f}\t{result['mean_ms']:.2f}\t{sum(latencies):.3f}")
+    print(f"Cache after warm runs: {stats}")
@@ -0,0 +1,79 @@
+# benchmarks/bench_voice_note_combined.py
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the project root to the path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_suite import summarize
+from benchmarks.mercury_standin import MercuryStandIn, start_standin_server
+from main import get_benchmark_tests
+from models.llm_fallback import MercuryClient, SCHEDULE_VISIT_TOOL, NOTE_SUMMARY_TOOL, VOICE_NOTE_TOOL
+
+# Stand-in generation model: fixed time-to-first-token plus a per-token cost, as a decoder behaves
+LATENCY_SPEC = os.getenv("VOICE_NOTE_BENCH_LATENCY", "fixed:0.05")
+TOKEN_LATENCY = float(os.getenv("VOICE_NOTE_BENCH_TOKEN_LATENCY", "0.004"))
+ITERATIONS = int(os.getenv("VOICE_NOTE_BENCH_ITERATIONS", "5"))
+REFERENCE_DATE = "2025-01-15"
+
+
+def two_calls_sequential(client, transcript):
+    """The old flow: schedule_visit, then a separate summarize_note round trip."""
+    visit, _ = client.extract(transcript, current_date=REFERENCE_DATE, tool=SCHEDULE_VISIT_TOOL)
+    note, _ = client.extract(transcript, current_date=REFERENCE_DATE, tool=NOTE_SUMMARY_TOOL)
+    return visit is not None and note is not None
+
+
+def two_calls_parallel(client, transcript, executor):
+    """Both round trips in flight at once: wall-clock of the slower call, but twice the requests."""
+    visit = executor.submit(client.extract, transcript, current_date=REFERENCE_DATE, tool=SCHEDULE_VISIT_TOOL)
+    note = executor.submit(client.extract, transcript, current_date=REFERENCE_DATE, tool=NOTE_SUMMARY_TOOL)
+    return visit.result()[0] is not None and note.result()[0] is not None
+
+
+def one_call(client, transcript):
+    """log_voice_note: visit fields and note summary in a single tool call."""
+    data, _ = client.extract(transcript, current_date=REFERENCE_DATE, tool=VOICE_NOTE_TOOL)
+    return data is not None
+
+
+def run_mode(run, transcripts):
+    """Returns per-note latencies, failures and the number of requests the stand-in served."""
+    server, url = start_standin_server(MercuryStandIn(latency=LATENCY_SPEC, token_latency=TOKEN_LATENCY, seed=0))
+    client = MercuryClient(api_key="standin", endpoint=url)
+    client.extract(transcripts[0], current_date=REFERENCE_DATE)  # warm the connection pool
+    requests_before = server.standin.snapshot_stats()["requests"]
+
+    latencies, failures = [], 0
+    for _ in range(ITERATIONS):
+        for transcript in transcripts:
+            start = time.perf_counter()
+            if run(client, transcript):
+                latencies.append(time.perf_counter() - start)
+            else:
+                failures += 1
+    served = server.standin.snapshot_stats()["requests"] - requests_before
+    client.close()
+    server.shutdown()
+    return latencies, failures, served
+
+
+if __name__ == "__main__":
+    transcripts = [case['transcript'] for case in get_benchmark_tests()]
+    executor = ThreadPoolExecutor(max_workers=2)
+    modes = (
+        ("2 calls, sequential", two_calls_sequential),
+        ("2 calls, parallel", lambda client, transcript: two_calls_parallel(client, transcript, executor)),
+        ("1 combined call", one_call),
+    )
+    print(f"--- VOICE NOTE EXTRACTION (stand-in {LATENCY_SPEC} + {1000 * TOKEN_LATENCY:.1f} ms/token, "
+          f"{ITERATIONS} x {len(transcripts)} notes) ---")
+    print("\t".join(["Mode", "p50_ms", "p95_ms", "Mean_ms", "Requests/note", "Failures"]))
+    for mode, run in modes:
+        latencies, failures, served = run_mode(run, transcripts)
+        stats = summarize(latencies, 1.0)
+        print(f"{mode}\t{stats['p50_ms']:.1f}\t{stats['p95_ms']:.1f}\t{stats['mean_ms']:.1f}\t"
+              f"{served / (ITERATIONS * len(transcripts)):.1f}\t{failures}")
+    executor.shutdown()
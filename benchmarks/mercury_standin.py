@@ -0,0 +1,387 @@
+# benchmarks/mercury_standin.py
+"""
+Local OpenAI-compatible stand-in for the Mercury endpoint.
+
+    python benchmarks/mercury_standin.py --port 8765 --latency lognormal:0.4:0.3 --error-rate 0.05
+    MERCURY_API_ENDPOINT=http://127.0.0.1:8765/v1/chat/completions MERCURY_API_KEY=standin python main.py
+
+Answers `schedule_visit`, `summarize_note` and `log_voice_note` tool calls by replaying recorded
+arguments (keyed by tool and normalized transcript) or by synthesizing schema-valid ones, and can inject latency, retryable errors and malformed JSON.
+`--token-latency` adds generation time per output token; requests with "stream": true get the
+arguments as an SSE token stream (chunked transfer encoding), like the OpenAI-compatible API.
+`--record FILE --upstream URL` proxies to the real endpoint and appends every answer to FILE.
+GET /stats returns request counters.
+"""
+import os
+import re
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the project root to the path for absolute imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.schema import VisitDetails, NoteSummary, VoiceNoteExtraction
+from models.nlp_core import run_nlp_fast_path, BUSINESS_RE, OPERATION_RE
+from models.contact_scanner import scan_contact_fields
+from models.extraction_cache import normalize_transcript
+
+# --- Stand-in defaults (overridable via environment or CLI) ---
+STANDIN_HOST = os.getenv("MERCURY_STANDIN_HOST", "127.0.0.1")
+STANDIN_PORT = int(os.getenv("MERCURY_STANDIN_PORT", "8765"))
+STANDIN_LATENCY = os.getenv("MERCURY_STANDIN_LATENCY", "none")
+STANDIN_ERROR_RATE = float(os.getenv("MERCURY_STANDIN_ERROR_RATE", "0"))
+STANDIN_MALFORMED_RATE = float(os.getenv("MERCURY_STANDIN_MALFORMED_RATE", "0"))
+STANDIN_BROKEN_RATE = float(os.getenv("MERCURY_STANDIN_BROKEN_RATE", "0"))
+STANDIN_SEED = os.getenv("MERCURY_STANDIN_SEED")
+STANDIN_TOKEN_LATENCY = float(os.getenv("MERCURY_STANDIN_TOKEN_LATENCY", "0"))
+# Argument characters per emitted token
+STANDIN_CHARS_PER_TOKEN = 4
+ERROR_STATUS_CODES = (429, 500, 502, 503)
+
+CURRENT_DATE_RE = re.compile(r'Current Date:\s*(\d{4}-\d{2}-\d{2})')
+# Words that make a synthesized note summary report action_required = "Yes"
+ACTION_RE = re.compile(r'\b(schedule|call|send|follow|meet|visit|remind|book|tomorrow|next)\b', re.IGNORECASE)
+SUMMARY_MAX_WORDS = 20
+DEFAULT_TOOL = "schedule_visit"
+TOOL_SCHEMAS = {"schedule_visit": VisitDetails, "summarize_note": NoteSummary, "log_voice_note": VoiceNoteExtraction}
+
+
+def parse_latency_spec(spec: str):
+    """
+    'none' | 'fixed:SEC' | 'uniform:LOW:HIGH' | 'normal:MEAN:STD' | 'lognormal:MEDIAN:SIGMA'
+    -> a function rng -> seconds (never negative).
+    """
+    kind, *params = spec.split(":")
+    params = [float(param) for param in params]
+    if kind == "none":
+        return lambda rng: 0.0
+    if kind == "fixed":
+        return lambda rng: params[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(params[0], params[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(params[0], params[1]))
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(math.log(params[0]), params[1])
+    raise ValueError(f"Unknown latency distribution '{spec}'")
+
+
+def synthesize_arguments(transcript: str, current_date: str = None, tool: str = DEFAULT_TOOL):
+    """Schema-valid arguments for `tool` built from the local rule engine (no model involved)."""
+    data, _ = run_nlp_fast_path(transcript, reference_date=current_date)
+    if data is None:
+        data = dict.fromkeys(VisitDetails.model_fields, "N/A")
+        data["title"] = transcript[:40].strip() + "..."
+        if BUSINESS_RE.search(transcript):
+            data["visit_type"] = "BUSINESS"
+        elif OPERATION_RE.search(transcript):
+            data["visit_type"] = "OPERATION"
+        data.update(scan_contact_fields(transcript.lower())[0])
+    if tool != DEFAULT_TOOL:
+        # Note fields: the first words of the note, and whether it asks for a follow-up
+        words = transcript.split()
+        data["summary_of_note"] = " ".join(words[:SUMMARY_MAX_WORDS]) + ("..." if len(words) > SUMMARY_MAX_WORDS else "")
+        data["action_required"] = "Yes" if ACTION_RE.search(transcript) else "No"
+    return TOOL_SCHEMAS[tool].model_validate(data).model_dump()
+
+
+def malform_arguments(arguments_json: str):
+    """
+    Reproduces the defects parse_tool_call_arguments repairs: a stray '" ' opening the first
+    string value ('"title":" "Visit..."') and whitespace padding around every separator.
+    """
+    pieces = []
+    stray_quote_added = False
+    for key, value in json.loads(arguments_json).items():
+        if isinstance(value, str) and not stray_quote_added:
+            pieces.append(f'{json.dumps(key)}:" {json.dumps(value)}')
+            stray_quote_added = True
+        else:
+            pieces.append(f'{json.dumps(key)} : {json.dumps(value)}')
+    return "{" + " ,  ".join(pieces) + "}"
+
+
+def break_arguments(arguments_json: str):
+    """Unrecoverable output (truncated mid-object), for exercising the failure path."""
+    return arguments_json[:max(1, len(arguments_json) // 2)]
+
+
+def split_tokens(arguments: str, max_tokens: int = None):
+    """Arguments as token-sized fragments, cut at max_tokens. Returns (fragments, finish_reason)."""
+    fragments = [arguments[i:i + STANDIN_CHARS_PER_TOKEN] for i in range(0, len(arguments), STANDIN_CHARS_PER_TOKEN)]
+    if max_tokens is not None and len(fragments) > max_tokens:
+        return fragments[:max_tokens], "length"
+    return fragments, "tool_calls"
+
+
+def recording_key(transcript: str, tool: str = DEFAULT_TOOL):
+    """Recordings of the default tool keep the bare normalized transcript as key (older files stay valid)."""
+    normalized = normalize_transcript(transcript)
+    return normalized if tool == DEFAULT_TOOL else f"{tool}|{normalized}"
+
+
+def build_stream_events(fragments, finish_reason: str, tool: str = DEFAULT_TOOL):
+    """chat.completion.chunk events: tool-call header, one delta per fragment, then the finish event."""
+    def chunk(delta, finish=None):
+        return {"id": "standin-stream", "object": "chat.completion.chunk", "created": int(time.time()),
+                "model": "mercury", "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}
+
+    yield chunk({"role": "assistant", "tool_calls": [{"index": 0, "id": "call_standin", "type": "function",
+                                                      "function": {"name": tool, "arguments": ""}}]})
+    for fragment in fragments:
+        yield chunk({"tool_calls": [{"index": 0, "function": {"arguments": fragment}}]})
+    yield chunk({}, finish_reason)
+
+
+def build_completion(arguments: str, finish_reason: str = "tool_calls", tool: str = DEFAULT_TOOL):
+    return {
+        "id": f"standin-{int(time.time() * 1000)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": "mercury",
+        "choices": [{
+            "index": 0,
+            "finish_reason": finish_reason,
+            "message": {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{
+                    "id": "call_standin",
+                    "type": "function",
+                    "function": {"name": tool, "arguments": arguments}
+                }]
+            }
+        }]
+    }
+
+
+class MercuryStandIn:
+    """Request-independent state of the stand-in: recordings, fault injection settings and counters."""
+
+    def __init__(self, latency: str = STANDIN_LATENCY, error_rate: float = STANDIN_ERROR_RATE,
+                 malformed_rate: float = STANDIN_MALFORMED_RATE, broken_rate: float = STANDIN_BROKEN_RATE,
+                 replay_path: str = None, record_path: str = None, upstream: str = None,
+                 upstream_key: str = None, seed=STANDIN_SEED, token_latency: float = STANDIN_TOKEN_LATENCY):
+        self.sample_latency = parse_latency_spec(latency)
+        self.token_latency = token_latency
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.broken_rate = broken_rate
+        self.record_path = record_path
+        self.upstream = upstream
+        self.upstream_key = upstream_key or os.getenv("MERCURY_STANDIN_UPSTREAM_KEY", "")
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "streamed": 0, "replayed": 0, "synthesized": 0, "recorded": 0,
+                      "errors_injected": 0, "malformed_injected": 0, "broken_injected": 0, "truncated": 0}
+
+        self.recordings = {}
+        if replay_path and os.path.exists(replay_path):
+            with open(replay_path) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        key = recording_key(entry["transcript"], entry.get("tool", DEFAULT_TOOL))
+                        self.recordings[key] = entry["arguments"]
+
+    def _draw(self):
+        """One locked draw of all random decisions for a request, so seeded runs are reproducible."""
+        with self._lock:
+            self.stats["requests"] += 1
+            return (self.sample_latency(self._rng), self._rng.random(), self._rng.random(),
+                    self._rng.choice(ERROR_STATUS_CODES))
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _record(self, transcript: str, arguments: str, tool: str = DEFAULT_TOOL):
+        with self._lock:
+            self.recordings[recording_key(transcript, tool)] = arguments
+            self.stats["recorded"] += 1
+            if self.record_path:
+                with open(self.record_path, "a") as f:
+                    f.write(json.dumps({"transcript": transcript, "tool": tool, "arguments": arguments}) + "\n")
+
+    def _forward(self, payload: dict):
+        import requests
+        payload = {**payload, "stream": False}
+        response = requests.post(self.upstream, json=payload, timeout=60, headers={
+            "Content-Type": "application/json", "Authorization": f"Bearer {self.upstream_key}"
+        })
+        response.raise_for_status()
+        return response.json()['choices'][0]['message']['tool_calls'][0]['function']['arguments']
+
+    def handle(self, payload: dict):
+        """
+        Returns (status, body, extra headers) for one chat-completions request. The body is a dict, or
+        for a successful "stream": true request the (fragments, finish_reason, tool) still to be generated.
+        """
+        latency, error_draw, output_draw, error_status = self._draw()
+        time.sleep(latency)
+
+        if error_draw < self.error_rate:
+            self._count("errors_injected")
+            return error_status, {"error": {"message": "injected failure", "code": error_status}}, {"Retry-After": "0"}
+
+        messages = payload.get("messages", [])
+        transcript = next((m["content"] for m in messages if m.get("role") == "user"), "")
+        system = next((m["content"] for m in messages if m.get("role") == "system"), "")
+        date_match = CURRENT_DATE_RE.search(system)
+        tools = payload.get("tools") or [{"function": {"name": DEFAULT_TOOL}}]
+        tool = tools[0]["function"]["name"]
+
+        arguments = self.recordings.get(recording_key(transcript, tool))
+        if arguments is not None:
+            self._count("replayed")
+        elif self.upstream:
+            arguments = self._forward(payload)
+            self._record(transcript, arguments, tool)
+        else:
+            arguments = json.dumps(synthesize_arguments(transcript, date_match.group(1) if date_match else None, tool))
+            self._count("synthesized")
+
+        if output_draw < self.broken_rate:
+            self._count("broken_injected")
+            arguments = break_arguments(arguments)
+        elif output_draw < self.broken_rate + self.malformed_rate:
+            self._count("malformed_injected")
+            arguments = malform_arguments(arguments)
+
+        fragments, finish_reason = split_tokens(arguments, payload.get("max_tokens"))
+        if finish_reason == "length":
+            self._count("truncated")
+        if payload.get("stream"):
+            self._count("streamed")
+            return 200, (fragments, finish_reason, tool), {}
+        # A non-streamed answer arrives only after every token (and the end-of-sequence step) is generated
+        time.sleep(self.token_latency * (len(fragments) + 1))
+        return 200, build_completion("".join(fragments), finish_reason, tool), {}
+
+    def snapshot_stats(self):
+        with self._lock:
+            return dict(self.stats)
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so the client's pooled connections are exercised
+    disable_nagle_algorithm = True  # headers and body go out as separate writes; avoid the 40 ms delayed-ACK stall
+
+    def handle(self):
+        try:
+            super().handle()
+        except ConnectionResetError:
+            pass  # a streaming client hung up once it had the whole object
+
+    def _send_json(self, status: int, body: dict, headers: dict = None):
+        encoded = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            self._send_json(200, self.server.standin.snapshot_stats())
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def _send_stream(self, fragments, finish_reason: str, tool: str = DEFAULT_TOOL):
+        """SSE over chunked transfer encoding, one event per chunk, paced by the stand-in's token latency."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        header, *deltas, finish = build_stream_events(fragments, finish_reason, tool)
+        token_latency = self.server.standin.token_latency
+        start = time.perf_counter()
+        try:
+            self._write_event(header)
+            # Paced against absolute due times so sleep overshoot does not accumulate over the stream;
+            # the finish event stands for the end-of-sequence step
+            for i, event in enumerate(deltas + [finish], start=1):
+                time.sleep(max(0.0, start + i * token_latency - time.perf_counter()))
+                self._write_event(event)
+            self._write_chunk(b"data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # client returned early once the object closed
+
+    def _write_event(self, event: dict):
+        self._write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.rfile.read(length)
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            status, body, headers = self.server.standin.handle(payload)
+        except Exception as e:
+            status, body, headers = 500, {"error": {"message": f"stand-in failure: {e}"}}, {}
+        if isinstance(body, tuple):
+            self._send_stream(*body)
+        else:
+            self._send_json(status, body, headers)
+
+    def log_message(self, format, *args):
+        pass  # per-request access logs would dominate the benchmark output
+
+
+def start_standin_server(standin: MercuryStandIn = None, host: str = STANDIN_HOST, port: int = 0):
+    """
+    Serves the stand-in on a background thread (port 0 picks a free port).
+    Returns (server, endpoint_url); call server.shutdown() when done.
+    """
+    server = ThreadingHTTPServer((host, port), _StandInHandler)
+    server.daemon_threads = True
+    server.standin = standin or MercuryStandIn()
+    threading.Thread(target=server.serve_forever, name="mercury-standin", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1/chat/completions"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Mercury stand-in server")
+    parser.add_argument("--host", default=STANDIN_HOST)
+    parser.add_argument("--port", type=int, default=STANDIN_PORT)
+    parser.add_argument("--latency", default=STANDIN_LATENCY, help="none | fixed:S | uniform:A:B | normal:M:SD | lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--error-rate", type=float, default=STANDIN_ERROR_RATE, help="fraction of requests answered 429/5xx")
+    parser.add_argument("--malformed-rate", type=float, default=STANDIN_MALFORMED_RATE, help="fraction with repairable malformed JSON")
+    parser.add_argument("--broken-rate", type=float, default=STANDIN_BROKEN_RATE, help="fraction with unrecoverable JSON")
+    parser.add_argument("--replay", help="JSONL of {transcript, arguments} recordings to replay")
+    parser.add_argument("--record", help="append upstream answers to this JSONL file (requires --upstream)")
+    parser.add_argument("--upstream", help="real Mercury endpoint to proxy cache misses to")
+    parser.add_argument("--token-latency", type=float, default=STANDIN_TOKEN_LATENCY,
+                        help="seconds of generation time per output token (streamed or not)")
+    parser.add_argument("--seed", type=int, default=STANDIN_SEED)
+    args = parser.parse_args()
+
+    standin = MercuryStandIn(
+        latency=args.latency, error_rate=args.error_rate, malformed_rate=args.malformed_rate,
+        broken_rate=args.broken_rate, replay_path=args.replay or args.record, record_path=args.record,
+        upstream=args.upstream, seed=args.seed, token_latency=args.token_latency
+    )
+    server = ThreadingHTTPServer((args.host, args.port), _StandInHandler)
+    server.daemon_threads = True
+    server.standin = standin
+    print(f" Mercury stand-in listening on http://{args.host}:{args.port}/v1/chat/completions "
+          f"({len(standin.recordings)} recordings loaded)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f" Stand-in stats: {standin.snapshot_stats()}")
@@ -0,0 +1,203 @@
+# bulk_process.py
+"""
+Streaming bulk extraction over a JSONL file.
+
+    python bulk_process.py input.jsonl output.jsonl --workers 8 --fallback-budget 8
+
+Each input line is {"id": ..., "transcript": "..."} or {"id": ..., "audio_path": "..."}.
+Lines fan out across a process pool; every worker runs the fast path locally and all workers share
+one bounded Mercury concurrency budget. Results are appended to the output JSONL as they complete,
+and a checkpoint file (output + ".ckpt") makes interrupted runs resumable without duplicates.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import multiprocessing
+from datetime import datetime
+
+# Add the project root to the path for absolute imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.llm_fallback import MERCURY_MAX_CONCURRENCY
+
+# --- Bulk Settings (overridable via environment) ---
+BULK_WORKERS = int(os.getenv("BULK_WORKERS", str(os.cpu_count() or 1)))
+BULK_FALLBACK_BUDGET = int(os.getenv("BULK_FALLBACK_BUDGET", str(MERCURY_MAX_CONCURRENCY)))
+# Lines handed to the pool but not yet written; bounds memory regardless of input size
+BULK_MAX_IN_FLIGHT_PER_WORKER = int(os.getenv("BULK_MAX_IN_FLIGHT_PER_WORKER", "4"))
+BULK_CHECKPOINT_EVERY = int(os.getenv("BULK_CHECKPOINT_EVERY", "500"))
+
+
+# --- WORKER PROCESS ---
+
+_FALLBACK_BUDGET = None
+_REFERENCE_DATE = None
+
+
+def _init_worker(fallback_budget, reference_date: str):
+    global _FALLBACK_BUDGET, _REFERENCE_DATE
+    _FALLBACK_BUDGET = fallback_budget
+    _REFERENCE_DATE = reference_date
+
+
+def _transcribe(audio_path: str):
+    """ASR for audio lines; the model loads lazily, once per worker process."""
+    from models.demo_utils import setup_demo_assets, run_asr_on_file
+    transcript, asr_latency, _, _ = run_asr_on_file(audio_path, setup_demo_assets())
+    if transcript.startswith("ERROR"):
+        raise RuntimeError(transcript)
+    return transcript, asr_latency
+
+
+def process_line(task):
+    """Runs one input line through (optional ASR and) the hybrid pipeline. Returns (line_no, result)."""
+    line_no, raw_line = task
+    from main import run_hybrid_extraction_pipeline
+
+    result = {"line": line_no, "id": None}
+    start_time = time.perf_counter()
+    try:
+        record = json.loads(raw_line)
+        result["id"] = record.get("id", line_no)
+        transcript = record.get("transcript")
+        if transcript is None and record.get("audio_path"):
+            transcript, result["asr_latency_sec"] = _transcribe(record["audio_path"])
+            result["transcript"] = transcript
+        if not transcript:
+            raise ValueError("line has neither 'transcript' nor 'audio_path'")
+
+        metrics = run_hybrid_extraction_pipeline(
+            transcript, reference_date=record.get("reference_date", _REFERENCE_DATE), fallback_limiter=_FALLBACK_BUDGET
+        )
+        result.update({
+            "method": metrics["method"],
+            "success": metrics["success"],
+            "latency_sec": metrics["latency_sec"],
+            "data": metrics["data"],
+        })
+    except Exception as e:
+        result.update({"method": None, "success": False, "latency_sec": time.perf_counter() - start_time,
+                       "data": None, "error": str(e)})
+    return line_no, result
+
+
+# --- CHECKPOINTING ---
+
+class Checkpoint:
+    """
+    Tracks which input lines are done. Completion is out of order, so the checkpoint keeps a watermark
+    (every line below it is written) plus the finished lines above it, which never exceed the in-flight bound.
+    The output byte offset is stored too: resuming truncates anything written after the last checkpoint.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.next_line = 0
+        self.done_above = set()
+        self.output_offset = 0
+        # Blank lines are marked from the pool's task-feeder thread, results from the main thread
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+            self.next_line = state["next_line"]
+            self.done_above = set(state["done_above"])
+            self.output_offset = state["output_offset"]
+
+    def is_done(self, line_no: int):
+        with self._lock:
+            return line_no < self.next_line or line_no in self.done_above
+
+    def mark_done(self, line_no: int):
+        with self._lock:
+            self.done_above.add(line_no)
+            while self.next_line in self.done_above:
+                self.done_above.discard(self.next_line)
+                self.next_line += 1
+
+    def save(self, output_offset: int, completed: bool = False):
+        with self._lock:
+            state = {"next_line": self.next_line, "done_above": sorted(self.done_above),
+                     "output_offset": output_offset, "completed": completed}
+            self.output_offset = output_offset
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+
+def iter_pending_lines(input_path: str, checkpoint: Checkpoint, in_flight: threading.Semaphore):
+    """Yields (line_no, raw_line) for unfinished, non-blank lines, blocking while the pool is saturated."""
+    with open(input_path) as f:
+        for line_no, raw_line in enumerate(f):
+            if checkpoint.is_done(line_no):
+                continue
+            if not raw_line.strip():
+                checkpoint.mark_done(line_no)
+                continue
+            in_flight.acquire()
+            yield line_no, raw_line
+
+
+def run_bulk(input_path: str, output_path: str, workers: int = BULK_WORKERS,
+             fallback_budget: int = BULK_FALLBACK_BUDGET, reference_date: str = None,
+             checkpoint_every: int = BULK_CHECKPOINT_EVERY, chunksize: int = 1):
+    """Processes every pending input line and returns a summary dict."""
+    reference_date = reference_date or datetime.now().strftime("%Y-%m-%d")
+    checkpoint = Checkpoint(output_path + ".ckpt")
+
+    # 1. Drop partial output written after the last checkpoint, then append from there
+    mode = "r+" if os.path.exists(output_path) else "w"
+    output = open(output_path, mode)
+    output.truncate(checkpoint.output_offset)
+    output.seek(checkpoint.output_offset)
+
+    budget = multiprocessing.BoundedSemaphore(max(1, fallback_budget))
+    in_flight = threading.BoundedSemaphore(max(1, workers * BULK_MAX_IN_FLIGHT_PER_WORKER))
+    methods = {}
+    processed = 0
+    start_time = time.perf_counter()
+
+    # 2. Fan lines out; results stream back in completion order
+    try:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(budget, reference_date)) as pool:
+            tasks = iter_pending_lines(input_path, checkpoint, in_flight)
+            for line_no, result in pool.imap_unordered(process_line, tasks, chunksize=chunksize):
+                in_flight.release()
+                output.write(json.dumps(result) + "\n")
+                checkpoint.mark_done(line_no)
+                methods[result["method"]] = methods.get(result["method"], 0) + 1
+                processed += 1
+                if processed % checkpoint_every == 0:
+                    output.flush()
+                    checkpoint.save(output.tell())
+        output.flush()
+        checkpoint.save(output.tell(), completed=True)
+    finally:
+        output.close()
+
+    wall_sec = time.perf_counter() - start_time
+    return {"processed": processed, "wall_sec": wall_sec,
+            "throughput_per_sec": processed / wall_sec if wall_sec > 0 else 0.0, "methods": methods}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streaming bulk extraction over JSONL input")
+    parser.add_argument("input", help="input JSONL ({'id', 'transcript'} or {'id', 'audio_path'} per line)")
+    parser.add_argument("output", help="output JSONL (appended; resumable via OUTPUT.ckpt)")
+    parser.add_argument("--workers", type=int, default=BULK_WORKERS)
+    parser.add_argument("--fallback-budget", type=int, default=BULK_FALLBACK_BUDGET,
+                        help="max Mercury calls in flight across all workers")
+    parser.add_argument("--reference-date", help="YYYY-MM-DD used to resolve relative dates (default: today)")
+    parser.add_argument("--checkpoint-every", type=int, default=BULK_CHECKPOINT_EVERY)
+    parser.add_argument("--chunksize", type=int, default=1)
+    args = parser.parse_args()
+
+    summary = run_bulk(args.input, args.output, workers=args.workers, fallback_budget=args.fallback_budget,
+                       reference_date=args.reference_date, checkpoint_every=args.checkpoint_every,
+                       chunksize=args.chunksize)
+    print(f" Processed {summary['processed']} lines in {summary['wall_sec']:.2f}s "
+          f"({summary['throughput_per_sec']:.1f}/s). Methods: {summary['methods']}")
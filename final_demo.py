@@ -3,7 +3,9 @@ import sys
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from models.demo_utils import setup_demo_assets, run_asr_on_file, generate_voice_confirmation
+from models.demo_utils import setup_demo_assets, run_asr_on_file, generate_voice_confirmation, extract_entities
+from models.ner_stage import person_names
+from models import telemetry
 from main import run_hybrid_extraction_pipeline
 
 TEST_AUDIO_FILENAME = "Voice_input.m4a"
@@ -29,40 +31,55 @@ def apply_corrections_to_transcript(transcript, corrections):
         transcript = transcript.replace(orig_name, corrected_name)
     return transcript
 
+def apply_corrections_to_entities(entities, corrections):
+    """
+    Keeps the NER entities in step with the corrected transcript instead of re-running NER on it.
+    """
+    for entity in entities:
+        entity['word'] = corrections.get(entity['word'], entity['word'])
+    return entities
+
+def print_stage_breakdown(spans):
+    """Per-stage timings of this run (PIPELINE_TELEMETRY=1)."""
+    print("\n---  STAGE BREAKDOWN ---")
+    for stage, seconds, labels in spans:
+        label_text = ", ".join(f"{key}={value}" for key, value in labels.items())
+        print(f" {stage:<22} {seconds * 1000:9.2f} ms  {label_text}")
+
 def run_full_voice_demo():
     print("---  VOICE BOT DEMO START ---")
 
     assets = setup_demo_assets()
-    if not assets.get('asr_available'):
-        print("\n CRITICAL ERROR: ASR model failed to load. Cannot start demo.")
-        return
 
     print("\n---  STAGE 1: VOICE INPUT & TRANSLITERATION ---")
 
-    transcript, asr_latency, audio_duration, _ = run_asr_on_file(TEST_AUDIO_FILENAME, assets)
+    # Whisper is only loaded on a transcript-cache miss
+    transcript, asr_latency, audio_duration, speech_duration = run_asr_on_file(TEST_AUDIO_FILENAME, assets)
 
+    if transcript.startswith("ERROR") and assets.peek('asr_available') is False:
+        print("\n CRITICAL ERROR: ASR model failed to load. Cannot start demo.")
+        return
     if transcript.startswith("ERROR"):
         print(f" ASR/Transliteration Failed: {transcript}. Check audio file path.")
         return
 
-    # Extract names using NER
-    ner = assets.get('ner_pipeline')
-    names_detected = []
-    if ner:
-        ner_results = ner(transcript)
-        names_detected = [ent['word'] for ent in ner_results if ent['entity_group'] == 'PER']
+    # Extract names using the shared NER stage (single pass, cached by transcript)
+    (entities,), ner_latency = extract_entities([transcript], assets)
+    names_detected = person_names(entities)
 
     # User feedback to correct names
     if names_detected:
         corrections = user_feedback_for_names(names_detected)
         transcript = apply_corrections_to_transcript(transcript, corrections)
+        entities = apply_corrections_to_entities(entities, corrections)
 
-    print(f" ASR Latency: {asr_latency:.4f}s")
+    print(f" ASR Latency: {asr_latency:.4f}s (audio {audio_duration:.2f}s, speech {speech_duration:.2f}s)")
+    print(f" NER Latency: {ner_latency:.4f}s ({len(names_detected)} person entities)")
     print(f" Final Normalized Transcript (after corrections): \"{transcript}\"")
 
     print("\n---  STAGE 2: HYBRID EXTRACTION (NLP/MERCURY) ---")
 
-    hybrid_metrics = run_hybrid_extraction_pipeline(transcript)
+    hybrid_metrics = run_hybrid_extraction_pipeline(transcript, entities=entities)
 
     if not hybrid_metrics['success']:
         print(" EXTRACTION FAILED: Hybrid pipeline could not extract data.")
@@ -86,4 +103,7 @@ def run_full_voice_demo():
         print(" TTS failed to generate audio or is disabled.")
 
 if __name__ == "__main__":
-    run_full_voice_demo()
+    with telemetry.collect_spans() as spans:
+        run_full_voice_demo()
+    if telemetry.is_enabled():
+        print_stage_breakdown(spans)
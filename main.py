@@ -3,6 +3,9 @@ import time
 import json
 import os
 import sys
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Add the project root to the path for absolute imports
@@ -10,45 +13,288 @@ from datetime import datetime
 sys.path.append(os.path.dirname(__file__))
 
 # Import core components and settings from the local modules
-from models.nlp_core import run_nlp_fast_path
-from models.llm_fallback import extract_via_mercury_fallback
-from models.schema import VisitDetails 
+from models.nlp_core import run_nlp_fast_path, run_nlp_fast_path_batch, predict_fast_path_miss
+from models.llm_fallback import (
+    extract_via_mercury_fallback, extract_many_via_mercury_fallback, extract_context_and_summarize, split_voice_note,
+    MERCURY_MAX_CONCURRENCY, MERCURY_HEDGE
+)
+from models.extraction_cache import get_extraction_cache, make_cache_key
+from models.schema import VisitDetails, VoiceNoteExtraction
+from models.streaming_asr import StreamingTranscriber, reconcile_fields
+from models.telemetry import span, record, increment
+
+# Speculative mode: start Mercury alongside the rules when the cheap pre-check predicts a miss
+HYBRID_SPECULATIVE = os.getenv("HYBRID_SPECULATIVE", "0") == "1"
+
+_SPECULATION_STATS = {"launched": 0, "used": 0, "wasted": 0, "cancelled": 0, "saved_sec": 0.0}
+_SPECULATION_LOCK = threading.Lock()
+_SPECULATION_EXECUTOR = None
+
+
+# --- SPECULATIVE FALLBACK HELPERS ---
+
+def _get_speculation_executor():
+    global _SPECULATION_EXECUTOR
+    with _SPECULATION_LOCK:
+        if _SPECULATION_EXECUTOR is None:
+            _SPECULATION_EXECUTOR = ThreadPoolExecutor(max_workers=2 * MERCURY_MAX_CONCURRENCY,
+                                                       thread_name_prefix="speculative-fallback")
+        return _SPECULATION_EXECUTOR
+
+def _count_speculation(key: str, amount=1):
+    with _SPECULATION_LOCK:
+        _SPECULATION_STATS[key] += amount
+    increment(f"speculation.{key}", amount)
+
+def snapshot_speculation_stats():
+    """launched / used / wasted (rules won after the call was sent) / cancelled (never sent) / saved_sec."""
+    with _SPECULATION_LOCK:
+        return dict(_SPECULATION_STATS)
+
+def _call_mercury(transcript: str, reference_date: str, fallback_limiter=None, hedge: bool = MERCURY_HEDGE):
+    with fallback_limiter or nullcontext():
+        return extract_via_mercury_fallback(transcript, current_date=reference_date, hedge=hedge)
+
+def _call_mercury_voice_note(transcript: str, reference_date: str, fallback_limiter=None,
+                             hedge: bool = MERCURY_HEDGE):
+    with fallback_limiter or nullcontext():
+        return extract_context_and_summarize(transcript, current_date=reference_date, hedge=hedge)
+
+def _lookup_cache(cache, cache_key: str):
+    with span("cache.lookup") as lookup_span:
+        cached_data, cache_tier = cache.get(cache_key) if cache else (None, None)
+        lookup_span.set_label("tier", cache_tier or "miss")
+    return cached_data, cache_tier
 
 
 # --- CORE HYBRID EXTRACTION PIPELINE ---
 
-def run_hybrid_extraction_pipeline(transcript: str):
+def run_hybrid_extraction_pipeline(transcript: str, reference_date: str = None, use_cache: bool = True,
+                                   entities=None, fallback_limiter=None, speculative: bool = HYBRID_SPECULATIVE,
+                                   hedge: bool = MERCURY_HEDGE, summarize: bool = False):
     """
     The central logic using the fast NLP path with Mercury as the production fallback.
+    Fast path failures consult the extraction cache before paying for a Mercury round trip.
+    `entities` (from the shared NER stage) is attached to the metrics for downstream consumers.
+    `fallback_limiter` (e.g. a semaphore shared by worker processes) is held around the Mercury call.
+    `speculative=True` starts Mercury while the rules run when `predict_fast_path_miss` expects a miss
+    (the call is discarded if the rules succeed); `hedge=True` hedges slow Mercury requests.
+    `summarize=True` also summarizes the transcript as a voice note (metrics["note"], a NoteSummary dict);
+    see `_run_voice_note_pipeline`.
     """
+    reference_date = reference_date or datetime.now().strftime("%Y-%m-%d")
+    cache = get_extraction_cache() if use_cache else None
+    if summarize:
+        return _run_voice_note_pipeline(transcript, reference_date, cache, entities, fallback_limiter, hedge)
+    cache_key = None
+    cache_tier = None
+    cached_data = None
+    speculative_future = None
+    speculation = None
+    pipeline_start = time.perf_counter()
+
+    # 0. SPECULATION: predicted misses check the cache, then launch Mercury before the rules run
+    if speculative and predict_fast_path_miss(transcript):
+        cache_key = make_cache_key(transcript, reference_date)
+        cached_data, cache_tier = _lookup_cache(cache, cache_key)
+        if not cached_data:
+            speculative_future = _get_speculation_executor().submit(
+                _call_mercury, transcript, reference_date, fallback_limiter, hedge
+            )
+            _count_speculation("launched")
     
     # 1. Attempt FAST PATH (NLP)
-    # This function returns None if the input contains temporal keywords or fails basic checks.
-    nlp_data, nlp_latency = run_nlp_fast_path(transcript)
+    # This function returns None if the input has ambiguous temporal data or fails basic checks.
+    nlp_data, nlp_latency = run_nlp_fast_path(transcript, reference_date=reference_date)
     
     if nlp_data:
         # NLP SUCCESS: Return data from the fast path
         total_latency = nlp_latency
         method_used = "NLP_RULES"
         extracted_data = nlp_data
+        if speculative_future is not None:
+            speculation = "cancelled" if speculative_future.cancel() else "wasted"
+            _count_speculation(speculation)
         
     else:
-        # 2. NLP FAILED or Complex Temporal Data Detected -> FALLBACK to Mercury
+        # 2. NLP FAILED -> check the extraction cache (keyed on transcript, schema version and date)
+        if cache_key is None:
+            cache_key = make_cache_key(transcript, reference_date)
+            cached_data, cache_tier = _lookup_cache(cache, cache_key)
         
-        # Execute the Mercury Fallback
-        llm_data, llm_latency = extract_via_mercury_fallback(transcript)
-        
-        total_latency = nlp_latency + llm_latency # Total time spent
-        method_used = "MERCURY_dLLM"
-        extracted_data = llm_data
+        if cached_data:
+            total_latency = time.perf_counter() - pipeline_start
+            method_used = "CACHE_HIT"
+            extracted_data = cached_data
+        else:
+            # 3. Cache miss or Complex Temporal Data Detected -> FALLBACK to Mercury
+            if speculative_future is not None:
+                llm_data, llm_latency = speculative_future.result()
+                # The rules and the cache lookup ran while Mercury was already in flight
+                speculation = "used"
+                _count_speculation("used")
+                _count_speculation("saved_sec", nlp_latency)
+            else:
+                llm_data, llm_latency = _call_mercury(transcript, reference_date, fallback_limiter, hedge)
+            if llm_data and cache:
+                cache.put(cache_key, llm_data)
+            
+            total_latency = time.perf_counter() - pipeline_start # Total time spent
+            method_used = "MERCURY_dLLM"
+            extracted_data = llm_data
         
+    record("pipeline.total", total_latency, method=method_used)
+
     # Final metrics assembly
     metrics = {
         "method": method_used,
         "success": extracted_data is not None,
         "latency_sec": total_latency,
-        "data": extracted_data
+        "data": extracted_data,
+        "cache_tier": cache_tier,
+        "cache_stats": cache.snapshot_stats() if cache else None,
+        "entities": entities,
+        "speculation": speculation,
+        "note": None
+    }
+    return metrics
+
+def _run_voice_note_pipeline(transcript: str, reference_date: str, cache, entities, fallback_limiter, hedge: bool):
+    """
+    Hybrid pipeline for a voice note. The rules cannot summarize, so a model call is needed anyway:
+    one `log_voice_note` call (visit fields + note summary) is started before the rules run and
+    covers both, instead of a scheduling call followed by a separate summarization call.
+    Visit fields come from the rules when they succeed, otherwise from the combined call.
+    """
+    pipeline_start = time.perf_counter()
+    note_future = None
+
+    # 1. Combined extractions are cached under their own schema version
+    cache_key = make_cache_key(transcript, reference_date, schema=VoiceNoteExtraction)
+    combined_data, cache_tier = _lookup_cache(cache, cache_key)
+    if not combined_data:
+        note_future = _get_speculation_executor().submit(
+            _call_mercury_voice_note, transcript, reference_date, fallback_limiter, hedge
+        )
+
+    # 2. FAST PATH (NLP) runs while the combined call is in flight
+    nlp_data, _ = run_nlp_fast_path(transcript, reference_date=reference_date)
+
+    # 3. Collect the combined call
+    if note_future is not None:
+        combined_data, _ = note_future.result()
+        if combined_data and cache:
+            cache.put(cache_key, combined_data)
+
+    visit_data, note_data = split_voice_note(combined_data) if combined_data else (None, None)
+    if nlp_data:
+        method_used = "NLP_RULES"
+        visit_data = nlp_data
+    else:
+        method_used = "CACHE_HIT" if note_future is None else "MERCURY_dLLM"
+    total_latency = time.perf_counter() - pipeline_start
+    record("pipeline.total", total_latency, method=method_used, mode="voice_note")
+
+    return {
+        "method": method_used,
+        "success": visit_data is not None,
+        "latency_sec": total_latency,
+        "data": visit_data,
+        "cache_tier": cache_tier,
+        "cache_stats": cache.snapshot_stats() if cache else None,
+        "entities": entities,
+        "speculation": None,
+        "note": note_data
     }
+
+def run_hybrid_extraction_pipeline_batch(transcripts, max_concurrency: int = MERCURY_MAX_CONCURRENCY,
+                                         reference_date: str = None, use_cache: bool = True, entities=None,
+                                         hedge: bool = MERCURY_HEDGE):
+    """
+    Batch form of the hybrid pipeline: the fast path runs over every transcript first,
+    then cache misses go to Mercury concurrently (bounded by `max_concurrency`).
+    `entities` optionally holds one NER entity list per transcript.
+    Returns one metrics dict per transcript, in input order.
+    """
+    transcripts = list(transcripts)
+    entities = list(entities) if entities is not None else [None] * len(transcripts)
+    reference_date = reference_date or datetime.now().strftime("%Y-%m-%d")
+    cache = get_extraction_cache() if use_cache else None
+    nlp_results, nlp_latencies = run_nlp_fast_path_batch(transcripts, reference_date=reference_date)
+
+    # 1. Resolve fast path failures from the cache where possible
+    outcomes = {}
+    fallback_indices = []
+    for i, nlp_data in enumerate(nlp_results):
+        if nlp_data:
+            outcomes[i] = ("NLP_RULES", nlp_data, nlp_latencies[i], None)
+            continue
+        lookup_start = time.perf_counter()
+        cached_data, cache_tier = cache.get(make_cache_key(transcripts[i], reference_date)) if cache else (None, None)
+        if cached_data:
+            outcomes[i] = ("CACHE_HIT", cached_data, nlp_latencies[i] + (time.perf_counter() - lookup_start), cache_tier)
+        else:
+            fallback_indices.append(i)
+
+    # 2. Overlap the remaining Mercury round trips
+    fallback_results = extract_many_via_mercury_fallback(
+        [transcripts[i] for i in fallback_indices], max_concurrency=max_concurrency, current_date=reference_date,
+        hedge=hedge
+    )
+    for i, (llm_data, llm_latency) in zip(fallback_indices, fallback_results):
+        if llm_data and cache:
+            cache.put(make_cache_key(transcripts[i], reference_date), llm_data)
+        outcomes[i] = ("MERCURY_dLLM", llm_data, nlp_latencies[i] + llm_latency, None)
+
+    # 3. Assemble per-transcript metrics in the same shape as run_hybrid_extraction_pipeline
+    cache_stats = cache.snapshot_stats() if cache else None
+    batch_metrics = []
+    for i in range(len(transcripts)):
+        method_used, extracted_data, total_latency, cache_tier = outcomes[i]
+        record("pipeline.total", total_latency, method=method_used)
+        batch_metrics.append({
+            "method": method_used,
+            "success": extracted_data is not None,
+            "latency_sec": total_latency,
+            "data": extracted_data,
+            "cache_tier": cache_tier,
+            "cache_stats": cache_stats,
+            "entities": entities[i],
+            "speculation": None,
+            "note": None
+        })
+    return batch_metrics
+
+def run_streaming_extraction_pipeline(chunks, assets: dict, reference_date: str = None, use_cache: bool = True,
+                                      on_field=None, on_partial=None):
+    """
+    Streaming front end of the hybrid pipeline: PCM chunks (mono float32, 16 kHz) are transcribed
+    incrementally and the fast path runs on every stable prefix, so early fields reach `on_field`
+    while the rep is still speaking. Once the chunks end, the full utterance is transcribed and goes
+    through `run_hybrid_extraction_pipeline`; that result is authoritative.
+    Returns its metrics plus the transcript, the early fields {name: (value, sec)}, the early fields
+    the final result revised {name: (early, final)}, time to first field and the final-pass latency.
+    """
+    reference_date = reference_date or datetime.now().strftime("%Y-%m-%d")
+    transcriber = StreamingTranscriber(assets, reference_date=reference_date, on_partial=on_partial,
+                                       on_field=on_field)
+    for chunk in chunks:
+        transcriber.feed(chunk)
+
+    # Reconcile: the full-utterance transcript replaces the rolling hypothesis
+    transcript, asr_latency, audio_duration, speech_duration = transcriber.finish()
+    metrics = run_hybrid_extraction_pipeline(transcript, reference_date=reference_date, use_cache=use_cache)
+    metrics.update({
+        "transcript": transcript,
+        "audio_duration_sec": audio_duration,
+        "speech_duration_sec": speech_duration,
+        "early_fields": dict(transcriber.early_fields),
+        "revised_fields": reconcile_fields(transcriber.early_fields, metrics["data"]),
+        "time_to_first_field_sec": transcriber.time_to_first_field(),
+        # Everything after the last chunk: final transcription + extraction
+        "final_latency_sec": asr_latency + metrics["latency_sec"],
+        "stream_stats": dict(transcriber.stats),
+    })
     return metrics
 
 # --- TEST CASE HANDLER ---
@@ -80,13 +326,15 @@ if __name__ == "__main__":
         
     print(f"\n--- Running FINAL {len(TEST_CASES)}-CASE BENCHMARK ---")
 
-    for i, test_case in enumerate(TEST_CASES): 
+    # Run the Hybrid Pipeline over the whole batch so Mercury round trips overlap
+    batch_start = time.perf_counter()
+    BATCH_METRICS = run_hybrid_extraction_pipeline_batch([test_case['transcript'] for test_case in TEST_CASES])
+    batch_wall_clock = time.perf_counter() - batch_start
+
+    for i, (test_case, metrics) in enumerate(zip(TEST_CASES, BATCH_METRICS)):
         transcript = test_case['transcript']
         print(f"[Test {i+1}/{len(TEST_CASES)}]: {transcript[:60]}...")
 
-        # Run the Hybrid Pipeline
-        metrics = run_hybrid_extraction_pipeline(transcript)
-        
         # Log the result
         FINAL_REPORT.append({
             "Test_ID": test_case.get('id', i + 1), # Use 'id' from JSON or index
@@ -139,4 +387,8 @@ if __name__ == "__main__":
             ]
         print("\t".join(row_data))
 
-    print("---------------------------------------------------------------------------------------------------------------------------------")
\ No newline at end of file
+    print("---------------------------------------------------------------------------------------------------------------------------------")
+    print(f"Batch wall-clock: {batch_wall_clock:.4f}s (sum of per-case latencies: {sum(e['Latency_sec'] for e in FINAL_REPORT):.4f}s)")
+    if BATCH_METRICS and BATCH_METRICS[-1]["cache_stats"]:
+        cache_stats = BATCH_METRICS[-1]["cache_stats"]
+        print(f"Extraction cache: {cache_stats['hits']} hits ({cache_stats['memory_hits']} memory / {cache_stats['disk_hits']} disk), {cache_stats['misses']} misses")
\ No newline at end of file
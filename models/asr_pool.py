@@ -0,0 +1,150 @@
+# models/asr_pool.py
+import gc
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from models.demo_utils import DEMO_ASSETS, _apply_torch_threading, extract_entities, run_asr_on_file
+
+# --- ASR POOL SETTINGS ---
+ASR_POOL_WORKERS = int(os.getenv("ASR_POOL_WORKERS", str(max(1, (os.cpu_count() or 1) // 2))))
+# torch intra-op threads per worker; 0 splits the available cores evenly between workers
+ASR_POOL_THREADS_PER_WORKER = int(os.getenv("ASR_POOL_THREADS_PER_WORKER", "0"))
+# Bind each worker to its own slice of cores (Linux), so workers never compete for the same ones
+ASR_POOL_PIN_CORES = os.getenv("ASR_POOL_PIN_CORES", "1") == "1"
+# Components loaded once in the parent and inherited by every worker
+ASR_POOL_COMPONENTS = tuple(os.getenv("ASR_POOL_COMPONENTS", "asr,xlit").split(","))
+
+# gc.freeze() is process-wide: the heap is unfrozen only when the last running pool shuts down
+_GC_FREEZE_LOCK = threading.Lock()
+_GC_FREEZE_COUNT = 0
+
+
+def _freeze_heap():
+    """Moves every object that exists now out of the GC's reach (cumulative across overlapping pools)."""
+    global _GC_FREEZE_COUNT
+    with _GC_FREEZE_LOCK:
+        gc.collect()
+        gc.freeze()
+        _GC_FREEZE_COUNT += 1
+
+
+def _unfreeze_heap():
+    global _GC_FREEZE_COUNT
+    with _GC_FREEZE_LOCK:
+        _GC_FREEZE_COUNT -= 1
+        if _GC_FREEZE_COUNT == 0:
+            gc.unfreeze()
+
+
+# --- WORKER PROCESS ---
+
+def _init_worker(threads: int, pin_cores: bool, worker_counter):
+    """Runs once per forked worker: the models are already in (shared) memory, only threading is set up."""
+    with worker_counter.get_lock():
+        index = worker_counter.value
+        worker_counter.value += 1
+    if pin_cores and hasattr(os, "sched_setaffinity"):
+        cores = sorted(os.sched_getaffinity(0))
+        first = (index * threads) % len(cores)
+        os.sched_setaffinity(0, [cores[(first + i) % len(cores)] for i in range(min(threads, len(cores)))])
+    if DEMO_ASSETS.peek('asr_available'):
+        _apply_torch_threading({"intra_op_threads": threads, "inter_op_threads": 1})
+
+
+def _transcribe_job(source, with_entities: bool):
+    result = run_asr_on_file(source, DEMO_ASSETS)
+    if not with_entities:
+        return result
+    entities = [] if result[0].startswith("ERROR") else extract_entities([result[0]])[0][0]
+    return (*result, entities)
+
+
+def _process_memory_kb(pid: int):
+    """(RSS, PSS) in kB from /proc; PSS splits shared pages between the processes mapping them."""
+    memory = {"Rss": 0, "Pss": 0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in memory:
+                    memory[key] = int(value.split()[0])
+    except OSError:
+        pass
+    return memory["Rss"], memory["Pss"]
+
+
+class ASRWorkerPool:
+    """
+    Concurrent transcription on several cores with one copy of the model weights.
+    `start()` loads the components in the parent process, then forks the workers: the weights are
+    inherited copy-on-write and never written, so every worker reads the same physical pages.
+    Each worker gets its own torch intra-op thread count (and core slice), so N workers do not
+    oversubscribe the machine. Jobs go through the executor's queue; `submit` returns a Future.
+    The parent must not run inference before `start()` (OpenMP thread pools do not survive fork).
+    Pools may overlap: the GC freeze taken by `start()` is reference-counted across them.
+    """
+
+    def __init__(self, workers: int = ASR_POOL_WORKERS, threads_per_worker: int = ASR_POOL_THREADS_PER_WORKER,
+                 components=ASR_POOL_COMPONENTS, pin_cores: bool = ASR_POOL_PIN_CORES):
+        self.workers = max(1, workers)
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // self.workers)
+        self.components = list(components)
+        self.pin_cores = pin_cores
+        self._executor = None
+
+    def start(self):
+        if self._executor is not None:
+            return self
+        DEMO_ASSETS.warmup(self.components)
+        # Move every object that exists now out of the GC's reach: collections in the workers would
+        # otherwise write to their headers and un-share the pages holding them
+        _freeze_heap()
+        context = multiprocessing.get_context("fork")
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=context, initializer=_init_worker,
+            initargs=(self.threads_per_worker, self.pin_cores, context.Value("i", 0)),
+        )
+        return self
+
+    def submit(self, source, with_entities: bool = False):
+        """
+        Queues one audio source (path, bytes). The Future resolves to run_asr_on_file's
+        (final_transcript, latency, audio_duration, speech_duration), plus the NER entities when
+        `with_entities` is set ('ner' must be among the pool's components).
+        """
+        return self.start()._executor.submit(_transcribe_job, source, with_entities)
+
+    def map(self, sources, with_entities: bool = False):
+        """Transcribes many sources concurrently; results in input order."""
+        futures = [self.submit(source, with_entities) for source in sources]
+        return [future.result() for future in futures]
+
+    def memory_stats(self):
+        """
+        Parent and summed worker RSS / PSS in MB, over this pool's own worker processes only.
+        Worker RSS counts shared weights once per worker; PSS does not.
+        """
+        parent_rss, parent_pss = _process_memory_kb(os.getpid())
+        # The executor's pid -> process table; workers are forked on demand, so it may hold fewer than `workers`
+        processes = list((self._executor._processes or {}).values()) if self._executor is not None else []
+        workers = [_process_memory_kb(process.pid) for process in processes if process.is_alive()]
+        return {
+            "workers": len(workers),
+            "parent_rss_mb": parent_rss / 1024,
+            "parent_pss_mb": parent_pss / 1024,
+            "workers_rss_mb": sum(rss for rss, _ in workers) / 1024,
+            "workers_pss_mb": sum(pss for _, pss in workers) / 1024,
+        }
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+            _unfreeze_heap()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
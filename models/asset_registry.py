@@ -0,0 +1,78 @@
+# models/asset_registry.py
+import time
+import threading
+
+
+class LazyAssetRegistry(dict):
+    """
+    Dict of demo assets whose components load on first access.
+    Each component (ASR, NER, transliteration, TTS) owns a set of keys and a loader returning
+    those keys; the loader runs once, under its own lock, the first time any of its keys is read.
+    Existing callers keep using plain dict access (`assets['asr_model']`, `assets.get(...)`).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._loaders = {}
+        self._key_owner = {}
+        self._locks = {}
+        self._loaded = set()
+        self.load_times = {}
+
+    def register(self, component: str, keys, loader):
+        """Registers `loader()` -> dict as the provider of `keys` for `component`."""
+        self._loaders[component] = loader
+        self._locks[component] = threading.Lock()
+        for key in keys:
+            self._key_owner[key] = component
+
+    def is_loaded(self, component: str):
+        return component in self._loaded
+
+    def load(self, component: str):
+        """Loads a component if it has not been loaded yet (thread-safe)."""
+        if component in self._loaded:
+            return
+        with self._locks[component]:
+            if component in self._loaded:
+                return
+            start_time = time.perf_counter()
+            super().update(self._loaders[component]())
+            self.load_times[component] = time.perf_counter() - start_time
+            self._loaded.add(component)
+
+    def reset(self, component: str):
+        """Drops a loaded component so its next access reloads it (e.g. after a config change)."""
+        with self._locks[component]:
+            for key, owner in self._key_owner.items():
+                if owner == component:
+                    super().pop(key, None)
+            self._loaded.discard(component)
+            self.load_times.pop(component, None)
+
+    def warmup(self, components=None):
+        """Eagerly loads the given components (default: all), e.g. before a server accepts traffic."""
+        for component in (components or list(self._loaders)):
+            self.load(component)
+        return self
+
+    def peek(self, key, default=None):
+        """Reads a key without triggering its loader."""
+        return super().get(key, default)
+
+    def _ensure(self, key):
+        component = self._key_owner.get(key)
+        if component is not None and component not in self._loaded:
+            self.load(component)
+
+    def __getitem__(self, key):
+        self._ensure(key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        self._ensure(key)
+        return super().__contains__(key)
+
+    def get(self, key, default=None):
+        self._ensure(key)
+        return super().get(key, default)
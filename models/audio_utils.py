@@ -0,0 +1,206 @@
+# models/audio_utils.py
+import io
+import os
+import subprocess
+import numpy as np
+
+# --- Whisper / VAD constants ---
+ASR_SAMPLING_RATE = 16000
+WHISPER_WINDOW_SEC = 30.0
+VAD_FRAME_SEC = 0.03
+VAD_MIN_SILENCE_SEC = 0.3   # pauses shorter than this stay inside a speech region
+VAD_SPEECH_PAD_SEC = 0.15   # context kept on both sides of every region
+VAD_THRESHOLD_DB = 12.0     # speech must sit this far above the estimated noise floor
+VAD_ABSOLUTE_FLOOR_DB = -50.0
+DECODE_BLOCK_FRAMES = 1 << 16
+
+
+# --- DECODE / RESAMPLE ---
+
+def _as_input(source):
+    """Normalizes a path, bytes or file-like object into something soundfile/ffmpeg can read."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if isinstance(source, os.PathLike):
+        return os.fspath(source)
+    return source
+
+
+def _decode_with_soundfile(source, target_sr: int, block_frames: int):
+    """
+    Streams blocks through libsndfile, downmixing to mono and resampling with soxr per block.
+    Blocks are written into one preallocated output buffer, so peak memory stays ~1x the result.
+    """
+    import soundfile as sf
+
+    with sf.SoundFile(source) as audio:
+        resampler = None
+        if audio.samplerate != target_sr:
+            import soxr
+            resampler = soxr.ResampleStream(audio.samplerate, target_sr, 1, dtype='float32')
+
+        expected = int(np.ceil(audio.frames * target_sr / audio.samplerate)) if audio.frames > 0 else 0
+        output = np.empty(expected + block_frames, dtype=np.float32)
+        filled = 0
+
+        def append(chunk):
+            nonlocal output, filled
+            if filled + len(chunk) > len(output):
+                output = np.resize(output, max(2 * len(output), filled + len(chunk)))
+            output[filled:filled + len(chunk)] = chunk
+            filled += len(chunk)
+
+        # libsndfile converts any bit depth (16/24/32-bit int, float) straight to float32
+        for block in audio.blocks(blocksize=block_frames, dtype='float32', always_2d=True):
+            mono = block[:, 0] if block.shape[1] == 1 else block.mean(axis=1, dtype=np.float32)
+            append(resampler.resample_chunk(mono) if resampler else mono)
+        if resampler:
+            append(resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True))
+
+    return output[:filled]
+
+
+def _decode_with_ffmpeg(source, target_sr: int):
+    """Containers libsndfile cannot read (m4a/aac, mp3 on old builds): ffmpeg emits float32 mono PCM directly."""
+    command = ["ffmpeg", "-nostdin", "-loglevel", "error", "-i", "pipe:0" if not isinstance(source, str) else source,
+               "-f", "f32le", "-ac", "1", "-ar", str(target_sr), "pipe:1"]
+    stdin_bytes = None
+    if not isinstance(source, str):
+        if hasattr(source, "seek"):
+            source.seek(0)
+        stdin_bytes = source.read()
+
+    completed = subprocess.run(command, input=stdin_bytes, capture_output=True, check=True)
+    return np.frombuffer(completed.stdout, dtype=np.float32)
+
+
+def decode_audio(source, target_sr: int = ASR_SAMPLING_RATE, block_frames: int = DECODE_BLOCK_FRAMES):
+    """
+    Decodes a path, bytes or file-like object into a float32 mono NumPy buffer at `target_sr`.
+    Any channel count and bit depth is accepted. libsndfile + soxr streaming is tried first;
+    ffmpeg is the fallback for compressed containers.
+    """
+    source = _as_input(source)
+    try:
+        return _decode_with_soundfile(source, target_sr, block_frames)
+    except (ImportError, RuntimeError):
+        # soundfile raises LibsndfileError (a RuntimeError) for formats it cannot open
+        return _decode_with_ffmpeg(source, target_sr)
+
+
+def frame_energies_db(speech: np.ndarray, sampling_rate: int = ASR_SAMPLING_RATE, frame_sec: float = VAD_FRAME_SEC):
+    """Per-frame RMS energy in dBFS for a mono float32 buffer. Returns (energies, frame_length)."""
+    frame_length = max(1, int(sampling_rate * frame_sec))
+    n_frames = int(np.ceil(len(speech) / frame_length))
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32), frame_length
+
+    padded = np.zeros(n_frames * frame_length, dtype=np.float32)
+    padded[:len(speech)] = speech
+    frames = padded.reshape(n_frames, frame_length)
+    rms = np.sqrt(np.mean(np.square(frames), axis=1) + 1e-12)
+    return 20.0 * np.log10(rms), frame_length
+
+
+def detect_speech_regions(speech: np.ndarray, sampling_rate: int = ASR_SAMPLING_RATE,
+                          threshold_db: float = VAD_THRESHOLD_DB, min_silence_sec: float = VAD_MIN_SILENCE_SEC,
+                          pad_sec: float = VAD_SPEECH_PAD_SEC):
+    """
+    Energy-based voice activity detection.
+    Returns a list of (start_sample, end_sample) speech regions in the original buffer.
+    """
+    energies, frame_length = frame_energies_db(speech, sampling_rate)
+    if len(energies) == 0:
+        return []
+
+    # Noise floor = quiet percentile of the file; speech = frames well above it
+    noise_floor = np.percentile(energies, 10)
+    threshold = max(noise_floor + threshold_db, VAD_ABSOLUTE_FLOOR_DB)
+    voiced = energies > threshold
+    if not voiced.any():
+        return []
+
+    # Rising/falling edges of the voiced mask -> frame-level runs
+    edges = np.diff(np.concatenate(([0], voiced.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    # Bridge short pauses, then pad each region with a little context
+    min_gap = int(np.ceil(min_silence_sec / (frame_length / sampling_rate)))
+    pad = int(pad_sec * sampling_rate)
+    regions = []
+    for start, end in zip(starts, ends):
+        if regions and start - regions[-1][1] < min_gap:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+
+    return [
+        (max(0, start * frame_length - pad), min(len(speech), end * frame_length + pad))
+        for start, end in regions
+    ]
+
+
+class SpeechOffsetMap:
+    """
+    Maps sample positions in a silence-trimmed buffer (speech regions concatenated) back to the
+    original audio, so timestamps computed on the trimmed buffer still refer to the source file.
+    """
+
+    def __init__(self, regions):
+        self.original_starts = np.array([start for start, _ in regions], dtype=np.int64)
+        self.lengths = np.array([end - start for start, end in regions], dtype=np.int64)
+        self.trimmed_starts = np.concatenate(([0], np.cumsum(self.lengths)[:-1])).astype(np.int64)
+        self.trimmed_length = int(self.lengths.sum())
+
+    def trimmed_regions(self):
+        """The speech regions in trimmed-buffer coordinates (adjacent, in order)."""
+        return [(int(start), int(start + length)) for start, length in zip(self.trimmed_starts, self.lengths)]
+
+    def to_original(self, position, is_end: bool = False):
+        """
+        Trimmed sample position(s) -> original sample position(s). A position on a region boundary
+        maps to the start of the next region, or with `is_end=True` to the end of the previous one.
+        """
+        position = np.asarray(position, dtype=np.int64)
+        if len(self.lengths) == 0:
+            return position
+        region = np.searchsorted(self.trimmed_starts, position, side="left" if is_end else "right") - 1
+        region = np.clip(region, 0, len(self.lengths) - 1)
+        return self.original_starts[region] + (position - self.trimmed_starts[region])
+
+
+def trim_silence(speech: np.ndarray, sampling_rate: int = ASR_SAMPLING_RATE, regions=None):
+    """
+    Drops non-speech audio (leading/trailing silence and pauses beyond VAD_MIN_SILENCE_SEC) by
+    concatenating the VAD speech regions, each keeping its VAD_SPEECH_PAD_SEC of context.
+    Returns (trimmed buffer, SpeechOffsetMap); the buffer is empty when no speech was found.
+    """
+    if regions is None:
+        regions = detect_speech_regions(speech, sampling_rate)
+    offset_map = SpeechOffsetMap(regions)
+    if len(regions) == 1 and regions[0] == (0, len(speech)):
+        return speech, offset_map
+    if not regions:
+        return speech[:0], offset_map
+    return np.concatenate([speech[start:end] for start, end in regions]), offset_map
+
+
+def plan_asr_windows(regions, sampling_rate: int = ASR_SAMPLING_RATE, max_window_sec: float = WHISPER_WINDOW_SEC):
+    """
+    Packs speech regions into decode windows no longer than Whisper's 30 s context.
+    Adjacent regions share a window while they fit; longer regions are split evenly.
+    Returns a list of (start_sample, end_sample).
+    """
+    max_len = int(max_window_sec * sampling_rate)
+    windows = []
+    for start, end in regions:
+        # Split any single region that is longer than one window into equal pieces
+        n_pieces = int(np.ceil((end - start) / max_len))
+        bounds = np.linspace(start, end, n_pieces + 1).astype(int)
+        for piece_start, piece_end in zip(bounds[:-1], bounds[1:]):
+            if windows and piece_end - windows[-1][0] <= max_len:
+                windows[-1] = (windows[-1][0], piece_end)
+            else:
+                windows.append((piece_start, piece_end))
+    return windows
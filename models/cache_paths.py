@@ -0,0 +1,25 @@
+# models/cache_paths.py
+import os
+
+# Root of the on-disk caches. They hold transcripts and rendered lead names (customer PII), so they live
+# under the user's own cache directory, never in a shared temp directory.
+VOICE_BOT_CACHE_HOME = os.getenv(
+    "VOICE_BOT_CACHE_HOME",
+    os.path.join(os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "voice_bot")
+)
+
+
+def private_cache_dir(*parts):
+    """Creates (if needed) and returns a directory under VOICE_BOT_CACHE_HOME that only the current user can access."""
+    path = os.path.join(VOICE_BOT_CACHE_HOME, *parts)
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    # makedirs' mode is filtered by the umask and not applied to a directory that already exists
+    os.chmod(path, 0o700)
+    return path
+
+
+def create_private_file(path: str):
+    """Creates `path` if missing and restricts it to the current user (0600)."""
+    os.close(os.open(path, os.O_CREAT | os.O_RDWR, 0o600))
+    os.chmod(path, 0o600)
+    return path
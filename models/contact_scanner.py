@@ -0,0 +1,96 @@
+# models/contact_scanner.py
+import re
+
+# --- Spoken-form vocabulary ---
+DIGIT_WORDS = {
+    'zero': '0', 'oh': '0', 'one': '1', 'two': '2', 'three': '3', 'four': '4',
+    'five': '5', 'six': '6', 'seven': '7', 'eight': '8', 'nine': '9'
+}
+REPEAT_WORDS = {'double': 2, 'triple': 3}
+EMAIL_SEPARATOR_WORDS = {'dot': '.', 'underscore': '_', 'dash': '-', 'hyphen': '-'}
+EMAIL_TLDS = ['com', 'in', 'org', 'net', 'co', 'io', 'edu', 'gov', 'biz', 'info', 'ai', 'uk', 'us']
+# Words that end up before "at ... dot com" in ordinary speech and are never an email local part
+NON_EMAIL_LOCAL_PARTS = frozenset({'meet', 'meeting', 'visit', 'call', 'reach', 'me', 'him', 'her', 'us', 'them', 'is', 'be'})
+PHONE_MIN_DIGITS = 10
+PHONE_MAX_DIGITS = 13
+
+_DIGIT_WORD = '(?:' + '|'.join(DIGIT_WORDS) + ')'
+_PHONE_TOKEN = r'(?:(?:double|triple)\s+' + _DIGIT_WORD + '|' + _DIGIT_WORD + r'|\d+)'
+_EMAIL_ATOM = r'[a-z0-9]+'
+_EMAIL_JOIN = r'\s+(?:dot|underscore|dash|hyphen)\s+'
+
+# --- Precompiled scanners (applied to the lowercased transcript) ---
+WRITTEN_EMAIL_RE = re.compile(r'\b[a-z0-9._%+-]+@[a-z0-9-]+(?:\.[a-z0-9-]+)+\b')
+SPOKEN_EMAIL_RE = re.compile(
+    r'\b(' + _EMAIL_ATOM + '(?:' + _EMAIL_JOIN + _EMAIL_ATOM + r')*)\s+at\s+'
+    r'(' + _EMAIL_ATOM + r'(?:\s+dot\s+' + _EMAIL_ATOM + r')*\s+dot\s+(?:' + '|'.join(EMAIL_TLDS) + r'))\b'
+)
+DIGIT_RE = re.compile(r'\d')
+_WORD_RE = re.compile(r'\w+')
+DIGIT_WORD_SET = frozenset(DIGIT_WORDS)
+PHONE_RE = re.compile(r'(?:\+\s*|\bplus\s+)?\b' + _PHONE_TOKEN + r'(?:[\s-]+' + _PHONE_TOKEN + r')+\b')
+_PHONE_TOKEN_RE = re.compile(_PHONE_TOKEN)
+_SPOKEN_SEPARATOR_RE = re.compile(r'\s+(dot|underscore|dash|hyphen)\s+')
+_SPOKEN_DOT_RE = re.compile(r'\s+dot\s+')
+
+
+def _normalize_spoken_email(local_part: str, domain: str):
+    """'john dot smith' + 'gmail dot com' -> 'john.smith@gmail.com'"""
+    local_part = _SPOKEN_SEPARATOR_RE.sub(lambda m: EMAIL_SEPARATOR_WORDS[m.group(1)], local_part)
+    domain = _SPOKEN_DOT_RE.sub('.', domain)
+    return f"{local_part}@{domain}"
+
+
+def _phone_digits(spoken: str):
+    """Expands a spoken/written digit run ('nine double eight 20 ...') into a digit string."""
+    digits = []
+    for token in _PHONE_TOKEN_RE.findall(spoken):
+        parts = token.split()
+        if parts[0] in REPEAT_WORDS:
+            digits.append(DIGIT_WORDS[parts[1]] * REPEAT_WORDS[parts[0]])
+        elif token in DIGIT_WORDS:
+            digits.append(DIGIT_WORDS[token])
+        else:
+            digits.append(token)
+    return "".join(digits)
+
+
+def scan_contact_fields(text: str, words=None):
+    """
+    Finds dictated or written emails and phone numbers in a lowercased transcript.
+    `words` optionally passes the transcript's already tokenized words to skip re-tokenizing.
+    Returns ({'email': ..., 'phone_number': ...} with 'N/A' defaults, list of matched (start, end) spans).
+    """
+    fields = {"email": "N/A", "phone_number": "N/A"}
+    spans = []
+
+    # Each scanner sits behind a substring/cue check so contact-free transcripts cost almost nothing
+    if '@' in text:
+        for m in WRITTEN_EMAIL_RE.finditer(text):
+            if fields["email"] == "N/A":
+                fields["email"] = m.group(0)
+            spans.append(m.span())
+
+    if ' at ' in text and ' dot ' in text:
+        for m in SPOKEN_EMAIL_RE.finditer(text):
+            if m.group(1) in NON_EMAIL_LOCAL_PARTS or any(m.start() < end and start < m.end() for start, end in spans):
+                continue
+            if fields["email"] == "N/A":
+                fields["email"] = _normalize_spoken_email(m.group(1), m.group(2))
+            spans.append(m.span())
+
+    # A phone number needs PHONE_MIN_DIGITS digits; each spoken digit word yields at most three ("triple five")
+    digit_words = sum(1 for word in (words or _WORD_RE.findall(text)) if word in DIGIT_WORD_SET)
+    has_phone_cue = len(DIGIT_RE.findall(text)) + 3 * digit_words >= PHONE_MIN_DIGITS
+    for m in (PHONE_RE.finditer(text) if has_phone_cue else ()):
+        if any(m.start() < end and start < m.end() for start, end in spans):
+            continue
+        digits = _phone_digits(m.group(0))
+        if not PHONE_MIN_DIGITS <= len(digits) <= PHONE_MAX_DIGITS:
+            continue
+        if fields["phone_number"] == "N/A":
+            prefix = "+" if m.group(0).lstrip().startswith(('+', 'plus')) else ""
+            fields["phone_number"] = prefix + digits
+        spans.append(m.span())
+
+    return fields, sorted(spans)
@@ -1,142 +1,509 @@
 import os
 import time
-import re
-import torch
 import numpy as np
-from pydub import AudioSegment
-from transformers import WhisperProcessor, WhisperForConditionalGeneration, pipeline
-from indic_transliteration.sanscript import transliterate, ITRANS
-from gtts import gTTS
+from concurrent.futures import ThreadPoolExecutor
+from models.asset_registry import LazyAssetRegistry
+from models.ner_stage import NER_BATCH_SIZE, get_entity_cache, normalize_ner_text, run_ner_batch
+from models.name_normalizer import get_name_variants, get_transliteration_memo, normalize_names_batch
+from models.telemetry import span, record, increment
+from models.transcript_cache import get_transcript_cache, make_transcript_key
+from models.tts_cache import CONFIRMATION_TEMPLATE, ConfirmationSpeaker, OfflineSynthesizer, get_phrase_audio_cache
+from models.audio_utils import (
+    ASR_SAMPLING_RATE, WHISPER_WINDOW_SEC, VAD_MIN_SILENCE_SEC, VAD_SPEECH_PAD_SEC, VAD_THRESHOLD_DB,
+    decode_audio, detect_speech_regions, plan_asr_windows, trim_silence
+)
 
-# --- GLOBAL SETUP DICTIONARY ---
-DEMO_ASSETS = {}
+# Heavy dependencies (torch, transformers, pyttsx3, indic_transliteration) are imported by the
+# component loaders below, on first use, so importing this module stays cheap.
 
-# --- CORE UTILITIES ---
+ASR_MODEL_NAME = os.getenv("ASR_MODEL_NAME", "openai/whisper-base")
+
+# Windows decoded together in one `generate` call in long-form mode
+ASR_LONG_FORM_BATCH_SIZE = int(os.getenv("ASR_LONG_FORM_BATCH_SIZE", "4"))
+# Files decoded together in one `generate` call by run_asr_on_files
+ASR_BATCH_SIZE = int(os.getenv("ASR_BATCH_SIZE", "8"))
+ASR_DECODE_WORKERS = int(os.getenv("ASR_DECODE_WORKERS", "4"))
+# Drop leading/trailing silence and long pauses (energy VAD) before feature extraction
+ASR_TRIM_SILENCE = os.getenv("ASR_TRIM_SILENCE", "1") == "1"
+
+# --- CPU INFERENCE PROFILES ---
+# quantize: dynamic int8 quantization of every nn.Linear (weights int8, activations quantized on the fly)
+# intra_op_threads / inter_op_threads: torch thread pools (None keeps torch's default)
+# num_beams: 1 = greedy decoding, >1 = beam search
+ASR_CPU_PROFILES = {
+    "fp32": {"quantize": False, "intra_op_threads": None, "inter_op_threads": None, "num_beams": 1},
+    "fp32-beam": {"quantize": False, "intra_op_threads": None, "inter_op_threads": None, "num_beams": 4},
+    "int8": {"quantize": True, "intra_op_threads": os.cpu_count(), "inter_op_threads": 1, "num_beams": 1},
+    "int8-beam": {"quantize": True, "intra_op_threads": os.cpu_count(), "inter_op_threads": 1, "num_beams": 4},
+}
+ASR_PROFILE = os.getenv("ASR_PROFILE", "fp32")
 
-def setup_demo_assets():
-    global DEMO_ASSETS
+# --- COMPONENT LOADERS ---
+
+def _apply_torch_threading(profile: dict):
+    import torch
+    if profile.get("intra_op_threads"):
+        torch.set_num_threads(profile["intra_op_threads"])
+    if profile.get("inter_op_threads"):
+        try:
+            torch.set_num_interop_threads(profile["inter_op_threads"])
+        except RuntimeError:
+            # Can only be set once, before any inter-op parallel work has started
+            pass
+
+def _load_asr_component():
+    profile = ASR_CPU_PROFILES[ASR_PROFILE]
     try:
-        # ASR
-        DEMO_ASSETS['asr_processor'] = WhisperProcessor.from_pretrained("openai/whisper-base")
-        DEMO_ASSETS['asr_model'] = WhisperForConditionalGeneration.from_pretrained("openai/whisper-base")
-        DEMO_ASSETS['asr_available'] = True
-        print(" Hugging Face Whisper ASR Model Loaded Locally.")
+        import torch
+        from transformers import WhisperProcessor, WhisperForConditionalGeneration
+        _apply_torch_threading(profile)
+        processor = WhisperProcessor.from_pretrained(ASR_MODEL_NAME)
+        model = WhisperForConditionalGeneration.from_pretrained(ASR_MODEL_NAME)
+        model.eval()
+        if profile["quantize"]:
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        print(f" Hugging Face Whisper ASR Model Loaded Locally (profile: {ASR_PROFILE}).")
+        return {
+            'asr_processor': processor, 'asr_model': model, 'asr_available': True,
+            'asr_profile': ASR_PROFILE, 'asr_generate_kwargs': {"num_beams": profile["num_beams"], "do_sample": False}
+        }
     except Exception as e:
         print(f" ERROR loading ASR model: {e}")
-        DEMO_ASSETS['asr_available'] = False
+        return {
+            'asr_processor': None, 'asr_model': None, 'asr_available': False,
+            'asr_profile': ASR_PROFILE, 'asr_generate_kwargs': {}
+        }
 
-    DEMO_ASSETS['xlit_engine_available'] = True
-    print(" Indic Transliteration Logic Initialized.")
+def _load_xlit_component():
+    try:
+        from indic_transliteration.sanscript import transliterate, ITRANS
+        print(" Indic Transliteration Logic Initialized.")
+        return {'xlit_engine_available': True, 'xlit_transliterate': transliterate, 'xlit_scheme': ITRANS}
+    except Exception as e:
+        print(f" ERROR loading transliteration engine: {e}")
+        return {'xlit_engine_available': False, 'xlit_transliterate': None, 'xlit_scheme': None}
 
-    DEMO_ASSETS['tts_available'] = True
-    print(" TTS functionality disabled due to system download issues.")
+def _load_tts_component():
+    try:
+        synthesizer = OfflineSynthesizer()
+        speaker = ConfirmationSpeaker(synthesizer, get_phrase_audio_cache())
+        prerender_latency = speaker.prerender()
+        print(f" Offline TTS Engine Initialized ({synthesizer.engine_id}, template pre-rendered in {prerender_latency:.3f}s).")
+        return {'tts_available': True, 'tts_engine': synthesizer, 'tts_speaker': speaker}
+    except Exception as e:
+        print(f" ERROR loading TTS engine: {e}")
+        return {'tts_available': False, 'tts_engine': None, 'tts_speaker': None}
 
+def _load_ner_component():
     try:
         # Load NER pipeline, fine-tune or choose appropriate model as needed
-        DEMO_ASSETS['ner_pipeline'] = pipeline("ner", grouped_entities=True)
+        from transformers import pipeline
+        ner_pipeline = pipeline("ner", grouped_entities=True)
         print(" NER Pipeline Loaded.")
+        return {'ner_pipeline': ner_pipeline}
     except Exception as e:
         print(f" ERROR loading NER pipeline: {e}")
-        DEMO_ASSETS['ner_pipeline'] = None
+        return {'ner_pipeline': None}
+
+# --- GLOBAL SETUP DICTIONARY ---
+DEMO_ASSETS = LazyAssetRegistry()
+DEMO_ASSETS.register(
+    'asr', ['asr_processor', 'asr_model', 'asr_available', 'asr_profile', 'asr_generate_kwargs'], _load_asr_component
+)
+DEMO_ASSETS.register('xlit', ['xlit_engine_available', 'xlit_transliterate', 'xlit_scheme'], _load_xlit_component)
+DEMO_ASSETS.register('tts', ['tts_available', 'tts_engine', 'tts_speaker'], _load_tts_component)
+DEMO_ASSETS.register('ner', ['ner_pipeline'], _load_ner_component)
 
+# --- CORE UTILITIES ---
+
+def configure_asr_profile(profile: str):
+    """Selects a CPU inference profile from ASR_CPU_PROFILES; an already loaded ASR model is reloaded on next use."""
+    global ASR_PROFILE
+    if profile not in ASR_CPU_PROFILES:
+        raise ValueError(f"Unknown ASR profile '{profile}'. Choose from: {', '.join(ASR_CPU_PROFILES)}")
+    if profile != ASR_PROFILE and DEMO_ASSETS.is_loaded('asr'):
+        DEMO_ASSETS.reset('asr')
+    ASR_PROFILE = profile
+
+def setup_demo_assets(eager: bool = False, asr_profile: str = None):
+    """
+    Returns the shared asset registry. Components load lazily on first use;
+    `eager=True` loads everything up front (same as calling `warmup()`).
+    `asr_profile` picks a CPU inference profile (see ASR_CPU_PROFILES), e.g. "int8".
+    """
+    if asr_profile:
+        configure_asr_profile(asr_profile)
+    if eager:
+        warmup()
     return DEMO_ASSETS
 
-def normalize_transcript_names(transcript: str):
-    if not DEMO_ASSETS.get('xlit_engine_available'):
-        return transcript
+def warmup(components=None):
+    """Loads the given components ('asr', 'ner', 'xlit', 'tts'; default all) before serving traffic."""
+    return DEMO_ASSETS.warmup(components)
 
-    words = transcript.split()
-    normalized_words = []
+def normalize_transcript_names(transcript: str):
+    return normalize_transcript_names_batch([transcript])[0]
 
-    SRC_SCHEME = ITRANS
-    TGT_SCHEME = ITRANS
+def normalize_transcript_names_batch(transcripts):
+    """
+    Normalizes name spellings in many transcripts at once: each distinct name word in the batch is
+    looked up in the name-variant dictionary or transliterated once, with results memoized across calls.
+    """
+    transcripts = list(transcripts)
+    engine_available = DEMO_ASSETS.get('xlit_engine_available')
+    variants = get_name_variants()
+    if not engine_available and not variants:
+        return transcripts
+    # Batch size as counters (mean = transcripts / batches), not a label: one histogram per size otherwise
+    increment("asr.transliterate.batches")
+    increment("asr.transliterate.transcripts", len(transcripts))
+    with span("asr.transliterate"):
+        normalized, _ = normalize_names_batch(
+            transcripts,
+            transliterate=DEMO_ASSETS['xlit_transliterate'] if engine_available else None,
+            scheme=DEMO_ASSETS['xlit_scheme'],
+            variants=variants,
+            memo=get_transliteration_memo(),
+        )
+    # NER runs once per transcript in the shared stage below (see extract_entities), not here
+    return normalized
 
-    for word in words:
-        # Transliterate capitalized words (names)
-        if word[0].isupper() and len(word) > 2 and re.match(r'^[A-Za-z]+$', word):
-            try:
-                normalized_word = transliterate(word, SRC_SCHEME, TGT_SCHEME)
-                if normalized_word and re.match(r'^[A-Za-z\s]+$', normalized_word):
-                    normalized_words.append(normalized_word.capitalize())
-                    continue
-            except Exception:
-                pass
-        normalized_words.append(word)
-
-    normalized_transcript = " ".join(normalized_words)
-
-    # Use NER to extract names and other entities for correction if NER exists
-    ner = DEMO_ASSETS.get('ner_pipeline')
-    if ner:
-        ner_results = ner(normalized_transcript)
-        # Example: Replace person entity words with confirmed spelling if needed
-        # This can be extended with correction logic or feedback loop
-
-    return normalized_transcript
-
-def run_asr_on_file(filename: str, assets: dict):
-    if not assets.get('asr_available'):
-        return "ERROR: ASR Model not initialized.", 0.0, 0.0, 0.0
+def extract_entities(transcripts, assets: dict = DEMO_ASSETS, batch_size: int = NER_BATCH_SIZE):
+    """
+    Shared NER stage: one batched pipeline pass over the transcripts, with entities cached by
+    normalized text so repeated transcripts never hit the model twice.
+    The NER model is only loaded when some transcript is not cached (entities come back with
+    transcript-cache hits). Results are stored on the matching transcript-cache entries.
+    Returns a list of entity lists (one per transcript) and the stage latency (float).
+    """
+    transcripts = list(transcripts)
+    entities, latency = run_ner_batch(transcripts, None, batch_size=batch_size, cache=get_entity_cache(),
+                                      load_ner=lambda: assets.get('ner_pipeline'))
+    record("ner", latency)
+    transcript_cache = get_transcript_cache()
+    if transcript_cache is not None:
+        for transcript, transcript_entities in zip(transcripts, entities):
+            if transcript_entities:
+                transcript_cache.attach_entities(transcript, transcript_entities)
+    return entities, latency
 
+def _resolve_sample_audio_path(filename: str):
+    if os.path.isabs(filename):
+        return filename
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    audio_file_path = os.path.normpath(os.path.join(script_dir, os.pardir, "tests", "sample_audio", filename))
+    return os.path.normpath(os.path.join(script_dir, os.pardir, "tests", "sample_audio", filename))
+
+def _load_audio_source(source):
+    """
+    Decodes a filename under tests/sample_audio, an absolute path, raw bytes or a file-like object
+    to a mono float32 NumPy buffer at the ASR sampling rate. Returns (speech, error).
+    """
+    if isinstance(source, (str, os.PathLike)):
+        source = _resolve_sample_audio_path(os.fspath(source))
+        if not os.path.exists(source):
+            return None, f"ERROR: File not found at {source}"
+    try:
+        with span("asr.decode"):
+            return decode_audio(source, ASR_SAMPLING_RATE), None
+    except Exception as e:
+        return None, f"ERROR: Failed to read audio file: {e}"
+
+def _generate(assets: dict, input_features):
+    """Runs Whisper generation with the active profile's decoding options."""
+    import torch
+    with span("asr.generate", profile=assets.get('asr_profile'), batch=len(input_features)), torch.inference_mode():
+        return assets['asr_model'].generate(input_features, **(assets.get('asr_generate_kwargs') or {}))
+
+def _extract_features(processor, audio):
+    """Log-mel features for one buffer or a list of buffers (padded to Whisper's 30 s input)."""
+    with span("asr.features"):
+        return processor(audio, sampling_rate=ASR_SAMPLING_RATE, return_tensors="pt").input_features
+
+def asr_model_identity(long_form: bool = None):
+    """Everything besides the audio that decides a transcript (model, profile, trimming, VAD); part of the cache key."""
+    profile = ASR_CPU_PROFILES[ASR_PROFILE]
+    return (f"{ASR_MODEL_NAME}|profile={ASR_PROFILE}|quantize={profile['quantize']}|beams={profile['num_beams']}"
+            f"|trim={ASR_TRIM_SILENCE}|vad={VAD_MIN_SILENCE_SEC},{VAD_SPEECH_PAD_SEC},{VAD_THRESHOLD_DB}"
+            f"|long_form={long_form}")
+
+def _lookup_transcript(cache, key: str):
+    """Cached transcription entry for `key`, or None. Stored entities are handed to the NER cache on a hit."""
+    with span("asr.transcript_cache") as cache_span:
+        entry, tier = cache.get(key)
+        cache_span.set_label("tier", tier or "miss")
+    if entry is not None and entry["entities"] is not None:
+        get_entity_cache().put(normalize_ner_text(entry["normalized"]), entry["entities"])
+    return entry
+
+def trim_for_asr(speech: np.ndarray, trim: bool = None):
+    """
+    Speech-only buffer for feature extraction (`trim` defaults to ASR_TRIM_SILENCE). Returns
+    (buffer, offset_map); offset_map is None when trimming is off (the buffer is then the original audio).
+    """
+    if not (ASR_TRIM_SILENCE if trim is None else trim):
+        return speech, None
+    with span("asr.vad"):
+        trimmed, offset_map = trim_silence(speech, ASR_SAMPLING_RATE)
+    # Speech ratio as values, not a label: speech_seconds / audio_seconds over any window
+    increment("asr.vad.audio_seconds", len(speech) / ASR_SAMPLING_RATE)
+    increment("asr.vad.speech_seconds", len(trimmed) / ASR_SAMPLING_RATE)
+    return trimmed, offset_map
+
+def transcribe_long_form(speech: np.ndarray, assets: dict, batch_size: int = ASR_LONG_FORM_BATCH_SIZE,
+                         max_window_sec: float = WHISPER_WINDOW_SEC, offset_map=None):
+    """
+    Long-form ASR: splits the buffer on voice-activity boundaries into windows of at most 30 s,
+    decodes the windows in batches through `generate`, and stitches the text back together.
+    With `offset_map` (from `trim_for_asr`) `speech` is already silence-trimmed: windows are packed
+    with speech only and segment times are mapped back through the map.
+    Returns (transcription, segments, speech_duration) where each segment is
+    {"start": sec, "end": sec, "text": str} relative to the original audio.
+    """
+    processor = assets['asr_processor']
+
+    if offset_map is not None:
+        windows = plan_asr_windows(offset_map.trimmed_regions(), ASR_SAMPLING_RATE, max_window_sec)
+    else:
+        with span("asr.vad"):
+            windows = plan_asr_windows(detect_speech_regions(speech, ASR_SAMPLING_RATE), ASR_SAMPLING_RATE, max_window_sec)
+    segments = []
+    for batch_start in range(0, len(windows), batch_size):
+        batch_windows = windows[batch_start:batch_start + batch_size]
+        batch_audio = [speech[start:end] for start, end in batch_windows]
 
-    print(f"Resolved audio file path: {audio_file_path}")
-    print(f"File exists: {os.path.exists(audio_file_path)}")
+        input_features = _extract_features(processor, batch_audio)
+        generated_ids = _generate(assets, input_features)
+        texts = processor.batch_decode(generated_ids, skip_special_tokens=True)
 
-    if not os.path.exists(audio_file_path):
-        return f"ERROR: File not found at {audio_file_path}", 0.0, 0.0, 0.0
+        for (start, end), text in zip(batch_windows, texts):
+            if offset_map is not None:
+                start, end = int(offset_map.to_original(start)), int(offset_map.to_original(end, is_end=True))
+            segments.append({
+                "start": start / ASR_SAMPLING_RATE,
+                "end": end / ASR_SAMPLING_RATE,
+                "text": text.strip()
+            })
+
+    transcription = " ".join(segment["text"] for segment in segments if segment["text"])
+    speech_duration = sum(end - start for start, end in windows) / ASR_SAMPLING_RATE
+    return transcription, segments, speech_duration
+
+def run_long_form_asr_on_file(filename, assets: dict, batch_size: int = ASR_LONG_FORM_BATCH_SIZE):
+    """
+    Long-form variant of `run_asr_on_file` for voice notes beyond Whisper's 30 s window.
+    Returns (final_transcript, latency, audio_duration, speech_duration, segments).
+    """
+    if not assets.get('asr_available'):
+        return "ERROR: ASR Model not initialized.", 0.0, 0.0, 0.0, []
+
+    speech, error = _load_audio_source(filename)
+    if error:
+        return error, 0.0, 0.0, 0.0, []
+
+    audio_duration = len(speech) / ASR_SAMPLING_RATE
+    start_time = time.perf_counter()
 
     try:
-        audio = AudioSegment.from_file(audio_file_path)
-        if audio.frame_rate != 16000:
-            audio = audio.set_frame_rate(16000)
-        sampling_rate = 16000
+        speech, offset_map = trim_for_asr(speech)
+        transcription, segments, speech_duration = transcribe_long_form(speech, assets, batch_size=batch_size,
+                                                                        offset_map=offset_map)
+        latency = time.perf_counter() - start_time
+
+        final_transcript = normalize_transcript_names(transcription)
 
-        speech = np.array(audio.get_array_of_samples()).astype(np.float32) / 32768.0
+        return final_transcript, latency, audio_duration, speech_duration, segments
     except Exception as e:
-        return f"ERROR: Failed to read audio file: {e}", 0.0, 0.0, 0.0
+        latency = time.perf_counter() - start_time
+        return f"ERROR: ASR Local Inference Failed. {e}", latency, audio_duration, 0.0, []
 
+def transcribe_buffer(speech: np.ndarray, assets: dict, long_form: bool = None):
+    """
+    Silence-trims and decodes one 16 kHz buffer: a single pass, or long-form when `long_form` is set
+    or (by default) when there is more than Whisper's 30 s window of speech.
+    Returns (transcription before name normalization, speech_duration, long_form used).
+    """
     processor = assets['asr_processor']
-    model = assets['asr_model']
+    speech, offset_map = trim_for_asr(speech)
+    speech_duration = len(speech) / ASR_SAMPLING_RATE
+    if long_form is None:
+        long_form = speech_duration > WHISPER_WINDOW_SEC
+
+    if len(speech) == 0:
+        return "", 0.0, long_form  # no speech found: nothing for Whisper to (mis)transcribe
+    if long_form:
+        transcription, _, speech_duration = transcribe_long_form(speech, assets, offset_map=offset_map)
+        return transcription, speech_duration, long_form
+    input_features = _extract_features(processor, speech)
+    generated_ids = _generate(assets, input_features)
+    return processor.batch_decode(generated_ids, skip_special_tokens=True)[0], speech_duration, long_form
 
-    start_time = time.time()
+def run_asr_on_file(filename, assets: dict, long_form: bool = None, use_cache: bool = True):
+    """
+    Transcribes one file under tests/sample_audio (or an absolute path, bytes or a file-like object).
+    The decoded audio is looked up in the transcript cache first; a hit never touches (or loads) the model.
+    Silence is trimmed first (ASR_TRIM_SILENCE), so only speech reaches the feature extractor.
+    `long_form` switches to VAD-chunked batched decoding; by default it is used automatically
+    when the speech is longer than Whisper's 30 s window, which a single decode would silently truncate.
+    Returns (final_transcript, latency, audio_duration, speech_duration): file length vs speech decoded.
+    """
+    if isinstance(filename, (str, os.PathLike)):
+        audio_file_path = _resolve_sample_audio_path(os.fspath(filename))
+        print(f"Resolved audio file path: {audio_file_path}")
+        print(f"File exists: {os.path.exists(audio_file_path)}")
+
+    speech, error = _load_audio_source(filename)
+    if error:
+        return error, 0.0, 0.0, 0.0
+    sampling_rate = ASR_SAMPLING_RATE
+    audio_duration = len(speech) / sampling_rate
+
+    # 1. Content-addressed transcript cache, before the model is needed
+    cache = get_transcript_cache() if use_cache else None
+    if cache is not None:
+        start_time = time.perf_counter()
+        cache_key = make_transcript_key(speech, asr_model_identity(long_form))
+        entry = _lookup_transcript(cache, cache_key)
+        if entry is not None:
+            latency = time.perf_counter() - start_time
+            record("asr.transcribe", latency, mode="cached")
+            return entry["normalized"], latency, audio_duration, entry["speech_duration"]
+
+    if not assets.get('asr_available'):
+        return "ERROR: ASR Model not initialized.", 0.0, 0.0, 0.0
+
+    start_time = time.perf_counter()
 
     try:
-        input_features = processor(speech, sampling_rate=sampling_rate, return_tensors="pt").input_features
-        generated_ids = model.generate(input_features)
-        transcription = processor.batch_decode(generated_ids, skip_special_tokens=True)[0]
+        transcription, speech_duration, long_form = transcribe_buffer(speech, assets, long_form)
 
-        latency = time.time() - start_time
+        latency = time.perf_counter() - start_time
+        record("asr.transcribe", latency, mode="long_form" if long_form else "single")
 
         final_transcript = normalize_transcript_names(transcription)
-
-        return final_transcript, latency, len(speech) / sampling_rate, len(speech) / sampling_rate
     except Exception as e:
-        latency = time.time() - start_time
-        return f"ERROR: ASR Local Inference Failed. {e}", latency, len(speech) / sampling_rate, len(speech) / sampling_rate
+        latency = time.perf_counter() - start_time
+        return f"ERROR: ASR Local Inference Failed. {e}", latency, audio_duration, len(speech) / sampling_rate
 
-def generate_voice_confirmation(extracted_data_json: dict, assets: dict, output_path: str = "/tmp/confirmation_output.wav"):
-    lead_name = extracted_data_json.get("lead_name", "the client")
-    visit_type = extracted_data_json.get("visit_type", "meeting")
-    date = extracted_data_json.get("date", "N/A")
+    # 2. Store the result with the compute time a later hit saves (outside the try: a cache
+    # problem must not turn a finished transcription into an error)
+    if cache is not None:
+        cache.put(cache_key, transcription, final_transcript, speech_duration, time.perf_counter() - start_time)
+
+    return final_transcript, latency, audio_duration, speech_duration
+
+def run_asr_on_files(paths, assets: dict, batch_size: int = ASR_BATCH_SIZE, use_cache: bool = True):
+    """
+    Batched multi-file ASR. Files are decoded and silence-trimmed concurrently, their features padded and stacked,
+    and each batch goes through a single `generate` call. Files with more than Whisper's 30 s window
+    of speech are transcribed individually in long-form mode. Transcript-cache hits skip the model;
+    when every file hits, the model is never loaded.
+    Returns one (final_transcript, latency, audio_duration, speech_duration) tuple per path, in input
+    order, matching `run_asr_on_file`; latency is the wall time of the batch the file was decoded in.
+    """
+    paths = list(paths)
+    cache = get_transcript_cache() if use_cache else None
+
+    def load_and_trim(source):
+        speech, error = _load_audio_source(source)
+        if error:
+            return None, None, 0.0, error, None, None
+        audio_duration = len(speech) / ASR_SAMPLING_RATE
+        cache_key = None
+        if cache is not None:
+            start_time = time.perf_counter()
+            cache_key = make_transcript_key(speech, asr_model_identity())
+            entry = _lookup_transcript(cache, cache_key)
+            if entry is not None:
+                return None, None, audio_duration, None, cache_key, (entry, time.perf_counter() - start_time)
+        trimmed, offset_map = trim_for_asr(speech)
+        return trimmed, offset_map, audio_duration, None, cache_key, None
+
+    # 1. Decode, look up and silence-trim all files concurrently (libsndfile/soxr/ffmpeg work releases the GIL)
+    with ThreadPoolExecutor(max_workers=max(1, min(ASR_DECODE_WORKERS, len(paths)))) as executor:
+        decoded = list(executor.map(load_and_trim, paths))
+
+    results = [None] * len(paths)
+    for i, (_, _, audio_duration, error, _, cached) in enumerate(decoded):
+        if error:
+            results[i] = (error, 0.0, 0.0, 0.0)
+        elif cached is not None:
+            entry, latency = cached
+            record("asr.transcribe", latency, mode="cached")
+            results[i] = (entry["normalized"], latency, audio_duration, entry["speech_duration"])
+
+    # 2. Only cache misses need the model
+    if all(result is not None for result in results):
+        return results
+    if not assets.get('asr_available'):
+        return [result or ("ERROR: ASR Model not initialized.", 0.0, 0.0, 0.0) for result in results]
 
-    confirmation_message = (
-        f"Success! The {visit_type} visit with {lead_name} is scheduled for {date}. "
-        f"Processing used the {extracted_data_json.get('extraction_method', 'AI')} path."
-    )
+    processor = assets['asr_processor']
+
+    short_indices = []
+    for i, (speech, offset_map, audio_duration, _, cache_key, _) in enumerate(decoded):
+        if results[i] is not None:
+            continue
+        if len(speech) == 0:
+            results[i] = ("", 0.0, audio_duration, 0.0)
+        elif len(speech) / ASR_SAMPLING_RATE > WHISPER_WINDOW_SEC:
+            start_time = time.perf_counter()
+            try:
+                transcription, _, speech_duration = transcribe_long_form(speech, assets, offset_map=offset_map)
+                final_transcript = normalize_transcript_names(transcription)
+                latency = time.perf_counter() - start_time
+                results[i] = (final_transcript, latency, audio_duration, speech_duration)
+                if cache is not None:
+                    cache.put(cache_key, transcription, final_transcript, speech_duration, latency)
+            except Exception as e:
+                # One failing long recording must not lose the rest of the batch
+                results[i] = (f"ERROR: ASR Local Inference Failed. {e}", time.perf_counter() - start_time,
+                              audio_duration, len(speech) / ASR_SAMPLING_RATE)
+        else:
+            short_indices.append(i)
+
+    # 3. One padded feature batch and one generate call per `batch_size` files
+    for batch_start in range(0, len(short_indices), batch_size):
+        batch_indices = short_indices[batch_start:batch_start + batch_size]
+        batch_audio = [decoded[i][0] for i in batch_indices]
+        start_time = time.perf_counter()
+        try:
+            input_features = _extract_features(processor, batch_audio)
+            generated_ids = _generate(assets, input_features)
+            raw_transcriptions = processor.batch_decode(generated_ids, skip_special_tokens=True)
+            transcriptions = normalize_transcript_names_batch(raw_transcriptions)
+            latency = time.perf_counter() - start_time
+            for i, raw, transcription in zip(batch_indices, raw_transcriptions, transcriptions):
+                speech_duration = len(decoded[i][0]) / ASR_SAMPLING_RATE
+                results[i] = (transcription, latency, decoded[i][2], speech_duration)
+                if cache is not None:
+                    # A hit saves this file's share of the batch
+                    cache.put(decoded[i][4], raw, transcription, speech_duration, latency / len(batch_indices))
+        except Exception as e:
+            latency = time.perf_counter() - start_time
+            for i in batch_indices:
+                results[i] = (f"ERROR: ASR Local Inference Failed. {e}", latency, decoded[i][2],
+                              len(decoded[i][0]) / ASR_SAMPLING_RATE)
+
+    return results
+
+def generate_voice_confirmation(extracted_data_json: dict, assets: dict, output_path: str = "/tmp/confirmation_output.wav"):
+    slots = {
+        "lead_name": extracted_data_json.get("lead_name", "the client"),
+        "visit_type": extracted_data_json.get("visit_type", "meeting"),
+        "date": extracted_data_json.get("date", "N/A"),
+        "extraction_method": extracted_data_json.get("extraction_method", "AI"),
+    }
 
-    print(f"Bot Confirmation: {confirmation_message}")
+    print(f"Bot Confirmation: {CONFIRMATION_TEMPLATE.format(**slots)}")
 
     if not assets.get('tts_available'):
         print("TTS functionality is disabled, no audio file generated.")
         return None
 
-    # Use gTTS to generate audio
+    # Offline TTS: pre-rendered template fragments + cached slot audio, concatenated
     try:
-        tts = gTTS(confirmation_message, lang='en')
-        tts.save(output_path)
-        print(f"TTS audio saved at {output_path}")
+        tts_latency = assets['tts_speaker'].speak_to_file(slots, output_path)
+        print(f"TTS audio saved at {output_path} ({tts_latency:.4f}s)")
         return output_path
     except Exception as e:
         print(f"Failed to generate TTS audio: {e}")
@@ -0,0 +1,190 @@
+# models/extraction_cache.py
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from models.schema import VisitDetails
+from models.cache_paths import create_private_file
+
+# --- Cache Settings (overridable via environment) ---
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "4096"))
+EXTRACTION_CACHE_TTL_SEC = float(os.getenv("EXTRACTION_CACHE_TTL_SEC", "86400"))
+# Optional on-disk tier: empty path keeps the cache purely in-process
+EXTRACTION_CACHE_DB_PATH = os.getenv("EXTRACTION_CACHE_DB_PATH", "")
+EXTRACTION_CACHE_DB_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_DB_MAX_ENTRIES", "100000"))
+# How long a write waits for another process's lock before giving up (the cache then just misses)
+EXTRACTION_CACHE_DB_TIMEOUT_SEC = float(os.getenv("EXTRACTION_CACHE_DB_TIMEOUT_SEC", "5"))
+# Expiry and size eviction run once per this many writes (expired rows are never served in between,
+# and the table may overshoot EXTRACTION_CACHE_DB_MAX_ENTRIES by at most this many rows)
+EXTRACTION_CACHE_DB_EVICT_EVERY = int(os.getenv("EXTRACTION_CACHE_DB_EVICT_EVERY", "256"))
+
+
+def schema_version(schema=VisitDetails):
+    """Short hash of a schema's JSON schema: any change invalidates previously cached extractions."""
+    return hashlib.sha1(json.dumps(schema.model_json_schema(), sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+SCHEMA_VERSION = schema_version(VisitDetails)
+_SCHEMA_VERSIONS = {VisitDetails: SCHEMA_VERSION}
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_transcript(transcript: str):
+    """Case- and whitespace-insensitive form used for cache keys."""
+    return _WHITESPACE_RE.sub(' ', transcript).strip().lower()
+
+
+def make_cache_key(transcript: str, reference_date: str, schema=VisitDetails):
+    """Key = normalized transcript + schema version + reference date (the LLM prompt embeds the date)."""
+    version = _SCHEMA_VERSIONS.get(schema)
+    if version is None:
+        version = _SCHEMA_VERSIONS.setdefault(schema, schema_version(schema))
+    raw_key = f"{version}|{reference_date}|{normalize_transcript(transcript)}"
+    return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """
+    Two-tier extraction result cache.
+    Tier 1 is an in-process LRU; tier 2 is an optional SQLite file with TTL and size-based eviction.
+    """
+
+    def __init__(self, max_entries: int = EXTRACTION_CACHE_MAX_ENTRIES, ttl_sec: float = EXTRACTION_CACHE_TTL_SEC,
+                 db_path: str = EXTRACTION_CACHE_DB_PATH, db_max_entries: int = EXTRACTION_CACHE_DB_MAX_ENTRIES,
+                 evict_every: int = EXTRACTION_CACHE_DB_EVICT_EVERY):
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.db_max_entries = db_max_entries
+        self.evict_every = max(1, evict_every)
+        self._puts_since_evict = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+        self._db = None
+        if db_path:
+            # Cached extractions hold transcripts and lead PII: the file (and its WAL) stays 0600
+            self._db = sqlite3.connect(create_private_file(db_path), check_same_thread=False,
+                                       timeout=EXTRACTION_CACHE_DB_TIMEOUT_SEC)
+            # WAL lets readers in other workers proceed while one of them writes
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS extraction_cache ("
+                "key TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_extraction_cache_last_used ON extraction_cache(last_used)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_extraction_cache_expires_at ON extraction_cache(expires_at)")
+            self._db.commit()
+
+    def get(self, key: str):
+        """Returns (data, tier) for a live entry, or (None, None) on a miss."""
+        now = time.time()
+        with self._lock:
+            # 1. In-process LRU tier
+            entry = self._memory.get(key)
+            if entry is not None:
+                data, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return dict(data), "memory"
+                del self._memory[key]
+
+            # 2. On-disk tier (promoted into memory on hit)
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT data, expires_at FROM extraction_cache WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None and row[1] > now:
+                        self._db.execute("UPDATE extraction_cache SET last_used = ? WHERE key = ?", (now, key))
+                        self._db.commit()
+                        data = json.loads(row[0])
+                        self._remember(key, data, row[1])
+                        self.stats["disk_hits"] += 1
+                        return dict(data), "disk"
+                except sqlite3.OperationalError as e:
+                    # Locked or unavailable cache file: a miss, never a failed extraction
+                    self._rollback()
+                    print(f" WARNING: extraction cache read failed: {e}")
+
+            self.stats["misses"] += 1
+            return None, None
+
+    def put(self, key: str, data: dict):
+        """Stores a successful extraction in both tiers."""
+        now = time.time()
+        expires_at = now + self.ttl_sec
+        with self._lock:
+            self._remember(key, dict(data), expires_at)
+
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO extraction_cache (key, data, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                        (key, json.dumps(data), expires_at, now)
+                    )
+                    self._puts_since_evict += 1
+                    if self._puts_since_evict >= self.evict_every:
+                        self._evict(now)
+                    self._db.commit()
+                except sqlite3.OperationalError as e:
+                    # The entry stays in the memory tier; the extraction result is unaffected
+                    self._rollback()
+                    print(f" WARNING: extraction cache write failed: {e}")
+
+    def _evict(self, now: float):
+        """Drops expired rows, then the least recently used beyond db_max_entries (both index-driven)."""
+        self._db.execute("DELETE FROM extraction_cache WHERE expires_at <= ?", (now,))
+        excess = self._db.execute("SELECT COUNT(*) FROM extraction_cache").fetchone()[0] - self.db_max_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM extraction_cache WHERE key IN ("
+                "SELECT key FROM extraction_cache ORDER BY last_used LIMIT ?)", (excess,)
+            )
+        self._puts_since_evict = 0
+
+    def _rollback(self):
+        try:
+            self._db.rollback()
+        except sqlite3.Error:
+            pass
+
+    def _remember(self, key: str, data: dict, expires_at: float):
+        self._memory[key] = (data, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def snapshot_stats(self):
+        """Hit/miss counters for metrics reporting."""
+        with self._lock:
+            stats = dict(self.stats)
+        stats["hits"] = stats["memory_hits"] + stats["disk_hits"]
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM extraction_cache")
+                self._db.commit()
+
+
+_DEFAULT_CACHE = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def get_extraction_cache():
+    """Returns the process-wide ExtractionCache, creating it on first use."""
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        with _DEFAULT_CACHE_LOCK:
+            if _DEFAULT_CACHE is None:
+                _DEFAULT_CACHE = ExtractionCache()
+    return _DEFAULT_CACHE
@@ -0,0 +1,301 @@
+# models/lead_index.py
+import os
+import re
+import csv
+import json
+import hashlib
+from functools import lru_cache
+import numpy as np
+
+# --- Matching Settings (overridable via environment) ---
+LEAD_MATCH_MIN_SCORE = float(os.getenv("LEAD_MATCH_MIN_SCORE", "0.6"))
+# Fuzzy token candidates kept per query token; the lead-level score settles between them
+TOKEN_CANDIDATES = 32
+MIN_TOKEN_SIMILARITY = 0.3
+# Tokens whose phonetic keys agree are at least this similar ("Sarabhai" / "Sarbhai"); Dice breaks the ties
+PHONETIC_MATCH_SIMILARITY = 0.85
+# Keys this long also match keys one consonant away (SymSpell-style deletions); shorter keys match exactly
+MIN_DELETION_KEY_LENGTH = 3
+# Only trigrams shared by at most this many vocabulary tokens propose candidates ("^ra" is too common to help)
+RARE_TRIGRAM_MAX_TOKENS = 64
+
+HONORIFICS = frozenset({
+    'mr', 'mrs', 'ms', 'miss', 'dr', 'prof', 'sir', 'madam', 'master', 'late',
+    'shri', 'sri', 'shrimati', 'smt', 'kumari', 'km', 'ji', 'sahab', 'saheb'
+})
+# Spelling variants common in romanized Indian names, applied before vowels are dropped
+PHONETIC_RULES = [
+    ('ph', 'f'), ('bh', 'b'), ('dh', 'd'), ('th', 't'), ('kh', 'k'), ('gh', 'g'), ('jh', 'j'),
+    ('sh', 's'), ('ch', 'c'), ('ck', 'k'), ('q', 'k'), ('w', 'v'), ('z', 'j'), ('x', 'ks'),
+]
+_NON_NAME_RE = re.compile(r"[^a-z\s]")
+_REPEAT_RE = re.compile(r'(.)\1+')
+_VOWELS_RE = re.compile(r'[aeiouyh]')
+
+INDEX_MAGIC = b"LEADIDX1"
+_ALIGNMENT = 64
+
+
+def normalize_name(name: str):
+    """Lowercased name tokens with punctuation and honorifics removed ('Dr. R. Patel' -> ['r', 'patel'])."""
+    return [token for token in _NON_NAME_RE.sub(' ', name.lower()).split() if token not in HONORIFICS]
+
+
+def phonetic_key(token: str):
+    """Consonant skeleton after folding aspirates and common spelling variants ('sarabhai' -> 'srb', 'john' -> 'jn')."""
+    for source, target in PHONETIC_RULES:
+        token = token.replace(source, target)
+    token = _REPEAT_RE.sub(r'\1', token)
+    return token[:1] + _VOWELS_RE.sub('', token[1:])
+
+
+def phonetic_features(token: str):
+    """'=key' for the exact phonetic key, '~variant' for the key and its single-deletion variants."""
+    key = phonetic_key(token)
+    features = {"=" + key, "~" + key}
+    if len(key) >= MIN_DELETION_KEY_LENGTH:
+        features.update("~" + key[:i] + key[i + 1:] for i in range(len(key)))
+    return features
+
+
+def token_trigrams(token: str):
+    padded = f"^{token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@lru_cache(maxsize=65536)
+def _feature_hash(feature: str):
+    """Stable 64-bit hash (Python's hash() is salted per process, which would break shared files)."""
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _csr(groups, dtype):
+    """List of integer lists -> (offsets, flat values)."""
+    offsets = np.zeros(len(groups) + 1, dtype=np.uint64)
+    offsets[1:] = np.cumsum([len(group) for group in groups])
+    flat = np.fromiter((value for group in groups for value in group), dtype=dtype, count=int(offsets[-1]))
+    return offsets, flat
+
+
+def _hashed_postings(feature_to_ids: dict):
+    """{feature: [ids]} -> (sorted hashes, offsets, postings) for searchsorted lookups."""
+    items = sorted((_feature_hash(feature), ids) for feature, ids in feature_to_ids.items())
+    keys = np.array([key for key, _ in items], dtype=np.uint64)
+    offsets, postings = _csr([ids for _, ids in items], np.uint32)
+    return keys, offsets, postings
+
+
+def _blob(strings):
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    offsets[1:] = np.cumsum([len(item) for item in encoded])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+class LeadIndex:
+    """
+    Fuzzy lead-name index.
+    Distinct name tokens are indexed by character trigrams and phonetic keys; leads link to their
+    tokens (and back) through CSR arrays. A query fuzzy-matches each of its tokens against the token
+    vocabulary, takes candidate leads from the postings of its rarest token, and scores each candidate
+    by its best token similarities. All arrays live in one file that `load` memory-maps, so worker
+    processes share the pages instead of each holding a copy.
+    """
+
+    ARRAYS = (
+        "feature_keys", "feature_offsets", "feature_tokens",
+        "token_trigram_counts", "token_lead_offsets", "token_leads",
+        "lead_token_offsets", "lead_tokens",
+        "name_offsets", "name_blob", "record_offsets", "record_blob",
+    )
+
+    def __init__(self, arrays: dict, mmap=None):
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self._mmap = mmap
+        self.lead_token_counts = np.diff(self.lead_token_offsets).astype(np.float32)
+        self.token_lead_counts = np.diff(self.token_lead_offsets)
+
+    def __len__(self):
+        return len(self.name_offsets) - 1
+
+    # --- BUILD ---
+
+    @classmethod
+    def build(cls, leads, name_field: str = "name"):
+        """Builds the index from an iterable of dicts (each must carry `name_field`; the rest is the record)."""
+        vocabulary = {}
+        lead_token_ids, names, records = [], [], []
+        for lead in leads:
+            tokens = normalize_name(lead[name_field])
+            lead_token_ids.append(sorted({vocabulary.setdefault(token, len(vocabulary)) for token in tokens}))
+            names.append(lead[name_field])
+            records.append(json.dumps(lead, separators=(",", ":")))
+
+        tokens = sorted(vocabulary, key=vocabulary.get)
+        # Trigrams and phonetic features share one table; their spellings never collide ('=srb' is 4 chars)
+        feature_postings = {}
+        token_leads = [[] for _ in tokens]
+        for token_id, token in enumerate(tokens):
+            for feature in token_trigrams(token) | phonetic_features(token):
+                feature_postings.setdefault(feature, []).append(token_id)
+        for lead_id, token_ids in enumerate(lead_token_ids):
+            for token_id in token_ids:
+                token_leads[token_id].append(lead_id)
+
+        arrays = {}
+        arrays["feature_keys"], arrays["feature_offsets"], arrays["feature_tokens"] = _hashed_postings(feature_postings)
+        arrays["token_trigram_counts"] = np.array([len(token_trigrams(token)) for token in tokens], dtype=np.uint16)
+        arrays["token_lead_offsets"], arrays["token_leads"] = _csr(token_leads, np.uint32)
+        arrays["lead_token_offsets"], arrays["lead_tokens"] = _csr(lead_token_ids, np.uint32)
+        arrays["name_offsets"], arrays["name_blob"] = _blob(names)
+        arrays["record_offsets"], arrays["record_blob"] = _blob(records)
+        return cls(arrays)
+
+    @classmethod
+    def from_file(cls, path: str, name_field: str = "name"):
+        """Builds from a CSV (header row) or JSONL lead table."""
+        with open(path, newline="") as f:
+            if path.endswith((".jsonl", ".ndjson")):
+                return cls.build((json.loads(line) for line in f if line.strip()), name_field)
+            return cls.build(csv.DictReader(f), name_field)
+
+    # --- PERSISTENCE (single memory-mappable file) ---
+
+    def save(self, path: str):
+        """Layout: magic, header length, JSON header {array: [dtype, length, offset]}, 64-byte aligned arrays."""
+        layout, offset = {}, 0
+        for name in self.ARRAYS:
+            array = np.ascontiguousarray(getattr(self, name))
+            layout[name] = [array.dtype.str, len(array), offset]
+            offset += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+        header = json.dumps(layout).encode("utf-8")
+        data_start = -(-(len(INDEX_MAGIC) + 8 + len(header)) // _ALIGNMENT) * _ALIGNMENT
+
+        with open(path, "wb") as f:
+            f.write(INDEX_MAGIC)
+            f.write(len(header).to_bytes(8, "little"))
+            f.write(header)
+            for name in self.ARRAYS:
+                f.seek(data_start + layout[name][2])
+                f.write(np.ascontiguousarray(getattr(self, name)).tobytes())
+            # Extend to the end of the layout: trailing empty arrays write nothing, yet load maps them there
+            f.truncate(data_start + offset)
+
+    @classmethod
+    def load(cls, path: str):
+        """Memory-maps a saved index; loading is O(1) and pages are shared between processes."""
+        mm = np.memmap(path, dtype=np.uint8, mode="r")
+        if bytes(mm[:len(INDEX_MAGIC)]) != INDEX_MAGIC:
+            raise ValueError(f"{path} is not a lead index file")
+        header_length = int.from_bytes(bytes(mm[len(INDEX_MAGIC):len(INDEX_MAGIC) + 8]), "little")
+        header_start = len(INDEX_MAGIC) + 8
+        layout = json.loads(bytes(mm[header_start:header_start + header_length]))
+        data_start = -(-(header_start + header_length) // _ALIGNMENT) * _ALIGNMENT
+
+        arrays = {}
+        for name, (dtype, length, offset) in layout.items():
+            arrays[name] = np.ndarray((length,), dtype=np.dtype(dtype), buffer=mm, offset=data_start + offset)
+        return cls(arrays, mmap=mm)
+
+    # --- QUERY ---
+
+    def _posting_slices(self, features):
+        """{feature: sorted token ids (a view into the index)} for the features present in the index."""
+        if not len(self.feature_keys):
+            return {}
+        hashes = np.fromiter((_feature_hash(feature) for feature in features), dtype=np.uint64, count=len(features))
+        positions = np.minimum(np.searchsorted(self.feature_keys, hashes), len(self.feature_keys) - 1)
+        offsets = self.feature_offsets
+        return {feature: self.feature_tokens[offsets[p]:offsets[p + 1]]
+                for feature, p, found in zip(features, positions, self.feature_keys[positions] == hashes) if found}
+
+    def _match_token(self, token: str):
+        """Top fuzzy vocabulary matches for one query token: (sorted token ids, similarities)."""
+        trigrams = token_trigrams(token)
+        exact_key = "=" + phonetic_key(token)
+        postings = self._posting_slices(list(trigrams | phonetic_features(token)))
+
+        # 1. Candidates: phonetic neighbours plus tokens sharing a rare trigram
+        trigram_postings = [posting for feature, posting in postings.items() if feature in trigrams]
+        sources = [posting for feature, posting in postings.items()
+                   if feature not in trigrams or len(posting) <= RARE_TRIGRAM_MAX_TOKENS]
+        if not sources:
+            return np.zeros(0, dtype=np.uint32), np.zeros(0)
+        token_ids = np.unique(np.concatenate(sources))
+
+        # 2. Exact trigram overlap (Dice): occurrences of each candidate across the query trigrams' postings
+        shared = np.sort(np.concatenate(trigram_postings)) if trigram_postings else np.zeros(0, dtype=np.uint32)
+        overlaps = np.searchsorted(shared, token_ids, "right") - np.searchsorted(shared, token_ids, "left")
+        similarities = 2.0 * overlaps / (len(trigrams) + self.token_trigram_counts[token_ids])
+        exact = postings.get(exact_key)
+        if exact is not None:
+            # Both sides are sorted and unique: a searchsorted probe is cheaper than np.isin
+            positions = np.minimum(np.searchsorted(exact, token_ids), len(exact) - 1)
+            same_key = exact[positions] == token_ids
+            similarities[same_key] += (1.0 - similarities[same_key]) * PHONETIC_MATCH_SIMILARITY
+
+        keep = similarities >= MIN_TOKEN_SIMILARITY
+        token_ids, similarities = token_ids[keep], similarities[keep]
+        if len(token_ids) > TOKEN_CANDIDATES:
+            top = np.sort(np.argpartition(-similarities, TOKEN_CANDIDATES - 1)[:TOKEN_CANDIDATES])
+            token_ids, similarities = token_ids[top], similarities[top]
+        return token_ids, similarities
+
+    def _leads_of(self, token_ids):
+        slices = [self.token_leads[self.token_lead_offsets[t]:self.token_lead_offsets[t + 1]] for t in token_ids]
+        return np.concatenate(slices) if slices else np.zeros(0, dtype=np.uint32)
+
+    def search(self, name: str, k: int = 5):
+        """
+        Top-k leads for a (possibly misspelled or transliterated) name.
+        Returns [(score in [0, 1], lead_id)] best first; [] for an empty index or a name without tokens.
+        Costs about 1 ms at 1M leads (benchmarks/bench_lead_index.py), mostly per-call numpy overhead
+        of a few dozen small array operations per query token, so it grows slowly with the table size.
+        """
+        query_tokens = list(dict.fromkeys(normalize_name(name)))
+        if not query_tokens:
+            return []
+        matches = [self._match_token(token) for token in query_tokens]
+
+        # 1. Candidate leads: postings of the query token matching the fewest leads (rarest name part)
+        sizes = [int(self.token_lead_counts[token_ids].sum()) for token_ids, _ in matches]
+        if not any(sizes):
+            return []
+        anchor = min((i for i, size in enumerate(sizes) if size), key=sizes.__getitem__)
+        candidates = np.unique(self._leads_of(matches[anchor][0]))
+
+        # 2. Score: for each query token, the best similarity among the candidate's own tokens
+        starts = self.lead_token_offsets[candidates].astype(np.int64)
+        counts = self.lead_token_offsets[candidates + 1].astype(np.int64) - starts
+        segment_starts = np.cumsum(counts) - counts
+        pair_tokens = self.lead_tokens[np.repeat(starts - segment_starts, counts) + np.arange(counts.sum())]
+        total = np.zeros(len(candidates), dtype=np.float64)
+        for token_ids, similarities in matches:
+            if not len(token_ids):
+                continue
+            positions = np.minimum(np.searchsorted(token_ids, pair_tokens), len(token_ids) - 1)
+            pair_similarity = np.where(token_ids[positions] == pair_tokens, similarities[positions], 0.0)
+            total += np.maximum.reduceat(pair_similarity, segment_starts)
+
+        scores = total / np.maximum(len(query_tokens), self.lead_token_counts[candidates])
+        k = min(k, len(candidates))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(float(scores[i]), int(candidates[i])) for i in top]
+
+    def name(self, lead_id: int):
+        return bytes(self.name_blob[self.name_offsets[lead_id]:self.name_offsets[lead_id + 1]]).decode("utf-8")
+
+    def record(self, lead_id: int):
+        return json.loads(bytes(self.record_blob[self.record_offsets[lead_id]:self.record_offsets[lead_id + 1]]))
+
+    def lookup(self, name: str, min_score: float = LEAD_MATCH_MIN_SCORE):
+        """Best matching lead record (with its '_match_score'), or None below `min_score`."""
+        results = self.search(name, k=1)
+        if not results or results[0][0] < min_score:
+            return None
+        score, lead_id = results[0]
+        record = self.record(lead_id)
+        record["_match_score"] = round(score, 3)
+        return record
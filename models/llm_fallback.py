@@ -1,72 +1,450 @@
 # models/llm_fallback.py
+import os
 import time
+import random
+import threading
 import requests
 import json
 import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
-from models.schema import VisitDetails # Fine
+from requests.adapters import HTTPAdapter
+from pydantic import ValidationError
+from models.schema import VisitDetails, NoteSummary, VoiceNoteExtraction
+from models.tool_call_stream import IncrementalArgumentsParser, FieldValidator, schema_max_tokens
+from models.telemetry import span, record, increment
 from config import MERCURY_API_KEY, MERCURY_API_ENDPOINT
 
-# --- Mercury (dLLM) Function (The Production Fallback) ---
-def extract_via_mercury_fallback(transcript: str):
-    """
-    Runs the Mercury dLLM API using the Tool Calling method for structured output.
-    This is the production fallback path.
-    """
-    llm_start = time.time()
-    current_date = datetime.now().strftime("%Y-%m-%d")
+# --- Client Tuning (overridable via environment) ---
+MERCURY_POOL_SIZE = int(os.getenv("MERCURY_POOL_SIZE", "16"))
+MERCURY_MAX_CONCURRENCY = int(os.getenv("MERCURY_MAX_CONCURRENCY", "8"))
+MERCURY_MAX_RETRIES = int(os.getenv("MERCURY_MAX_RETRIES", "3"))
+MERCURY_TIMEOUT_SEC = float(os.getenv("MERCURY_TIMEOUT_SEC", "30"))
+MERCURY_BACKOFF_BASE_SEC = 0.25
+MERCURY_BACKOFF_CAP_SEC = 4.0
+# Longest wait a server's Retry-After header can impose on one retry (the request deadline still applies)
+MERCURY_RETRY_AFTER_CAP_SEC = float(os.getenv("MERCURY_RETRY_AFTER_CAP_SEC", "30"))
+
+# Hedging: a second request fires when the first is slower than this percentile of recent successes
+MERCURY_HEDGE = os.getenv("MERCURY_HEDGE", "0") == "1"
+MERCURY_HEDGE_PERCENTILE = float(os.getenv("MERCURY_HEDGE_PERCENTILE", "95"))
+MERCURY_HEDGE_MIN_SAMPLES = int(os.getenv("MERCURY_HEDGE_MIN_SAMPLES", "20"))
+# Used until MERCURY_HEDGE_MIN_SAMPLES latencies have been observed
+MERCURY_HEDGE_DELAY_SEC = float(os.getenv("MERCURY_HEDGE_DELAY_SEC", "1.0"))
+MERCURY_LATENCY_WINDOW = 256
+
+# Streaming: consume the SSE token stream and parse arguments as they arrive (opt-in)
+MERCURY_STREAM = os.getenv("MERCURY_STREAM", "0") == "1"
+# Tight completion budget for streamed calls; 0 derives it from the tool's schema (non-streamed calls keep 4096)
+MERCURY_STREAM_MAX_TOKENS = int(os.getenv("MERCURY_STREAM_MAX_TOKENS", "0"))
+
+# --- Tool definitions: name -> (argument schema, description) ---
+SCHEDULE_VISIT_TOOL = "schedule_visit"
+NOTE_SUMMARY_TOOL = "summarize_note"
+VOICE_NOTE_TOOL = "log_voice_note"
+MERCURY_TOOLS = {
+    SCHEDULE_VISIT_TOOL: (VisitDetails, "Extracts structured data for scheduling a CRM visit."),
+    NOTE_SUMMARY_TOOL: (NoteSummary, "Summarizes a sales rep's voice note about a lead."),
+    VOICE_NOTE_TOOL: (VoiceNoteExtraction,
+                      "Extracts the CRM visit to schedule and a summary of the rep's voice note in one call."),
+}
+_FIELD_VALIDATORS = {tool: FieldValidator(schema) for tool, (schema, _) in MERCURY_TOOLS.items()}
+
+# HTTP statuses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def stream_max_tokens(tool: str = SCHEDULE_VISIT_TOOL):
+    return MERCURY_STREAM_MAX_TOKENS or schema_max_tokens(MERCURY_TOOLS[tool][0])
+
+
+def build_mercury_payload(transcript: str, current_date: str = None, stream: bool = False,
+                          tool: str = SCHEDULE_VISIT_TOOL):
+    """Builds the OpenAI-compatible tool-calling payload for a single transcript."""
+    current_date = current_date or datetime.now().strftime("%Y-%m-%d")
+    schema, description = MERCURY_TOOLS[tool]
 
     tool_definition = {
         "type": "function",
         "function": {
-            "name": "schedule_visit",
-            "description": "Extracts structured data for scheduling a CRM visit.",
-            "parameters": VisitDetails.model_json_schema()
+            "name": tool,
+            "description": description,
+            "parameters": schema.model_json_schema()
         }
     }
-    
+
     system_message = (
         f"You are an expert CRM data extractor. Your task is to extract information from the user's transcript "
-        f"and call the 'schedule_visit' tool with the extracted data. Current Date: {current_date}. "
+        f"and call the '{tool}' tool with the extracted data. Current Date: {current_date}. "
         f"Strictly adhere to the provided JSON schema."
     )
-    
+
     payload = {
-        "model": "mercury", 
+        "model": "mercury",
         "messages": [
-            {"role": "system", "content": system_message}, 
+            {"role": "system", "content": system_message},
             {"role": "user", "content": transcript}
         ],
         "tools": [tool_definition],
-        "tool_choice": {"type": "function", "function": {"name": "schedule_visit"}},
+        "tool_choice": {"type": "function", "function": {"name": tool}},
         "max_tokens": 4096,
         "temperature": 0.0,
     }
+    if stream:
+        payload.update({"stream": True, "max_tokens": stream_max_tokens(tool)})
+    return payload
 
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {MERCURY_API_KEY}"
-    }
 
-    try:
-        response = requests.post(MERCURY_API_ENDPOINT, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()
-        raw_output = response.json()
-        
-        # 1. Get the raw arguments string
-        tool_call_args_str = raw_output['choices'][0]['message']['tool_calls'][0]['function']['arguments']
-        
-        # 2. ULTIMATE DEFENSE STEP: Target the specific malformed JSON syntax
-        cleaned_args_str = tool_call_args_str.replace(':" "', ':"') 
-        cleaned_args_str = re.sub(r',\s*', ',', cleaned_args_str)
-        cleaned_args_str = re.sub(r'\s*:\s*', ':', cleaned_args_str)
-        
-        # 3. Final Parsing
-        extracted_json = json.loads(cleaned_args_str)
-        result = VisitDetails.model_validate(extracted_json)
-        
-        latency = time.time() - llm_start
-        return result.model_dump(), latency
-    
-    except Exception:
-        return None, (time.time() - llm_start)
\ No newline at end of file
+def parse_tool_call_arguments(tool_call_args_str: str, schema=VisitDetails):
+    """Repairs and validates a raw tool-call arguments string (`schedule_visit` by default). Returns a dict."""
+    # ULTIMATE DEFENSE STEP: Target the specific malformed JSON syntax
+    cleaned_args_str = tool_call_args_str.replace(':" "', ':"')
+    cleaned_args_str = re.sub(r',\s*', ',', cleaned_args_str)
+    cleaned_args_str = re.sub(r'\s*:\s*', ':', cleaned_args_str)
+
+    # Final Parsing
+    extracted_json = json.loads(cleaned_args_str)
+    return schema.model_validate(extracted_json).model_dump()
+
+
+def split_voice_note(data: dict):
+    """Combined `log_voice_note` fields -> (VisitDetails dict, NoteSummary dict)."""
+    return ({name: data[name] for name in VisitDetails.model_fields},
+            {name: data[name] for name in NoteSummary.model_fields})
+
+
+def iter_tool_call_fragments(response):
+    """Yields `arguments` fragments from an SSE chat-completions stream until [DONE]."""
+    for line in response.iter_lines(chunk_size=None):
+        if not line.startswith(b"data:"):
+            continue
+        data = line[5:].strip()
+        if data == b"[DONE]":
+            return
+        for choice in json.loads(data).get("choices", []):
+            for tool_call in (choice.get("delta") or {}).get("tool_calls") or []:
+                fragment = (tool_call.get("function") or {}).get("arguments")
+                if fragment:
+                    yield fragment
+
+
+# --- Mercury Client (pooled connections, retries, concurrent batches) ---
+class MercuryClient:
+    """
+    Reusable Mercury dLLM client.
+    Keeps a pooled keep-alive Session, retries 429/5xx with jittered exponential backoff,
+    can run many fallbacks concurrently via `extract_many`, and can hedge slow requests
+    via `extract_hedged`. With `stream=True` every extraction consumes the SSE token stream.
+    """
+
+    def __init__(self, api_key: str = MERCURY_API_KEY, endpoint: str = MERCURY_API_ENDPOINT,
+                 pool_size: int = MERCURY_POOL_SIZE, max_retries: int = MERCURY_MAX_RETRIES,
+                 timeout: float = MERCURY_TIMEOUT_SEC, stream: bool = MERCURY_STREAM):
+        self.endpoint = endpoint
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.stream = stream
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}"
+        })
+
+        self._executor = None
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=MERCURY_LATENCY_WINDOW)
+        self.stats = {"hedges_fired": 0, "hedges_won": 0, "hedges_wasted": 0, "hedge_saved_sec": 0.0}
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self.session.close()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2 * MERCURY_POOL_SIZE, thread_name_prefix="mercury-async")
+            return self._executor
+
+    def submit(self, transcript: str, deadline_sec: float = None, current_date: str = None, limiter=None,
+               tool: str = SCHEDULE_VISIT_TOOL):
+        """Starts `extract` in the background. Returns a Future of (data, latency)."""
+        def run():
+            if limiter is None:
+                return self.extract(transcript, deadline_sec=deadline_sec, current_date=current_date, tool=tool)
+            with limiter:
+                return self.extract(transcript, deadline_sec=deadline_sec, current_date=current_date, tool=tool)
+        return self._get_executor().submit(run)
+
+    def hedge_delay(self):
+        """MERCURY_HEDGE_PERCENTILE of recent successful latencies (fixed default until enough samples)."""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < MERCURY_HEDGE_MIN_SAMPLES:
+            return MERCURY_HEDGE_DELAY_SEC
+        return samples[min(len(samples) - 1, int(len(samples) * MERCURY_HEDGE_PERCENTILE / 100))]
+
+    def snapshot_stats(self):
+        with self._lock:
+            return dict(self.stats)
+
+    def _count(self, key: str, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+        increment(f"mercury.{key}", amount)
+
+    def _backoff_delay(self, attempt: int, response=None, deadline: float = None):
+        """
+        Full-jitter exponential backoff, honouring a numeric Retry-After header when present.
+        Retry-After is capped at MERCURY_RETRY_AFTER_CAP_SEC, and any delay at the time left before `deadline`.
+        """
+        delay = random.uniform(0, min(MERCURY_BACKOFF_CAP_SEC, MERCURY_BACKOFF_BASE_SEC * (2 ** attempt)))
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                delay = min(float(retry_after), MERCURY_RETRY_AFTER_CAP_SEC)
+        if deadline is not None:
+            delay = min(delay, max(0.0, deadline - time.monotonic()))
+        return delay
+
+    def post(self, payload: dict, deadline: float = None, **kwargs):
+        """
+        POSTs the payload, retrying retryable failures until `max_retries` or the deadline
+        (a time.monotonic() timestamp) is exhausted. Returns the final `requests.Response`.
+        """
+        attempt = 0
+        while True:
+            timeout = self.timeout
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.monotonic())
+                if timeout <= 0:
+                    raise TimeoutError("Mercury request deadline exceeded.")
+
+            response = None
+            with span("mercury.http") as http_span:
+                try:
+                    response = self.session.post(self.endpoint, json=payload, timeout=timeout, **kwargs)
+                    http_span.set_label("status", response.status_code)
+                    if response.status_code not in RETRYABLE_STATUS_CODES:
+                        response.raise_for_status()
+                        return response
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    http_span.set_label("status", type(e).__name__)
+
+            if attempt >= self.max_retries:
+                if response is not None:
+                    response.raise_for_status()
+                raise TimeoutError("Mercury request failed after retries.")
+
+            delay = self._backoff_delay(attempt, response, deadline)
+            # The retried response is never read: hand its connection back to the pool (a streamed one stays checked out)
+            if response is not None:
+                response.close()
+            # A wait that uses up the rest of the budget leaves no time for the retry: fail now instead of sleeping
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                raise TimeoutError("Mercury request deadline exceeded.")
+            increment("mercury.retries")
+            with span("mercury.backoff"):
+                time.sleep(delay)
+            attempt += 1
+
+    def extract(self, transcript: str, deadline_sec: float = None, current_date: str = None, on_field=None,
+                tool: str = SCHEDULE_VISIT_TOOL):
+        """
+        Runs one tool-calling extraction. Returns extracted data (dict or None) and latency (float).
+        `deadline_sec` bounds the whole call, retries included. In streaming mode `on_field(name, value)`
+        is called for each validated field as soon as it arrives. `tool` picks one of MERCURY_TOOLS.
+        """
+        llm_start = time.perf_counter()
+        deadline = time.monotonic() + deadline_sec if deadline_sec else None
+        if self.stream:
+            return self._extract_streaming(transcript, llm_start, deadline, current_date, on_field, tool)
+
+        try:
+            response = self.post(build_mercury_payload(transcript, current_date, tool=tool), deadline=deadline)
+            with span("mercury.parse"):
+                raw_output = response.json()
+                tool_call_args_str = raw_output['choices'][0]['message']['tool_calls'][0]['function']['arguments']
+                extracted_data = parse_tool_call_arguments(tool_call_args_str, MERCURY_TOOLS[tool][0])
+            latency = time.perf_counter() - llm_start
+            record("mercury.extract", latency, outcome="success", tool=tool)
+            self._latencies.append(latency)
+            return extracted_data, latency
+        except Exception:
+            latency = time.perf_counter() - llm_start
+            record("mercury.extract", latency, outcome="failure", tool=tool)
+            return None, latency
+
+    def _extract_streaming(self, transcript: str, llm_start: float, deadline: float, current_date: str, on_field,
+                           tool: str = SCHEDULE_VISIT_TOOL):
+        """
+        Streaming `extract`: arguments are parsed incrementally, each field is validated when it
+        completes, and the call returns as soon as the object closes (the rest of the stream is dropped).
+        Arguments the incremental parser cannot follow are repaired in full once the stream ends.
+        """
+        response = None
+        validator = _FIELD_VALIDATORS[tool]
+        parser = IncrementalArgumentsParser()
+        fragments = []
+        fields = {}
+        try:
+            response = self.post(build_mercury_payload(transcript, current_date, stream=True, tool=tool),
+                                 deadline=deadline, stream=True)
+            for fragment in iter_tool_call_fragments(response):
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError("Mercury request deadline exceeded.")
+                fragments.append(fragment)
+                if parser is None:
+                    continue
+                try:
+                    completed = parser.feed(fragment)
+                except ValueError:
+                    parser = None
+                    continue
+                for name, value in completed:
+                    try:
+                        fields[name] = validator.validate_field(name, value)
+                    except ValidationError:
+                        # One bad field does not sink the call: stop following the stream incrementally
+                        # and let the full-object repair below decide, as the non-streaming path would
+                        parser = None
+                        break
+                    if len(fields) == 1:
+                        record("mercury.first_field", time.perf_counter() - llm_start)
+                    if on_field is not None:
+                        on_field(name, fields[name])
+                if parser is not None and parser.done:
+                    break
+
+            with span("mercury.parse", mode="stream"):
+                if parser is not None and parser.done:
+                    extracted_data = validator.validate(fields)
+                else:
+                    extracted_data = parse_tool_call_arguments("".join(fragments), validator.model)
+            latency = time.perf_counter() - llm_start
+            record("mercury.extract", latency, outcome="success", mode="stream", tool=tool)
+            self._latencies.append(latency)
+            return extracted_data, latency
+        except Exception:
+            latency = time.perf_counter() - llm_start
+            record("mercury.extract", latency, outcome="failure", mode="stream", tool=tool)
+            return None, latency
+        finally:
+            if response is not None:
+                response.close()
+
+    def extract_hedged(self, transcript: str, deadline_sec: float = None, current_date: str = None,
+                       hedge_delay: float = None, limiter=None, tool: str = SCHEDULE_VISIT_TOOL):
+        """
+        Hedged `extract`: if the first request has not answered after `hedge_delay` (default: the
+        recent p95), a second identical request is fired and the first successful answer wins.
+        The loser cannot be aborted mid-flight; its answer is discarded.
+        Returns extracted data (dict or None) and latency (float).
+        """
+        start_time = time.perf_counter()
+        primary = self.submit(transcript, deadline_sec, current_date, limiter, tool)
+        done, _ = wait([primary], timeout=self.hedge_delay() if hedge_delay is None else hedge_delay)
+        if done:
+            return primary.result()[0], (time.perf_counter() - start_time)
+
+        self._count("hedges_fired")
+        secondary = self.submit(transcript, deadline_sec, current_date, limiter, tool)
+        pending = {primary, secondary}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                data, _ = future.result()
+                if data is None:
+                    continue
+                won_at = time.perf_counter()
+                if future is secondary:
+                    self._count("hedges_won")
+                    # Saved time = how much longer the primary took, known once it finishes
+                    primary.add_done_callback(lambda _: self._count("hedge_saved_sec", time.perf_counter() - won_at))
+                else:
+                    self._count("hedges_wasted")
+                return data, (won_at - start_time)
+        return None, (time.perf_counter() - start_time)
+
+    def extract_many(self, transcripts, max_concurrency: int = MERCURY_MAX_CONCURRENCY,
+                     deadline_sec: float = None, current_date: str = None, hedge: bool = MERCURY_HEDGE):
+        """
+        Runs `extract` (or `extract_hedged`) over many transcripts with at most `max_concurrency`
+        primary requests in flight. Returns a list of (data, latency) tuples in input order.
+        """
+        transcripts = list(transcripts)
+        if not transcripts:
+            return []
+
+        extract = self.extract_hedged if hedge else self.extract
+        workers = max(1, min(max_concurrency, len(transcripts)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mercury") as executor:
+            return list(executor.map(
+                lambda t: extract(t, deadline_sec=deadline_sec, current_date=current_date),
+                transcripts
+            ))
+
+
+_DEFAULT_CLIENT = None
+_DEFAULT_CLIENT_LOCK = threading.Lock()
+
+
+def get_mercury_client():
+    """Returns the process-wide MercuryClient, creating it on first use."""
+    global _DEFAULT_CLIENT
+    if _DEFAULT_CLIENT is None:
+        with _DEFAULT_CLIENT_LOCK:
+            if _DEFAULT_CLIENT is None:
+                _DEFAULT_CLIENT = MercuryClient()
+    return _DEFAULT_CLIENT
+
+
+def set_mercury_client(client: MercuryClient):
+    """Replaces the process-wide client (e.g. to point benchmarks at a local stand-in). Returns the previous one."""
+    global _DEFAULT_CLIENT
+    with _DEFAULT_CLIENT_LOCK:
+        previous, _DEFAULT_CLIENT = _DEFAULT_CLIENT, client
+    return previous
+
+
+# --- Mercury (dLLM) Function (The Production Fallback) ---
+def extract_via_mercury_fallback(transcript: str, current_date: str = None, hedge: bool = MERCURY_HEDGE,
+                                 on_field=None):
+    """
+    Runs the Mercury dLLM API using the Tool Calling method for structured output.
+    This is the production fallback path. `hedge=True` races a second request against a slow first one.
+    With a streaming client (MERCURY_STREAM=1), `on_field(name, value)` sees each field as it lands
+    (not forwarded when hedging, where two streams race).
+    """
+    client = get_mercury_client()
+    if hedge:
+        return client.extract_hedged(transcript, current_date=current_date)
+    return client.extract(transcript, current_date=current_date, on_field=on_field)
+
+
+def extract_context_and_summarize(transcript: str, current_date: str = None, hedge: bool = MERCURY_HEDGE,
+                                  on_field=None):
+    """
+    One Mercury round trip for a voice note: the visit to schedule and the note summary together
+    (the `log_voice_note` tool). Returns the combined fields (VisitDetails + NoteSummary, sharing
+    lead_name; see `split_voice_note`) as a dict or None, and latency (float).
+    """
+    client = get_mercury_client()
+    if hedge:
+        return client.extract_hedged(transcript, current_date=current_date, tool=VOICE_NOTE_TOOL)
+    return client.extract(transcript, current_date=current_date, on_field=on_field, tool=VOICE_NOTE_TOOL)
+
+
+def extract_many_via_mercury_fallback(transcripts, max_concurrency: int = MERCURY_MAX_CONCURRENCY,
+                                      deadline_sec: float = None, current_date: str = None,
+                                      hedge: bool = MERCURY_HEDGE):
+    """Concurrent batch form of `extract_via_mercury_fallback`. Returns (data, latency) tuples in input order."""
+    return get_mercury_client().extract_many(
+        transcripts, max_concurrency=max_concurrency, deadline_sec=deadline_sec, current_date=current_date,
+        hedge=hedge
+    )
@@ -0,0 +1,148 @@
+# models/name_normalizer.py
+import os
+import re
+import json
+import time
+import threading
+from collections import OrderedDict
+
+# --- Name Normalization Settings (overridable via environment) ---
+NAME_MEMO_MAX_ENTRIES = int(os.getenv("NAME_MEMO_MAX_ENTRIES", "8192"))
+# JSON file {"Canonical": ["Variant", ...]} mapping known spellings of a name onto one form
+NAME_VARIANTS_PATH = os.getenv("NAME_VARIANTS_PATH")
+
+# Capitalized alphabetic words of 3+ letters are treated as names
+_NAME_WORD_RE = re.compile(r'[A-Z][A-Za-z]{2,}')
+_ROMAN_TEXT_RE = re.compile(r'[A-Za-z\s]+')
+
+
+class TransliterationMemo:
+    """In-process LRU of word -> normalized word. Words that normalize to themselves are memoized too."""
+
+    def __init__(self, max_entries: int = NAME_MEMO_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, word: str):
+        with self._lock:
+            normalized = self._entries.get(word)
+            if normalized is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(word)
+            self.stats["hits"] += 1
+            return normalized
+
+    def put(self, word: str, normalized: str):
+        with self._lock:
+            self._entries[word] = normalized
+            self._entries.move_to_end(word)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def snapshot_stats(self):
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.stats = {"hits": 0, "misses": 0}
+
+
+_MEMO = None
+_NAME_VARIANTS = None
+_SINGLETON_LOCK = threading.Lock()
+
+
+def get_transliteration_memo():
+    """Process-wide memo shared by every normalizer call."""
+    global _MEMO
+    if _MEMO is None:
+        with _SINGLETON_LOCK:
+            if _MEMO is None:
+                _MEMO = TransliterationMemo()
+    return _MEMO
+
+
+def _variant_lookup(groups: dict):
+    """{"Canonical": ["Variant", ...]} -> lowercase spelling -> canonical."""
+    lookup = {}
+    for canonical, spellings in groups.items():
+        for spelling in [canonical, *spellings]:
+            lookup[spelling.lower()] = canonical
+    return lookup
+
+
+def load_name_variants(path: str):
+    with open(path) as f:
+        return _variant_lookup(json.load(f))
+
+
+def get_name_variants():
+    """The variant dictionary, loaded once from NAME_VARIANTS_PATH (empty when unset or unreadable)."""
+    global _NAME_VARIANTS
+    if _NAME_VARIANTS is None:
+        with _SINGLETON_LOCK:
+            if _NAME_VARIANTS is None:
+                variants = {}
+                if NAME_VARIANTS_PATH:
+                    try:
+                        variants = load_name_variants(NAME_VARIANTS_PATH)
+                    except Exception as e:
+                        print(f" ERROR loading name variants from {NAME_VARIANTS_PATH}: {e}")
+                _NAME_VARIANTS = variants
+    return _NAME_VARIANTS
+
+
+def set_name_variants(variants: dict):
+    """Plugs in a variant dictionary ({"Canonical": ["Variant", ...]}); memoized words are dropped."""
+    global _NAME_VARIANTS
+    _NAME_VARIANTS = _variant_lookup(variants)
+    get_transliteration_memo().clear()
+
+
+def normalize_name_word(word: str, transliterate=None, scheme=None, variants: dict = None):
+    """One name word: the variant dictionary wins, then the transliteration engine; otherwise unchanged."""
+    if variants:
+        canonical = variants.get(word.lower())
+        if canonical:
+            return canonical
+    if transliterate is not None:
+        try:
+            normalized = transliterate(word, scheme, scheme)
+            if normalized and _ROMAN_TEXT_RE.fullmatch(normalized):
+                return normalized.capitalize()
+        except Exception:
+            pass
+    return word
+
+
+def normalize_names_batch(transcripts, transliterate=None, scheme=None, variants: dict = None,
+                          memo: TransliterationMemo = None):
+    """
+    Normalizes the name words of many transcripts. Distinct name words across the whole batch are
+    resolved once (memo first, then variants / transliteration) and substituted back per transcript.
+    Returns the normalized transcripts and the stage latency (float).
+    """
+    start_time = time.perf_counter()
+    split_transcripts = [transcript.split() for transcript in transcripts]
+
+    # 1. Resolve each distinct name word once for the whole batch
+    resolved = {}
+    for words in split_transcripts:
+        for word in words:
+            if word in resolved or not _NAME_WORD_RE.fullmatch(word):
+                continue
+            normalized = memo.get(word) if memo else None
+            if normalized is None:
+                normalized = normalize_name_word(word, transliterate, scheme, variants)
+                if memo:
+                    memo.put(word, normalized)
+            resolved[word] = normalized
+
+    # 2. Substitute back; non-name words pass through untouched
+    normalized_transcripts = [" ".join(resolved.get(word, word) for word in words) for words in split_transcripts]
+    return normalized_transcripts, (time.perf_counter() - start_time)
@@ -0,0 +1,127 @@
+# models/ner_stage.py
+import os
+import re
+import time
+import threading
+from collections import OrderedDict
+
+# --- NER Stage Settings (overridable via environment) ---
+NER_CACHE_MAX_ENTRIES = int(os.getenv("NER_CACHE_MAX_ENTRIES", "4096"))
+NER_BATCH_SIZE = int(os.getenv("NER_BATCH_SIZE", "16"))
+PERSON_ENTITY = "PER"
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_ner_text(text: str):
+    """Whitespace-insensitive form used as the cache key. Case is kept: the NER model relies on it."""
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def _to_plain_entity(entity: dict):
+    """Pipeline output holds numpy scalars; keep plain JSON-serializable fields only."""
+    return {
+        "entity_group": entity.get("entity_group", entity.get("entity")),
+        "word": entity.get("word"),
+        "score": float(entity.get("score", 0.0)),
+        "start": entity.get("start"),
+        "end": entity.get("end"),
+    }
+
+
+class EntityCache:
+    """In-process LRU of NER entities keyed by normalized transcript text."""
+
+    def __init__(self, max_entries: int = NER_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, text: str):
+        with self._lock:
+            entities = self._entries.get(text)
+            if entities is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(text)
+            self.stats["hits"] += 1
+            return [dict(entity) for entity in entities]
+
+    def put(self, text: str, entities):
+        with self._lock:
+            self._entries[text] = [dict(entity) for entity in entities]
+            self._entries.move_to_end(text)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def snapshot_stats(self):
+        with self._lock:
+            return dict(self.stats)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.stats = {"hits": 0, "misses": 0}
+
+
+_ENTITY_CACHE = None
+_ENTITY_CACHE_LOCK = threading.Lock()
+
+
+def get_entity_cache():
+    """Process-wide entity cache shared by every NER caller."""
+    global _ENTITY_CACHE
+    if _ENTITY_CACHE is None:
+        with _ENTITY_CACHE_LOCK:
+            if _ENTITY_CACHE is None:
+                _ENTITY_CACHE = EntityCache()
+    return _ENTITY_CACHE
+
+
+def run_ner_batch(transcripts, ner, batch_size: int = NER_BATCH_SIZE, cache: EntityCache = None, load_ner=None):
+    """
+    Runs the NER pipeline once per distinct transcript. Cached texts are skipped, duplicates in the
+    batch are collapsed, and the remaining texts go through the pipeline in `batch_size` chunks.
+    With `load_ner` (and `ner=None`) the pipeline is only fetched when some text is not cached.
+    Entity offsets refer to the whitespace-normalized text.
+    Returns a list of entity lists (empty when NER is unavailable) and the stage latency (float).
+    """
+    start_time = time.perf_counter()
+    texts = [normalize_ner_text(transcript) for transcript in transcripts]
+    if ner is None and load_ner is None:
+        return [[] for _ in texts], (time.perf_counter() - start_time)
+
+    # 1. Serve cached texts; keep one pipeline input per distinct uncached text
+    resolved = {}
+    pending = []
+    seen = set()
+    for text in texts:
+        if text in seen:
+            continue
+        seen.add(text)
+        cached = cache.get(text) if cache else None
+        if cached is not None:
+            resolved[text] = cached
+        else:
+            pending.append(text)
+
+    # 2. One batched pipeline call for everything else
+    if pending and ner is None:
+        ner = load_ner()
+    if pending and ner is not None:
+        try:
+            outputs = ner(pending, batch_size=batch_size)
+            for text, entities in zip(pending, outputs):
+                resolved[text] = [_to_plain_entity(entity) for entity in entities]
+                if cache:
+                    cache.put(text, resolved[text])
+        except Exception as e:
+            print(f" ERROR running NER: {e}")
+
+    return [[dict(entity) for entity in resolved.get(text, [])] for text in texts], (time.perf_counter() - start_time)
+
+
+def person_names(entities):
+    """Words of the PER entities, in order of appearance."""
+    return [entity["word"] for entity in entities if entity.get("entity_group") == PERSON_ENTITY]
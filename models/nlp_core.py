@@ -2,68 +2,241 @@
 import re
 import time
 from models.schema import VisitDetails
+from models.temporal_parser import MONTHS, TEMPORAL_UNITS, WEEKDAYS, resolve_temporal_expressions
+from models.contact_scanner import scan_contact_fields
+from models.telemetry import span, record
 
 # Define patterns to trigger fallback (any temporal data)
 COMPLEX_PATTERNS = [
-    r'\b(today|tomorrow|next|day|week|month|year|am|pm|\d{1,2}(:|\s(am|pm)))\b', 
-    r'\d{1,2}(st|nd|rd|th)\b', 
-    r'\d{4}-\d{2}-\d{2}', 
+    r'\b(today|tomorrow|next|day|week|month|year|am|pm|\d{1,2}(:|\s(am|pm)))\b',
+    r'\d{1,2}(st|nd|rd|th)\b',
+    r'\d{4}-\d{2}-\d{2}',
     r'(end|ending|later|after)\b'
 ]
+_MONTH_NAMES = '|'.join(sorted(MONTHS, key=len, reverse=True))
+_DEADLINE_TARGETS = '|'.join(['noon', 'midnight', 'eod', 'today', 'tonight', 'tomorrow', 'end', 'the end'] + WEEKDAYS)
+# Temporal forms the resolver never explains, so each one forces a miss: a clock time without am/pm
+# ("at 3", "at 3 o'clock"), a numeric date ("12/10", day/month order unknown) and a deadline
+# ("before 5 pm", "by Friday", "no later than noon"; "ends by 5 pm" is an end time)
+UNRESOLVABLE_TEMPORAL_PATTERNS = [
+    r'\b(?:at|by|around)\s+\d{1,2}\b(?!:|\s*-|\s*(?:a\.?m|p\.?m|noon|midnight|to|till|until|' + _MONTH_NAMES + r')\b)',
+    r"\b\d{1,2}\s*o['’]?\s*clock\b",
+    r'\b\d{1,2}/\d{1,2}(?:/\d{2,4})?\b',
+    r'(?<!\bend\s)(?<!\bends\s)\b(?:before|by|no\s+later\s+than)\s+(?:\d|(?:' + _DEADLINE_TARGETS + r')\b)',
+]
+# Clock ranges ("3 to 4 pm"): explained when either end carries am/pm, a miss otherwise
+CLOCK_RANGE_PATTERN = r'\b\d{1,2}(?::\d{2})?\s*(?:to|till|until|-)\s*\d{1,2}\b'
+# Calendar periods ("this quarter", "last week"): explained only inside a resolved date ("first Monday of this month")
+RELATIVE_PERIOD_PATTERN = r'\b(?:this|last|coming|past)\s+(?:' + '|'.join(sorted(TEMPORAL_UNITS)) + r')s?\b'
 # Define keywords to help with name extraction
 START_MARKERS = ['with', 'for']
 STOP_MARKERS = ['to', 'regarding', 'for', 'about', 'on', 'at', 'business', 'operation', 'discuss', 'review', 'close', 'account', 'structure']
+# Abbreviations whose trailing period does not end the name ("with Dr. Patel")
+HONORIFICS = frozenset(['mr.', 'mrs.', 'ms.', 'dr.', 'prof.', 'shri.', 'smt.'])
+# Temporal qualifiers left around a resolved expression ("sometime next Monday", "around 3 pm"); they end
+# the name in strict mode only, so resolve_temporal=False keeps the original stop list
+STRICT_STOP_MARKERS = ['before', 'by', 'around', 'sometime', 'later', 'until', 'till', 'next']
+SENTENCE_PUNCTUATION = ('.', '!', '?', ';', ':')
+
+# --- COMPILED RULE ENGINE (built once at import time) ---
+# All temporal triggers folded into a single alternation: one scan per transcript instead of one per pattern.
+TEMPORAL_TRIGGER_RE = re.compile(
+    "|".join(f"(?:{pattern})" for pattern in
+             COMPLEX_PATTERNS + UNRESOLVABLE_TEMPORAL_PATTERNS + [CLOCK_RANGE_PATTERN, RELATIVE_PERIOD_PATTERN]),
+    re.IGNORECASE
+)
+# The original trigger set, for resolve_temporal=False
+LEGACY_TRIGGER_RE = re.compile("|".join(f"(?:{pattern})" for pattern in COMPLEX_PATTERNS), re.IGNORECASE)
+# Token-level pre-check equivalent to TEMPORAL_TRIGGER_RE for digit-free text, so the full
+# alternation (and its span scan) only runs when a trigger can actually be present.
+# The same check for LEGACY_TRIGGER_RE
+LEGACY_TRIGGER_WORDS = frozenset(['today', 'tomorrow', 'next', 'day', 'week', 'month', 'year', 'am', 'pm'])
+# Period units cover RELATIVE_PERIOD_PATTERN ("this quarter" has no other trigger word), before/by the deadlines
+TRIGGER_WORDS = frozenset(['today', 'tomorrow', 'next', 'day', 'week', 'month', 'year', 'am', 'pm', 'before', 'by']
+                          + list(TEMPORAL_UNITS) + [unit + 's' for unit in TEMPORAL_UNITS])
+TRIGGER_SUFFIX_RE = re.compile(r'(?:end(?:ing)?|later|after)\b')
+WORD_RE = re.compile(r'\w+')
+DIGIT_RE = re.compile(r'\d')
+# Subset of TEMPORAL_TRIGGER_RE that no resolution explains: a match is a guaranteed miss
+UNRESOLVABLE_TEMPORAL_RE = re.compile("|".join(f"(?:{pattern})" for pattern in UNRESOLVABLE_TEMPORAL_PATTERNS), re.IGNORECASE)
+BUSINESS_RE = re.compile(r'\b(business)\b', re.IGNORECASE)
+OPERATION_RE = re.compile(r'\b(operation)\b', re.IGNORECASE)
+
+# Resolved contact details and temporal expressions are masked with these tokens, which also end name capture
+CONTACT_SENTINEL = "<contact>"
+TEMPORAL_SENTINEL = "<temporal>"
 
+START_MARKER_SET = frozenset(START_MARKERS)
+STOP_MARKER_SET = frozenset(STOP_MARKERS + [CONTACT_SENTINEL, TEMPORAL_SENTINEL])
+STRICT_STOP_MARKER_SET = STOP_MARKER_SET | frozenset(STRICT_STOP_MARKERS)
+OUTPUT_FIELDS = tuple(VisitDetails.model_fields.keys())
 
-def run_nlp_fast_path(transcript: str):
+
+def _extract_lead_name(words: list, strict: bool = True):
     """
-    Runs the fast NLP path using aggressive string indexing.
-    Returns extracted data (dict) and latency (float).
+    Aggressive name capture over an already tokenized (lowercased) transcript.
+    Start markers are located in the same pass, then tried in START_MARKERS priority order.
+    `strict` also ends the name at a comma, sentence punctuation, a word with digits ("Ravi 2") or a
+    temporal qualifier (STRICT_STOP_MARKERS); without it the name runs to the first stop marker, as the
+    original rules did.
     """
-    start_time = time.time()
-    nlp_output = {field: "N/A" for field in VisitDetails.model_fields.keys()}
-    
-    # 1. Check for Complex Patterns (If found, we immediately fail the fast path)
-    for pattern in COMPLEX_PATTERNS:
-        if re.search(pattern, transcript, re.IGNORECASE):
-            return None, (time.time() - start_time) # Fail fast: needs LLM
-            
-    # 2. Extract Basic Fields (Aggressive Name Capture)
-    words = transcript.lower().split()
-    name_candidate = "N/A"
-    
+    stop_markers = STRICT_STOP_MARKER_SET if strict else STOP_MARKER_SET
+    first_positions = {}
+    for index, word in enumerate(words):
+        if word in START_MARKER_SET and word not in first_positions:
+            first_positions[word] = index
+            if len(first_positions) == len(START_MARKER_SET):
+                break
+
     for marker in START_MARKERS:
-        if marker in words:
-            start_index = words.index(marker) + 1
-            name_words = []
-            
-            # Capture words until a defined stop word is reached
-            for word in words[start_index:]:
-                # Use a combined list for stop words
-                if word in STOP_MARKERS:
-                    break
-                name_words.append(word)
-            
-            if name_words:
-                # Basic capitalization to handle names
-                name_candidate = ' '.join(name_words).title()
+        if marker not in first_positions:
+            continue
+
+        name_words = []
+        # Capture words until a defined stop word is reached
+        for word in words[first_positions[marker] + 1:]:
+            if word in stop_markers:
                 break
+            if strict:
+                if DIGIT_RE.search(word):
+                    break
+                # A comma or a sentence end closes the name clause ("with Ravi Kumar, his email is ...")
+                if word.endswith(',') or (word.endswith(SENTENCE_PUNCTUATION) and word not in HONORIFICS):
+                    if word.rstrip(',.!?;:'):
+                        name_words.append(word.rstrip(',.!?;:'))
+                    break
+            name_words.append(word)
+
+        if name_words:
+            # Basic capitalization to handle names
+            return ' '.join(name_words).title()
+
+    return "N/A"
+
+
+def _may_contain_trigger(lowered: str, words: list, trigger_words=TRIGGER_WORDS):
+    """Cheap token-level check; False guarantees TEMPORAL_TRIGGER_RE (LEGACY_TRIGGER_RE with LEGACY_TRIGGER_WORDS) has no match."""
+    return (DIGIT_RE.search(lowered) is not None or not trigger_words.isdisjoint(words)
+            or TRIGGER_SUFFIX_RE.search(lowered) is not None)
+
+
+def _find_temporal_triggers(lowered: str, words: list):
+    """Returns the (start, end) spans of every temporal trigger in the lowercased transcript."""
+    if not _may_contain_trigger(lowered, words):
+        return []
+    return [match.span() for match in TEMPORAL_TRIGGER_RE.finditer(lowered)]
+
+
+def _mask_spans(text: str, spans, sentinel: str):
+    """Replaces resolved spans so they cannot trip later rules or leak into the captured lead name."""
+    pieces = []
+    cursor = 0
+    for start, end in spans:
+        pieces.append(text[cursor:start])
+        pieces.append(f" {sentinel} ")
+        cursor = end
+    pieces.append(text[cursor:])
+    return "".join(pieces)
+
+
+def _detect_visit_type(transcript: str):
+    if BUSINESS_RE.search(transcript):
+        return "BUSINESS"
+    if OPERATION_RE.search(transcript):
+        return "OPERATION"
+    return None
+
+
+def predict_fast_path_miss(transcript: str):
+    """
+    Cheap pre-check (no contact or temporal parsing) used to start the LLM fallback speculatively.
+    Uses the rules' own acceptance conditions, so True means the rules will miss: no visit type,
+    no start marker, or a temporal form the resolver never explains (UNRESOLVABLE_TEMPORAL_PATTERNS,
+    outside dictated contact details).
+    """
+    if _detect_visit_type(transcript) is None:
+        return True
+    lowered = transcript.lower()
+    if START_MARKER_SET.isdisjoint(lowered.split()):
+        return True
+    return UNRESOLVABLE_TEMPORAL_RE.search(lowered) is not None
+
+
+def run_nlp_fast_path(transcript: str, reference_date=None, resolve_temporal: bool = True):
+    """
+    Runs the fast NLP path using the precompiled rule engine.
+    Dictated emails and phone numbers are normalized by the contact scanner, and dates and times are
+    resolved locally against `reference_date` (default: today); only genuinely ambiguous temporal
+    expressions fail the fast path. `resolve_temporal=False` restores the original rules exactly:
+    any temporal trigger fails, no contact scan, and the name runs to the first stop marker.
+    Returns extracted data (dict) and latency (float).
+    """
+    start_time = time.perf_counter()
+    nlp_output = None
+    # No visit type is a miss whatever else the transcript holds, so it is checked first
+    visit_type = _detect_visit_type(transcript)
+    if visit_type is not None:
+        nlp_output = _run_nlp_rules(transcript, transcript.lower(), visit_type, reference_date, resolve_temporal)
+    latency = time.perf_counter() - start_time
+    record("nlp.fast_path", latency, outcome="hit" if nlp_output else "miss")
+    return nlp_output, latency
+
+
+def run_nlp_fast_path_batch(transcripts, reference_date=None, resolve_temporal: bool = True):
+    """
+    Runs the fast NLP path over many transcripts (e.g. the nightly backfill), one call per transcript.
+    Returns a list of extracted data (dict or None) and a list of per-item latencies (float).
+    """
+    results = []
+    latencies = []
+    for transcript in transcripts:
+        data, latency = run_nlp_fast_path(transcript, reference_date, resolve_temporal)
+        results.append(data)
+        latencies.append(latency)
+    return results, latencies
+
+
+def _run_nlp_rules(transcript: str, lowered: str, visit_type: str, reference_date, resolve_temporal: bool):
+    """Rules after the visit type check; returns the extracted data (dict) or None."""
+    contact_fields = None
+    temporal_fields = None
+
+    if not resolve_temporal:
+        # Original behaviour: any temporal trigger fails fast, before any other work
+        if (_may_contain_trigger(lowered, WORD_RE.findall(lowered), LEGACY_TRIGGER_WORDS)
+                and LEGACY_TRIGGER_RE.search(lowered)):
+            return None # Fail fast: needs LLM
+    else:
+        # 1. Contact fields first, so dictated digits cannot be mistaken for times
+        words = WORD_RE.findall(lowered)
+        with span("nlp.contact_scan"):
+            contact_fields, contact_spans = scan_contact_fields(lowered, words)
+        if contact_spans:
+            lowered = _mask_spans(lowered, contact_spans, CONTACT_SENTINEL)
+            words = WORD_RE.findall(lowered)
+
+        # 2. Check for Complex Patterns (resolve them locally, or fail fast to the LLM)
+        with span("nlp.temporal_resolve"):
+            trigger_spans = _find_temporal_triggers(lowered, words)
+            temporal_fields, temporal_spans = resolve_temporal_expressions(lowered, trigger_spans, reference_date, words)
+        if temporal_fields is None:
+            return None # Ambiguous: needs LLM
+        if temporal_spans:
+            lowered = _mask_spans(lowered, temporal_spans, TEMPORAL_SENTINEL)
+
+    # 3. Extract Basic Fields (single tokenization pass)
+    name_candidate = _extract_lead_name(lowered.split(), strict=resolve_temporal)
+    if name_candidate == "N/A":
+        return None
+
+    # Final Success Check: found a name AND a visit type AND no unresolved temporal data
+    nlp_output = dict.fromkeys(OUTPUT_FIELDS, "N/A")
+    nlp_output['visit_type'] = visit_type
+    nlp_output['lead_name'] = name_candidate
+    nlp_output['title'] = transcript[:40].strip() + "..."
+    if contact_fields:
+        nlp_output.update(contact_fields)
+    if temporal_fields:
+        nlp_output.update(temporal_fields)
+    return nlp_output
 
-    # 3. Final Validation Check
-    visit_type_match = False
-    
-    if re.search(r'\b(business)\b', transcript, re.IGNORECASE):
-        nlp_output['visit_type'] = "BUSINESS"
-        visit_type_match = True
-    elif re.search(r'\b(operation)\b', transcript, re.IGNORECASE):
-        nlp_output['visit_type'] = "OPERATION"
-        visit_type_match = True
-        
-    # Final Success Check: Must have found a name AND a visit type AND not have failed temporal check
-    if name_candidate != "N/A" and visit_type_match:
-        nlp_output['lead_name'] = name_candidate
-        nlp_output['title'] = transcript[:40].strip() + "..."
-        
-        return nlp_output, (time.time() - start_time)
-        
-    return None, (time.time() - start_time)
\ No newline at end of file
@@ -19,4 +19,10 @@ class NoteSummary(BaseModel):
     """Schema for summarizing a voice note."""
     lead_name: str = Field(description="The full name of the lead mentioned.")
     summary_of_note: str = Field(description="A concise summary of the key points in the note (20 words max).")
-    action_required: Literal["Yes", "No"] = Field(description="Set to 'Yes' if the note implies a future action is needed.")
\ No newline at end of file
+    action_required: Literal["Yes", "No"] = Field(description="Set to 'Yes' if the note implies a future action is needed.")
+
+# --- Combined Schema (scheduling + note summary in one tool call) ---
+class VoiceNoteExtraction(VisitDetails):
+    """VisitDetails plus the NoteSummary fields, so one call covers a voice note; lead_name is shared."""
+    summary_of_note: str = Field(description="A concise summary of the key points in the note (20 words max).")
+    action_required: Literal["Yes", "No"] = Field(description="Set to 'Yes' if the note implies a future action is needed.")
@@ -0,0 +1,168 @@
+# models/streaming_asr.py
+import os
+import re
+import time
+import numpy as np
+from models.audio_utils import ASR_SAMPLING_RATE, detect_speech_regions
+from models.demo_utils import transcribe_buffer, normalize_transcript_names
+from models.nlp_core import run_nlp_fast_path
+from models.telemetry import span, record
+
+# --- STREAMING ASR SETTINGS ---
+# New audio needed before the rolling hypothesis is re-decoded
+ASR_STREAM_STEP_SEC = float(os.getenv("ASR_STREAM_STEP_SEC", "1.0"))
+# Uncommitted audio is cut at the last pause once it reaches this length (Whisper sees at most 30 s)
+ASR_STREAM_MAX_BUFFER_SEC = float(os.getenv("ASR_STREAM_MAX_BUFFER_SEC", "24.0"))
+
+_WORD_KEY_RE = re.compile(r'[^\w]+')
+
+
+def _word_key(word: str):
+    """Comparison form of a hypothesis word: case and punctuation differ between decodes."""
+    return _WORD_KEY_RE.sub('', word.lower())
+
+
+def agreed_prefix(previous, current):
+    """Longest common word prefix of two consecutive hypotheses (LocalAgreement-2), in `current`'s spelling."""
+    length = 0
+    for old, new in zip(previous, current):
+        if _word_key(old) != _word_key(new):
+            break
+        length += 1
+    return current[:length]
+
+
+def reconcile_fields(early_fields: dict, final_data: dict):
+    """Early fields whose value the full-utterance result changed: {name: (early, final)}."""
+    final_data = final_data or {}
+    return {
+        name: (value, final_data.get(name, "N/A"))
+        for name, (value, _) in early_fields.items()
+        if final_data.get(name, "N/A") != value
+    }
+
+
+class StreamingTranscriber:
+    """
+    Incremental transcription of PCM chunks (mono float32, 16 kHz) as they arrive.
+    Every `step_sec` of new audio the uncommitted buffer is re-decoded; words that two consecutive
+    hypotheses agree on become the stable prefix, which never shrinks until the buffer is cut. Each
+    time the stable prefix grows the rule-based fast path runs on it, so fields such as lead_name
+    and visit_type are reported (`on_field(name, value)`) before the utterance ends.
+    Audio beyond `max_buffer_sec` is committed at the last pause, so each decode stays in one window.
+    """
+
+    def __init__(self, assets: dict, reference_date: str = None, step_sec: float = ASR_STREAM_STEP_SEC,
+                 max_buffer_sec: float = ASR_STREAM_MAX_BUFFER_SEC, on_partial=None, on_field=None):
+        self.assets = assets
+        self.reference_date = reference_date
+        self.step_samples = int(step_sec * ASR_SAMPLING_RATE)
+        self.max_buffer_samples = int(max_buffer_sec * ASR_SAMPLING_RATE)
+        self.on_partial = on_partial
+        self.on_field = on_field
+
+        self._chunks = []
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._pending = 0
+        self._committed = []
+        self._previous = []
+        self._stable = []
+        self._start_time = None
+        self.stable_text = ""
+        self.hypothesis = ""
+        # name -> (value, seconds since the first chunk)
+        self.early_fields = {}
+        self.first_field_sec = None
+        self.stats = {"decodes": 0, "decode_sec": 0.0, "commits": 0, "fast_path_hits": 0}
+
+    def feed(self, chunk):
+        """Appends a PCM chunk, re-decoding once enough new audio has arrived. Returns the stable text."""
+        if self._start_time is None:
+            self._start_time = time.perf_counter()
+        chunk = np.asarray(chunk, dtype=np.float32).reshape(-1)
+        self._chunks.append(chunk)
+        self._buffer = np.concatenate((self._buffer, chunk))
+        self._pending += len(chunk)
+        if self._pending >= self.step_samples:
+            self._pending = 0
+            self._update()
+        return self.stable_text
+
+    def _decode(self, speech: np.ndarray):
+        start_time = time.perf_counter()
+        with span("asr.stream_decode", audio_sec=round(len(speech) / ASR_SAMPLING_RATE, 1)):
+            transcription, _, _ = transcribe_buffer(speech, self.assets, long_form=False)
+        self.stats["decodes"] += 1
+        self.stats["decode_sec"] += time.perf_counter() - start_time
+        return transcription.split()
+
+    def _commit(self):
+        """Decodes the buffer up to the start of its last speech region for good and drops that audio."""
+        regions = detect_speech_regions(self._buffer, ASR_SAMPLING_RATE)
+        cut = regions[-1][0] if len(regions) > 1 else 0
+        if cut <= 0:
+            cut = len(self._buffer) - self.step_samples  # one long region: hard cut, keep the newest step
+        self._committed.extend(self._decode(self._buffer[:cut]))
+        self._buffer = self._buffer[cut:]
+        self._previous, self._stable = [], []
+        self.stats["commits"] += 1
+
+    def _update(self):
+        if len(self._buffer) >= self.max_buffer_samples:
+            self._commit()
+        current = self._decode(self._buffer)
+        agreed = agreed_prefix(self._previous, current)
+        # Extend only: a later hypothesis that disagrees with reported words leaves them to the final pass
+        if len(agreed) > len(self._stable) and len(agreed_prefix(self._stable, agreed)) == len(self._stable):
+            self._stable = agreed
+        self._previous = current
+        self.hypothesis = " ".join(self._committed + current)
+
+        stable_text = " ".join(self._committed + self._stable)
+        if stable_text != self.stable_text:
+            self.stable_text = stable_text
+            if self.on_partial is not None:
+                self.on_partial(stable_text, self.hypothesis)
+            self._extract_early(stable_text)
+
+    def _extract_early(self, stable_text: str):
+        """Fast path on the stable prefix; reports fields that are new or changed."""
+        data, _ = run_nlp_fast_path(normalize_transcript_names(stable_text), reference_date=self.reference_date)
+        if not data:
+            return
+        self.stats["fast_path_hits"] += 1
+        elapsed = time.perf_counter() - self._start_time
+        for name, value in data.items():
+            if name == "title" or value == "N/A":
+                continue
+            if self.early_fields.get(name, (None,))[0] != value:
+                if self.first_field_sec is None:
+                    self.first_field_sec = elapsed
+                    record("asr.stream_first_field", elapsed, field=name)
+                self.early_fields[name] = (value, elapsed)
+                if self.on_field is not None:
+                    self.on_field(name, value)
+
+    def finish(self):
+        """
+        Transcribes the full utterance in one go (the reconciliation pass).
+        Returns the normalized transcript, its latency after the last chunk (float), the audio
+        duration and the speech duration.
+        """
+        audio = np.concatenate(self._chunks) if self._chunks else np.zeros(0, dtype=np.float32)
+        start_time = time.perf_counter()
+        with span("asr.stream_final"):
+            transcription, speech_duration, _ = transcribe_buffer(audio, self.assets)
+            transcript = normalize_transcript_names(transcription)
+        return transcript, time.perf_counter() - start_time, len(audio) / ASR_SAMPLING_RATE, speech_duration
+
+    def time_to_first_field(self):
+        """Seconds from the first chunk to the first early field, or None."""
+        return self.first_field_sec
+
+
+def iter_pcm_chunks(speech: np.ndarray, chunk_sec: float = 0.25):
+    """Slices a decoded buffer into chunks, as a microphone or an upload would deliver them."""
+    chunk_samples = max(1, int(chunk_sec * ASR_SAMPLING_RATE))
+    for start in range(0, len(speech), chunk_samples):
+        yield speech[start:start + chunk_samples]
@@ -0,0 +1,248 @@
+# models/telemetry.py
+import os
+import json
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# --- Telemetry Settings (overridable via environment) ---
+TELEMETRY_ENABLED = os.getenv("PIPELINE_TELEMETRY", "0") == "1"
+METRIC_PREFIX = "voicebot"
+# Interface start_metrics_server binds by default; the series describe customer traffic, so only local
+# scrapers see them unless a wider bind (e.g. "0.0.0.0") is asked for explicitly
+METRICS_HOST = os.getenv("PIPELINE_METRICS_HOST", "127.0.0.1")
+# Latency histogram bucket upper bounds in seconds (regex checks sit in the first buckets, generate in the last)
+LATENCY_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_collected_spans = ContextVar("collected_spans", default=None)
+
+
+class _Histogram:
+    __slots__ = ("bucket_counts", "count", "sum")
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """Thread-safe per-stage latency histograms and event counters, keyed by (name, labels)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+
+    def observe(self, stage: str, seconds: float, labels: dict = None):
+        key = (stage, tuple(sorted(labels.items())) if labels else ())
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, name: str, amount: int = 1, labels: dict = None):
+        key = (name, tuple(sorted(labels.items())) if labels else ())
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        """JSON-serializable view: per-stage count, sum, mean and cumulative buckets, plus counters."""
+        with self._lock:
+            histograms = [(key, list(h.bucket_counts), h.count, h.sum) for key, h in self._histograms.items()]
+            counters = list(self._counters.items())
+
+        stages = []
+        for (stage, labels), bucket_counts, count, total in sorted(histograms):
+            cumulative, running = {}, 0
+            for bound, bucket_count in zip(LATENCY_BUCKETS + (float("inf"),), bucket_counts):
+                running += bucket_count
+                cumulative["+Inf" if bound == float("inf") else repr(bound)] = running
+            stages.append({"stage": stage, "labels": dict(labels), "count": count, "sum_sec": total,
+                           "mean_sec": total / count if count else 0.0, "buckets": cumulative})
+        return {
+            "stages": stages,
+            "counters": [{"name": name, "labels": dict(labels), "value": value} for (name, labels), value in sorted(counters)],
+        }
+
+
+REGISTRY = MetricsRegistry()
+
+
+# --- SPAN / TIMER API ---
+
+class _NoopSpan:
+    """Returned by `span()` while telemetry is off: entering and leaving it does nothing."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_label(self, key, value):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("stage", "labels", "start")
+
+    def __init__(self, stage: str, labels: dict):
+        self.stage = stage
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.labels["error"] = exc_type.__name__
+        _finish(self.stage, elapsed, self.labels)
+        return False
+
+    def set_label(self, key, value):
+        """Attaches a label known only once the stage has run (e.g. the extraction method)."""
+        self.labels[key] = value
+
+
+def _finish(stage: str, seconds: float, labels: dict):
+    REGISTRY.observe(stage, seconds, labels)
+    collected = _collected_spans.get()
+    if collected is not None:
+        collected.append((stage, seconds, dict(labels)))
+
+
+def span(stage: str, **labels):
+    """
+    Times a block with the monotonic perf_counter and records it under `stage`:
+        with span("asr.generate", profile="int8"): ...
+    Costs one flag check while telemetry is disabled.
+    """
+    if not TELEMETRY_ENABLED:
+        return _NOOP_SPAN
+    return _Span(stage, labels)
+
+
+def record(stage: str, seconds: float, **labels):
+    """Records an already measured duration (e.g. the latency a function returns anyway)."""
+    if TELEMETRY_ENABLED:
+        _finish(stage, seconds, labels)
+
+
+def increment(name: str, amount: int = 1, **labels):
+    """Counts an event (retries, cache hits, wasted calls)."""
+    if TELEMETRY_ENABLED:
+        REGISTRY.increment(name, amount, labels)
+
+
+def enable(enabled: bool = True):
+    global TELEMETRY_ENABLED
+    TELEMETRY_ENABLED = enabled
+
+
+def is_enabled():
+    return TELEMETRY_ENABLED
+
+
+@contextmanager
+def collect_spans():
+    """
+    Collects every span finished inside the block (in this thread/context) into a list of
+    (stage, seconds, labels), e.g. to print a per-request stage breakdown in the demo.
+    """
+    spans = []
+    token = _collected_spans.set(spans)
+    try:
+        yield spans
+    finally:
+        _collected_spans.reset(token)
+
+
+# --- EXPORTERS ---
+
+def _format_labels(labels: dict):
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def export_prometheus(registry: MetricsRegistry = REGISTRY):
+    """Prometheus text exposition format (version 0.0.4)."""
+    snapshot = registry.snapshot()
+    histogram_name = f"{METRIC_PREFIX}_stage_duration_seconds"
+    lines = [f"# HELP {histogram_name} Time spent per pipeline stage.", f"# TYPE {histogram_name} histogram"]
+    for entry in snapshot["stages"]:
+        labels = {"stage": entry["stage"], **entry["labels"]}
+        for bound, cumulative in entry["buckets"].items():
+            lines.append(f"{histogram_name}_bucket{_format_labels({**labels, 'le': bound})} {cumulative}")
+        lines.append(f"{histogram_name}_sum{_format_labels(labels)} {entry['sum_sec']}")
+        lines.append(f"{histogram_name}_count{_format_labels(labels)} {entry['count']}")
+
+    counter_names = sorted({entry["name"] for entry in snapshot["counters"]})
+    for name in counter_names:
+        metric = f"{METRIC_PREFIX}_{name.replace('.', '_')}_total"
+        lines.append(f"# TYPE {metric} counter")
+        for entry in snapshot["counters"]:
+            if entry["name"] == name:
+                lines.append(f"{metric}{_format_labels(entry['labels'])} {entry['value']}")
+    return "\n".join(lines) + "\n"
+
+
+def export_json(registry: MetricsRegistry = REGISTRY, indent: int = None):
+    return json.dumps(registry.snapshot(), indent=indent)
+
+
+def start_metrics_server(port: int = 9464, host: str = METRICS_HOST):
+    """
+    Serves /metrics (Prometheus) and /metrics.json on a background thread, on loopback unless `host` says otherwise.
+    Returns the server; call server.shutdown() to stop it.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/metrics.json"):
+                body, content_type = export_json().encode("utf-8"), "application/json"
+            elif self.path.startswith("/metrics"):
+                body, content_type = export_prometheus().encode("utf-8"), "text/plain; version=0.0.4"
+            else:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True).start()
+    return server
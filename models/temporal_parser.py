@@ -0,0 +1,285 @@
+# models/temporal_parser.py
+import re
+from functools import lru_cache
+from datetime import date, datetime, timedelta
+
+# --- Vocabulary ---
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+MONTHS = {
+    'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3, 'april': 4, 'apr': 4,
+    'may': 5, 'june': 6, 'jun': 6, 'july': 7, 'jul': 7, 'august': 8, 'aug': 8,
+    'september': 9, 'sept': 9, 'sep': 9, 'october': 10, 'oct': 10, 'november': 11, 'nov': 11,
+    'december': 12, 'dec': 12
+}
+ORDINALS = {'first': 1, 'second': 2, 'third': 3, 'fourth': 4, 'last': -1}
+SMALL_NUMBERS = {'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5}
+# Calendar periods: "this/last <unit>" (and "next <unit>" unless a weekday resolves it) needs the LLM
+TEMPORAL_UNITS = frozenset({
+    'day', 'week', 'fortnight', 'month', 'quarter', 'half', 'year', 'weekend', 'morning', 'afternoon',
+    'evening', 'night', 'hour', 'time', 'season', 'semester', 'term', 'fy', 'financial', 'fiscal'
+})
+# The only words after "next" that keep it non-temporal ("next steps"); anything else fails over to the LLM
+NON_TEMPORAL_NEXT_WORDS = frozenset({
+    'step', 'steps', 'action', 'actions', 'item', 'items', 'point', 'points', 'topic', 'topics',
+    'agenda', 'round', 'stage', 'level', 'version', 'release', 'batch', 'order', 'shipment', 'one'
+})
+
+_WD = '(' + '|'.join(WEEKDAYS) + ')'
+_MONTH = '(' + '|'.join(sorted(MONTHS, key=len, reverse=True)) + r')\.?'
+_TIME = r'(\d{1,2})(?::(\d{2}))?\s*(a\.?m\.?|p\.?m\.?)?'
+_NUM = r'(\d{1,2}|an?|one|two|three|four|five)'
+
+# --- Compiled grammar (applied to the lowercased transcript, in priority order) ---
+ISO_DATE_RE = re.compile(r'\b(\d{4})-(\d{2})-(\d{2})\b')
+NTH_WEEKDAY_RE = re.compile(r'\b(?:the\s+)?(first|second|third|fourth|last)\s+' + _WD + r'\s+of\s+(?:(?:the|this)\s+)?(next\s+)?month\b')
+DAY_MONTH_RE = re.compile(r'\b(?:the\s+)?(\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?' + _MONTH + r'(?:,?\s+(\d{4}))?(?![a-z])')
+MONTH_DAY_RE = re.compile(r'\b' + _MONTH + r'\s+(?:the\s+)?(\d{1,2})(?:st|nd|rd|th)?\b(?!\s*(?::|a\.?m|p\.?m))(?:,?\s+(\d{4}))?')
+ORDINAL_DAY_RE = re.compile(r'\b(?:the\s+)?(\d{1,2})(?:st|nd|rd|th)\b')
+WEEKDAY_NEXT_WEEK_RE = re.compile(r'\b(?:next\s+week\s+(?:on\s+)?' + _WD + r'|' + _WD + r'\s+(?:of\s+)?next\s+week)\b')
+WEEKDAY_RE = re.compile(r'\b(?:(?:this|next|coming)\s+)?' + _WD + r'\b')
+RELATIVE_DAY_RE = re.compile(r'\b(?:the\s+)?(day\s+after\s+tomorrow|today|tonight|tomorrow)\b')
+IN_N_DAYS_RE = re.compile(r'\bin\s+' + _NUM + r'\s+(days?|weeks?)\b')
+
+TIME_RANGE_RES = (
+    re.compile(r'\bbetween\s+' + _TIME + r'\s*(?:and|to|-)\s*' + _TIME + r'(?![\w:])'),
+    re.compile(r'\b(?:from\s+)?' + _TIME + r'\s*(?:to|till|until|-)\s*' + _TIME + r'(?![\w:])'),
+)
+END_TIME_RE = re.compile(r'\b(?:until|till|ending(?:\s+at)?|ends?\s+(?:at|by))\s+' + _TIME + r'(?![\w:])')
+# "by 5 pm" / "before 5 pm" are deadlines, not start times (the fast path sends them to the LLM)
+START_TIME_RE = re.compile(r'\b(?:at\s+)?' + _TIME + r'(?![\w:])')
+NOON_RE = re.compile(r'\b(?:at\s+)?(?:12\s+)?(noon|midnight)\b')
+# Cheap pre-checks: skip the grammar entirely (or its numeric half) when there is nothing to resolve
+TEMPORAL_CUE_WORDS = frozenset(WEEKDAYS + ['noon', 'midnight', 'tonight', 'today', 'tomorrow', 'week', 'weeks', 'days'])
+DIGIT_RE = re.compile(r'\d')
+WORD_RE = re.compile(r'\w+')
+DURATION_RE = re.compile(r'\bfor\s+(half\s+an|an?|one|two|three|\d{1,3})\s+(hours?|hrs?|minutes?|mins?)\b')
+
+
+class AmbiguousTemporalExpression(ValueError):
+    """Raised when a temporal expression cannot be resolved deterministically."""
+
+
+@lru_cache(maxsize=64)
+def _parse_reference_date(reference_date: str):
+    return datetime.strptime(reference_date, "%Y-%m-%d").date()
+
+
+def _to_reference_date(reference_date):
+    if reference_date is None:
+        return date.today()
+    if isinstance(reference_date, datetime):
+        return reference_date.date()
+    if isinstance(reference_date, date):
+        return reference_date
+    return _parse_reference_date(reference_date)
+
+
+def _small_number(token: str):
+    return SMALL_NUMBERS[token] if token in SMALL_NUMBERS else int(token)
+
+
+def _safe_date(year: int, month: int, day: int):
+    try:
+        return date(year, month, day)
+    except ValueError:
+        raise AmbiguousTemporalExpression(f"Invalid calendar date {year}-{month}-{day}")
+
+
+def _upcoming_month_day(ref: date, month: int, day: int, year=None):
+    """Month/day without a year resolves to the next occurrence on or after the reference date."""
+    if year:
+        return _safe_date(int(year), month, day)
+    candidate = _safe_date(ref.year, month, day)
+    return candidate if candidate >= ref else _safe_date(ref.year + 1, month, day)
+
+
+def _nth_weekday_of_month(year: int, month: int, weekday: int, nth: int):
+    if nth == -1:
+        next_month = date(year + month // 12, month % 12 + 1, 1)
+        last_day = next_month - timedelta(days=1)
+        return last_day - timedelta(days=(last_day.weekday() - weekday) % 7)
+    first_day = date(year, month, 1)
+    candidate = first_day + timedelta(days=(weekday - first_day.weekday()) % 7 + 7 * (nth - 1))
+    if candidate.month != month:
+        raise AmbiguousTemporalExpression("No such weekday in month")
+    return candidate
+
+
+def _to_24h(hour: str, minute: str, meridiem: str, inherited_meridiem: str = None):
+    """Converts a spoken clock time to HH:MM. Bare 1-12 o'clock times without am/pm are ambiguous."""
+    hour, minute = int(hour), int(minute or 0)
+    meridiem = (meridiem or inherited_meridiem or '').replace('.', '')
+    if minute > 59 or hour > 23:
+        raise AmbiguousTemporalExpression("Invalid clock time")
+    if meridiem:
+        if not 1 <= hour <= 12:
+            raise AmbiguousTemporalExpression("Invalid 12-hour clock time")
+        hour = hour % 12 + (12 if meridiem == 'pm' else 0)
+    elif 1 <= hour <= 12:
+        raise AmbiguousTemporalExpression("Clock time without am/pm")
+    return f"{hour:02d}:{minute:02d}"
+
+
+class _Resolution:
+    """Accumulates resolved fields and the character spans that explain them."""
+
+    def __init__(self):
+        self.fields = {"date": None, "start_time": None, "end_time": None}
+        self.spans = []
+
+    def claim(self, match):
+        start, end = match.span()
+        if any(start < s_end and s_start < end for s_start, s_end in self.spans):
+            return False
+        self.spans.append((start, end))
+        return True
+
+    def set(self, field: str, value: str):
+        if self.fields[field] not in (None, value):
+            raise AmbiguousTemporalExpression(f"Conflicting values for {field}")
+        self.fields[field] = value
+
+    def covers(self, start: int, end: int):
+        return any(s_start <= start and end <= s_end for s_start, s_end in self.spans)
+
+
+def _resolve_numeric_dates(text: str, ref: date, res: _Resolution):
+    for m in ISO_DATE_RE.finditer(text):
+        if res.claim(m):
+            res.set("date", _safe_date(int(m.group(1)), int(m.group(2)), int(m.group(3))).isoformat())
+
+    for m in DAY_MONTH_RE.finditer(text):
+        if res.claim(m):
+            res.set("date", _upcoming_month_day(ref, MONTHS[m.group(2)], int(m.group(1)), m.group(3)).isoformat())
+
+    for m in MONTH_DAY_RE.finditer(text):
+        if res.claim(m):
+            res.set("date", _upcoming_month_day(ref, MONTHS[m.group(1)], int(m.group(2)), m.group(3)).isoformat())
+
+    for m in ORDINAL_DAY_RE.finditer(text):
+        if res.claim(m):
+            day = int(m.group(1))
+            if day >= ref.day:
+                resolved = _safe_date(ref.year, ref.month, day)
+            else:
+                resolved = _safe_date(ref.year + ref.month // 12, ref.month % 12 + 1, day)
+            res.set("date", resolved.isoformat())
+
+
+def _resolve_dates(text: str, ref: date, res: _Resolution, has_digit: bool):
+    if has_digit:
+        _resolve_numeric_dates(text, ref, res)
+
+    for m in NTH_WEEKDAY_RE.finditer(text):
+        if res.claim(m):
+            year, month = (ref.year + ref.month // 12, ref.month % 12 + 1) if m.group(3) else (ref.year, ref.month)
+            weekday, nth = WEEKDAYS.index(m.group(2)), ORDINALS[m.group(1)]
+            resolved = _nth_weekday_of_month(year, month, weekday, nth)
+            if resolved < ref and not m.group(3):
+                raise AmbiguousTemporalExpression("Weekday of this month already passed")
+            res.set("date", resolved.isoformat())
+
+    for m in WEEKDAY_NEXT_WEEK_RE.finditer(text):
+        if res.claim(m):
+            weekday = WEEKDAYS.index(m.group(1) or m.group(2))
+            next_monday = ref + timedelta(days=7 - ref.weekday())
+            res.set("date", (next_monday + timedelta(days=weekday)).isoformat())
+
+    for m in WEEKDAY_RE.finditer(text):
+        if res.claim(m):
+            # "Wednesday", "this Wednesday" and "next Wednesday" all mean the next upcoming one
+            days_ahead = (WEEKDAYS.index(m.group(1)) - ref.weekday()) % 7 or 7
+            res.set("date", (ref + timedelta(days=days_ahead)).isoformat())
+
+    for m in RELATIVE_DAY_RE.finditer(text):
+        if res.claim(m):
+            offset = {'today': 0, 'tonight': 0, 'tomorrow': 1}.get(m.group(1), 2)
+            res.set("date", (ref + timedelta(days=offset)).isoformat())
+
+    for m in IN_N_DAYS_RE.finditer(text):
+        if res.claim(m):
+            days = _small_number(m.group(1)) * (7 if m.group(2).startswith('week') else 1)
+            res.set("date", (ref + timedelta(days=days)).isoformat())
+
+
+def _resolve_times(text: str, res: _Resolution, has_digit: bool):
+    for range_re in (TIME_RANGE_RES if has_digit else ()):
+        for m in range_re.finditer(text):
+            start_has_marker = m.group(2) or m.group(3)
+            end_has_marker = m.group(5) or m.group(6)
+            if not (start_has_marker or end_has_marker) or not res.claim(m):
+                continue
+            # "from 2 to 3 pm": the start inherits the end's meridiem
+            res.set("start_time", _to_24h(m.group(1), m.group(2), m.group(3), inherited_meridiem=m.group(6)))
+            res.set("end_time", _to_24h(m.group(4), m.group(5), m.group(6)))
+
+    for m in (END_TIME_RE.finditer(text) if has_digit else ()):
+        if (m.group(2) or m.group(3)) and res.claim(m):
+            res.set("end_time", _to_24h(m.group(1), m.group(2), m.group(3)))
+
+    for m in NOON_RE.finditer(text):
+        if res.claim(m):
+            res.set("start_time", "12:00" if m.group(1) == 'noon' else "00:00")
+
+    for m in (START_TIME_RE.finditer(text) if has_digit else ()):
+        if (m.group(2) or m.group(3)) and res.claim(m):
+            res.set("start_time", _to_24h(m.group(1), m.group(2), m.group(3)))
+
+    start_time = res.fields["start_time"]
+    if start_time and not res.fields["end_time"]:
+        for m in DURATION_RE.finditer(text):
+            if res.claim(m):
+                amount = 0.5 if m.group(1) == 'half an' else _small_number(m.group(1))
+                minutes = amount * (60 if m.group(2).startswith('h') else 1)
+                start = datetime.strptime(start_time, "%H:%M")
+                end = start + timedelta(minutes=minutes)
+                # The schema holds a single date: a meeting running past midnight cannot be expressed
+                if end.date() != start.date():
+                    raise AmbiguousTemporalExpression("Duration runs past midnight")
+                res.set("end_time", end.strftime("%H:%M"))
+
+
+def _is_benign_trigger(text: str, start: int, end: int):
+    """Trigger hits that are not temporal at all ("I am", "next steps", "send", "attend")."""
+    token = text[start:end]
+    if token == 'am':
+        return not text[:start].rstrip()[-1:].isdigit()
+    if token == 'next':
+        following = text[end:].split(None, 1)
+        return bool(following) and following[0].strip('.,!?') in NON_TEMPORAL_NEXT_WORDS
+    if token in ('end', 'ending', 'later', 'after') and start > 0 and text[start - 1].isalpha():
+        word_start = start
+        while word_start > 0 and text[word_start - 1].isalpha():
+            word_start -= 1
+        return text[word_start:end] != 'weekend'
+    return False
+
+
+def resolve_temporal_expressions(text: str, trigger_spans, reference_date=None, words=None):
+    """
+    Resolves dates and times in a lowercased transcript against a reference date.
+    `trigger_spans` are the (start, end) hits of the fast path's temporal triggers; every one of them
+    must be explained by a resolved expression (or be a benign non-temporal hit).
+    Returns (fields, spans) where fields holds schema-formatted date/start_time/end_time ('N/A' if absent),
+    or (None, None) when the expression is ambiguous and needs the LLM.
+    `words` optionally passes the transcript's already tokenized words to skip re-tokenizing.
+    """
+    has_digit = DIGIT_RE.search(text) is not None
+    if not trigger_spans and not has_digit and TEMPORAL_CUE_WORDS.isdisjoint(words or WORD_RE.findall(text)):
+        return {"date": "N/A", "start_time": "N/A", "end_time": "N/A"}, []
+
+    ref = _to_reference_date(reference_date)
+    res = _Resolution()
+
+    try:
+        _resolve_dates(text, ref, res, has_digit)
+        _resolve_times(text, res, has_digit)
+    except AmbiguousTemporalExpression:
+        return None, None
+
+    for start, end in trigger_spans:
+        if not res.covers(start, end) and not _is_benign_trigger(text, start, end):
+            return None, None
+
+    fields = {field: value or "N/A" for field, value in res.fields.items()}
+    return fields, sorted(res.spans)
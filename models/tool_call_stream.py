@@ -0,0 +1,163 @@
+# models/tool_call_stream.py
+import json
+import typing
+from pydantic import TypeAdapter
+from models.schema import VisitDetails
+
+# Tokens budgeted per free-text value (title, names, emails) when deriving max_tokens from a schema
+STREAM_FREE_TEXT_TOKENS = 48
+# Rough characters per token for keys, enum values and JSON punctuation
+_CHARS_PER_TOKEN = 3
+
+_WHITESPACE = " \t\r\n"
+
+
+def schema_max_tokens(model=VisitDetails, free_text_tokens: int = STREAM_FREE_TEXT_TOKENS):
+    """
+    A tight max_tokens for one tool call: key + punctuation tokens per field, enum values at their
+    longest, free-text values at `free_text_tokens`, plus slack for the braces.
+    """
+    total = 8
+    for name, field in model.model_fields.items():
+        total += len(name) // _CHARS_PER_TOKEN + 3
+        if typing.get_origin(field.annotation) is typing.Literal:
+            total += max(len(str(value)) for value in typing.get_args(field.annotation)) // _CHARS_PER_TOKEN + 2
+        else:
+            total += free_text_tokens
+    return total
+
+
+class IncompleteArguments(Exception):
+    """More stream data is needed before the next token can be parsed."""
+
+
+class IncrementalArgumentsParser:
+    """
+    Parses a flat JSON object (tool-call arguments) as its text arrives in fragments and reports
+    each key/value pair as soon as the value is complete. Tolerates the two defects
+    parse_tool_call_arguments repairs: whitespace padding around separators and a stray '" '
+    before a string value ('"title":" "Visit..."').
+    Anything else unexpected (nested values, garbage) raises ValueError; callers then fall back to
+    repairing the full text once the stream ends.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.position = 0
+        self.state = "start"  # start -> key -> colon -> value -> separator -> ... -> done
+        self.key = None
+        self.fields = {}
+        self.done = False
+
+    def feed(self, fragment: str):
+        """Appends a fragment; returns the (key, value) pairs completed by it, in order."""
+        self.buffer += fragment
+        completed = []
+        try:
+            while not self.done:
+                pair = self._step()
+                if pair is not None:
+                    completed.append(pair)
+        except IncompleteArguments:
+            pass
+        return completed
+
+    def _skip_whitespace(self):
+        while self.position < len(self.buffer) and self.buffer[self.position] in _WHITESPACE:
+            self.position += 1
+        if self.position >= len(self.buffer):
+            raise IncompleteArguments()
+
+    def _read_string(self):
+        """JSON string starting at the current position (which holds '"')."""
+        end = self.position + 1
+        while True:
+            end = self.buffer.find('"', end)
+            if end < 0:
+                raise IncompleteArguments()
+            backslashes = 0
+            while self.buffer[end - 1 - backslashes] == "\\":
+                backslashes += 1
+            if backslashes % 2 == 0:
+                break
+            end += 1
+        value = json.loads(self.buffer[self.position:end + 1])
+        self.position = end + 1
+        return value
+
+    def _read_scalar(self):
+        """Number / true / false / null, which is only complete once its terminator has arrived."""
+        end = self.position
+        while end < len(self.buffer) and self.buffer[end] not in ",}" + _WHITESPACE:
+            end += 1
+        if end >= len(self.buffer):
+            raise IncompleteArguments()
+        value = json.loads(self.buffer[self.position:end])
+        self.position = end
+        return value
+
+    def _step(self):
+        self._skip_whitespace()
+        char = self.buffer[self.position]
+
+        if self.state == "start":
+            if char != "{":
+                raise ValueError(f"expected '{{', got {char!r}")
+            self.position += 1
+            self.state = "key"
+        elif self.state == "key":
+            if char == "}" and not self.fields:
+                self.position += 1
+                self.done = True
+            elif char != '"':
+                raise ValueError(f"expected a key, got {char!r}")
+            else:
+                self.key = self._read_string()
+                self.state = "colon"
+        elif self.state == "colon":
+            if char != ":":
+                raise ValueError(f"expected ':', got {char!r}")
+            self.position += 1
+            self.state = "value"
+        elif self.state == "value":
+            if char == '"':
+                # Stray '" ' before the real opening quote; a genuine " " value is followed by , or }
+                lookahead = self.buffer[self.position:self.position + 4]
+                if len(lookahead) < 4 and '" "'.startswith(lookahead[:3]):
+                    raise IncompleteArguments()
+                if lookahead[:3] == '" "' and lookahead[3:] not in (",", "}", *_WHITESPACE):
+                    self.position += 2
+                value = self._read_string()
+            elif char in "{[":
+                raise ValueError("nested values are not supported")
+            else:
+                value = self._read_scalar()
+            self.fields[self.key] = value
+            self.state = "separator"
+            return self.key, value
+        elif self.state == "separator":
+            self.position += 1
+            if char == ",":
+                self.state = "key"
+            elif char == "}":
+                self.done = True
+            else:
+                raise ValueError(f"expected ',' or '}}', got {char!r}")
+        return None
+
+
+class FieldValidator:
+    """Validates individual fields of a pydantic model as they complete, then the whole object."""
+
+    def __init__(self, model=VisitDetails):
+        self.model = model
+        self._adapters = {name: TypeAdapter(field.annotation) for name, field in model.model_fields.items()}
+
+    def validate_field(self, name: str, value):
+        """Returns the validated value; raises pydantic.ValidationError. Unknown keys pass through (ignored later)."""
+        adapter = self._adapters.get(name)
+        return adapter.validate_python(value) if adapter else value
+
+    def validate(self, fields: dict):
+        return self.model.model_validate(fields).model_dump()
+
@@ -0,0 +1,196 @@
+# models/transcript_cache.py
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from models.cache_paths import create_private_file, private_cache_dir
+
+# --- Transcript Cache Settings (overridable via environment) ---
+TRANSCRIPT_CACHE_ENABLED = os.getenv("TRANSCRIPT_CACHE_ENABLED", "1") == "1"
+TRANSCRIPT_CACHE_MAX_ENTRIES = int(os.getenv("TRANSCRIPT_CACHE_MAX_ENTRIES", "1024"))
+# Shared by the demo, the benchmarks and the backfill of one user; unset = transcripts.sqlite3 (0600) in the
+# private per-user cache directory (models/cache_paths.py), "" keeps the cache in memory only
+TRANSCRIPT_CACHE_DB_PATH = os.getenv("TRANSCRIPT_CACHE_DB_PATH")
+TRANSCRIPT_CACHE_DB_MAX_ENTRIES = int(os.getenv("TRANSCRIPT_CACHE_DB_MAX_ENTRIES", "50000"))
+# How long a write waits for another process's lock (forked ASR workers share the file) before it is skipped
+TRANSCRIPT_CACHE_DB_TIMEOUT_SEC = float(os.getenv("TRANSCRIPT_CACHE_DB_TIMEOUT_SEC", "5"))
+
+
+def make_transcript_key(speech: np.ndarray, model_identity: str):
+    """Key = hash of the decoded 16 kHz float32 PCM + model identity and decoding settings."""
+    digest = hashlib.blake2b(model_identity.encode("utf-8"), digest_size=32)
+    digest.update(np.ascontiguousarray(speech, dtype=np.float32).tobytes())
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    """
+    Two-tier, content-addressed ASR result cache: transcript, normalized transcript, speech duration,
+    the compute seconds the transcription took and (once NER has run) the entities.
+    Tier 1 is an in-process LRU; tier 2 is an optional SQLite file with size-based LRU eviction.
+    """
+
+    def __init__(self, max_entries: int = TRANSCRIPT_CACHE_MAX_ENTRIES, db_path: str = TRANSCRIPT_CACHE_DB_PATH,
+                 db_max_entries: int = TRANSCRIPT_CACHE_DB_MAX_ENTRIES):
+        if db_path is None:
+            db_path = os.path.join(private_cache_dir(), "transcripts.sqlite3")
+        self.max_entries = max_entries
+        self.db_max_entries = db_max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "saved_sec": 0.0}
+
+        self._db = None
+        if db_path:
+            # Transcripts are customer data: the file (and the journal SQLite derives from it) stays 0600
+            self._db = sqlite3.connect(create_private_file(db_path), check_same_thread=False,
+                                       timeout=TRANSCRIPT_CACHE_DB_TIMEOUT_SEC)
+            # WAL lets the other workers read while one of them writes
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS transcript_cache ("
+                "key TEXT PRIMARY KEY, transcript TEXT NOT NULL, normalized TEXT NOT NULL, entities TEXT, "
+                "speech_duration REAL NOT NULL, compute_sec REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_transcript_cache_last_used ON transcript_cache(last_used)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_transcript_cache_normalized ON transcript_cache(normalized)")
+            self._db.commit()
+
+    def get(self, key: str):
+        """Returns (entry dict, tier) for a cached transcription, or (None, None) on a miss."""
+        with self._lock:
+            # 1. In-process LRU tier
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                self.stats["saved_sec"] += entry["compute_sec"]
+                return dict(entry), "memory"
+
+            # 2. On-disk tier (promoted into memory on hit)
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT transcript, normalized, entities, speech_duration, compute_sec "
+                        "FROM transcript_cache WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None:
+                        self._db.execute("UPDATE transcript_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+                        self._db.commit()
+                        entry = {"transcript": row[0], "normalized": row[1],
+                                 "entities": json.loads(row[2]) if row[2] is not None else None,
+                                 "speech_duration": row[3], "compute_sec": row[4]}
+                        self._remember(key, entry)
+                        self.stats["disk_hits"] += 1
+                        self.stats["saved_sec"] += entry["compute_sec"]
+                        return dict(entry), "disk"
+                except sqlite3.OperationalError as e:
+                    # Locked or unavailable cache file: a miss, never a failed transcription
+                    self._rollback()
+                    print(f" WARNING: transcript cache read failed: {e}")
+
+            self.stats["misses"] += 1
+            return None, None
+
+    def put(self, key: str, transcript: str, normalized: str, speech_duration: float, compute_sec: float,
+            entities=None):
+        """Stores a successful transcription in both tiers."""
+        entry = {"transcript": transcript, "normalized": normalized, "entities": entities,
+                 "speech_duration": speech_duration, "compute_sec": compute_sec}
+        with self._lock:
+            self._remember(key, entry)
+
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO transcript_cache "
+                        "(key, transcript, normalized, entities, speech_duration, compute_sec, last_used) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (key, transcript, normalized, json.dumps(entities) if entities is not None else None,
+                         speech_duration, compute_sec, time.time())
+                    )
+                    # Size-based eviction: least recently used beyond the limit
+                    self._db.execute(
+                        "DELETE FROM transcript_cache WHERE key IN ("
+                        "SELECT key FROM transcript_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                        (self.db_max_entries,)
+                    )
+                    self._db.commit()
+                except sqlite3.OperationalError as e:
+                    # The entry stays in the memory tier; the transcription itself is unaffected
+                    self._rollback()
+                    print(f" WARNING: transcript cache write failed: {e}")
+
+    def attach_entities(self, normalized: str, entities):
+        """Stores NER output on every cached transcription with this normalized transcript."""
+        with self._lock:
+            for entry in self._memory.values():
+                if entry["normalized"] == normalized:
+                    entry["entities"] = entities
+            if self._db is not None:
+                try:
+                    self._db.execute("UPDATE transcript_cache SET entities = ? WHERE normalized = ? AND entities IS NULL",
+                                     (json.dumps(entities), normalized))
+                    self._db.commit()
+                except sqlite3.OperationalError as e:
+                    self._rollback()
+                    print(f" WARNING: transcript cache write failed: {e}")
+
+    def _rollback(self):
+        try:
+            self._db.rollback()
+        except sqlite3.Error:
+            pass
+
+    def _remember(self, key: str, entry: dict):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def snapshot_stats(self):
+        """Hit/miss counters, hit rate and the transcription seconds hits have saved."""
+        with self._lock:
+            stats = dict(self.stats)
+        stats["hits"] = stats["memory_hits"] + stats["disk_hits"]
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM transcript_cache")
+                self._db.commit()
+
+
+_DEFAULT_CACHE = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def get_transcript_cache():
+    """Returns the process-wide TranscriptCache (None when TRANSCRIPT_CACHE_ENABLED=0), creating it on first use."""
+    global _DEFAULT_CACHE
+    if not TRANSCRIPT_CACHE_ENABLED:
+        return None
+    if _DEFAULT_CACHE is None:
+        with _DEFAULT_CACHE_LOCK:
+            if _DEFAULT_CACHE is None:
+                _DEFAULT_CACHE = TranscriptCache()
+    return _DEFAULT_CACHE
+
+
+def _reset_after_fork():
+    # A SQLite connection must not be used across fork: forked ASR workers open their own
+    global _DEFAULT_CACHE, _DEFAULT_CACHE_LOCK
+    _DEFAULT_CACHE = None
+    _DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
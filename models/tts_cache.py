@@ -0,0 +1,264 @@
+# models/tts_cache.py
+import os
+import time
+import string
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+from models.telemetry import span, record
+from models.cache_paths import private_cache_dir
+
+# --- OFFLINE TTS SETTINGS ---
+# Rendered fragments include lead names; unset = tts/ in the private per-user cache directory (0700,
+# models/cache_paths.py), "" keeps the cache in memory only
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR")
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+TTS_CACHE_MEMORY_ENTRIES = int(os.getenv("TTS_CACHE_MEMORY_ENTRIES", "256"))
+TTS_VOICE = os.getenv("TTS_VOICE", "")  # engine voice id; empty keeps the system default
+TTS_RATE = int(os.getenv("TTS_RATE", "170"))  # words per minute
+# Silence inserted between concatenated fragments so the joins land like word boundaries
+TTS_JOIN_PAUSE_SEC = 0.06
+
+# Spoken confirmation; literal text is pre-rendered once, each {slot} is rendered (and cached) per value
+CONFIRMATION_TEMPLATE = (
+    "Success! The {visit_type} visit with {lead_name} is scheduled for {date}. "
+    "Processing used the {extraction_method} path."
+)
+
+
+def fragment_key(engine_id: str, text: str):
+    """Cache key = engine/voice/rate identity + the exact fragment text."""
+    return hashlib.sha256(f"{engine_id}|{text}".encode("utf-8")).hexdigest()
+
+
+def split_template(template: str):
+    """Template -> [(literal, slot_name_or_None), ...] in speaking order."""
+    return [(literal, field) for literal, field, _, _ in string.Formatter().parse(template)]
+
+
+class OfflineSynthesizer:
+    """
+    Local text-to-speech through pyttsx3 (espeak-ng on Linux, SAPI5 on Windows, NSSpeechSynthesizer
+    on macOS): no network round trip. Returns mono int16 PCM. The driver is not thread-safe, so
+    synthesis is serialized.
+    """
+
+    def __init__(self, voice: str = TTS_VOICE, rate: int = TTS_RATE):
+        import pyttsx3
+        self._engine = pyttsx3.init()
+        if voice:
+            self._engine.setProperty("voice", voice)
+        self._engine.setProperty("rate", rate)
+        self.engine_id = f"pyttsx3|{self._engine.getProperty('voice')}|{rate}"
+        self._lock = threading.Lock()
+
+    def synthesize(self, text: str):
+        """Returns (int16 PCM, sample_rate)."""
+        import soundfile as sf
+        with self._lock:
+            fd, path = tempfile.mkstemp(suffix=".wav")
+            os.close(fd)
+            try:
+                self._engine.save_to_file(text, path)
+                self._engine.runAndWait()
+                pcm, sample_rate = sf.read(path, dtype="int16", always_2d=True)
+            finally:
+                os.remove(path)
+        return np.ascontiguousarray(pcm[:, 0]), sample_rate
+
+
+class PhraseAudioCache:
+    """
+    Two-tier cache of synthesized fragments.
+    Tier 1 is an in-process LRU; tier 2 is a directory of WAV files with size-based LRU eviction
+    (file mtime is the last-used time, so the order survives restarts).
+    """
+
+    def __init__(self, cache_dir: str = TTS_CACHE_DIR, max_bytes: int = TTS_CACHE_MAX_BYTES,
+                 memory_entries: int = TTS_CACHE_MEMORY_ENTRIES):
+        if cache_dir is None:
+            cache_dir = private_cache_dir("tts")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        # key -> (size in bytes, last used); rebuilt from the directory so eviction spans processes
+        self._disk = {}
+        if cache_dir:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+            for entry in os.scandir(cache_dir):
+                if entry.name.endswith(".wav"):
+                    stat = entry.stat()
+                    self._disk[entry.name[:-4]] = (stat.st_size, stat.st_mtime)
+        self.disk_bytes = sum(size for size, _ in self._disk.values())
+
+    def _path(self, key: str):
+        return os.path.join(self.cache_dir, key + ".wav")
+
+    def get(self, key: str):
+        """Returns ((pcm, sample_rate), tier) or (None, None) on a miss."""
+        import soundfile as sf
+        with self._lock:
+            # 1. In-process LRU tier
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return entry, "memory"
+
+            # 2. On-disk tier (promoted into memory on hit)
+            if key in self._disk:
+                try:
+                    pcm, sample_rate = sf.read(self._path(key), dtype="int16")
+                    now = time.time()
+                    os.utime(self._path(key), (now, now))
+                    self._disk[key] = (self._disk[key][0], now)
+                    entry = (pcm, sample_rate)
+                    self._remember(key, entry)
+                    self.stats["disk_hits"] += 1
+                    return entry, "disk"
+                except Exception:
+                    # Removed or truncated behind our back: treat as a miss
+                    self.disk_bytes -= self._disk.pop(key)[0]
+
+            self.stats["misses"] += 1
+            return None, None
+
+    def put(self, key: str, pcm: np.ndarray, sample_rate: int):
+        """Stores a fragment in both tiers, evicting least recently used files beyond max_bytes."""
+        import soundfile as sf
+        with self._lock:
+            self._remember(key, (pcm, sample_rate))
+            if not self.cache_dir:
+                return
+            # Write-then-rename so a concurrent reader never sees a partial file
+            tmp_path = self._path(key) + f".{os.getpid()}.tmp"
+            sf.write(tmp_path, pcm, sample_rate, format="WAV", subtype="PCM_16")
+            os.replace(tmp_path, self._path(key))
+            if key in self._disk:
+                self.disk_bytes -= self._disk[key][0]
+            size = os.path.getsize(self._path(key))
+            self._disk[key] = (size, time.time())
+            self.disk_bytes += size
+
+            if self.disk_bytes > self.max_bytes:
+                for old_key, (old_size, _) in sorted(self._disk.items(), key=lambda item: item[1][1]):
+                    if self.disk_bytes <= self.max_bytes or old_key == key:
+                        break
+                    try:
+                        os.remove(self._path(old_key))
+                    except FileNotFoundError:
+                        pass
+                    del self._disk[old_key]
+                    self.disk_bytes -= old_size
+                    self.stats["evictions"] += 1
+
+    def _remember(self, key: str, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def snapshot_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats.update(disk_entries=len(self._disk), disk_bytes=self.disk_bytes)
+        stats["hits"] = stats["memory_hits"] + stats["disk_hits"]
+        return stats
+
+    def clear(self):
+        """Empties both tiers (the cache directory itself is kept)."""
+        with self._lock:
+            self._memory.clear()
+            for key in self._disk:
+                try:
+                    os.remove(self._path(key))
+                except FileNotFoundError:
+                    pass
+            self._disk.clear()
+            self.disk_bytes = 0
+
+
+class ConfirmationSpeaker:
+    """
+    Speaks a fixed template by concatenating PCM fragments: literal text is rendered once by
+    `prerender()` and pinned in memory, slot values go through the PhraseAudioCache, so a warm
+    confirmation is a few lookups and one np.concatenate instead of a full synthesis.
+    """
+
+    def __init__(self, synthesizer, cache: PhraseAudioCache = None, template: str = CONFIRMATION_TEMPLATE,
+                 join_pause_sec: float = TTS_JOIN_PAUSE_SEC):
+        self.synthesizer = synthesizer
+        self.cache = cache if cache is not None else get_phrase_audio_cache()
+        self.template = template
+        self.join_pause_sec = join_pause_sec
+        self._segments = split_template(template)
+        self._static = {}
+
+    def _fragment(self, text: str):
+        """(pcm, sample_rate) for one fragment, from the cache or freshly synthesized."""
+        key = fragment_key(self.synthesizer.engine_id, text)
+        entry, _ = self.cache.get(key)
+        if entry is None:
+            with span("tts.synthesize", chars=len(text)):
+                entry = self.synthesizer.synthesize(text)
+            self.cache.put(key, *entry)
+        return entry
+
+    def prerender(self):
+        """Renders every literal fragment of the template once. Returns latency (float)."""
+        start_time = time.perf_counter()
+        for literal, _ in self._segments:
+            text = literal.strip()
+            if text and text not in self._static:
+                self._static[text] = self._fragment(text)
+        return time.perf_counter() - start_time
+
+    def message(self, slots: dict):
+        return self.template.format(**slots)
+
+    def render(self, slots: dict):
+        """Returns (int16 PCM, sample_rate) for the template filled with `slots`, and latency (float)."""
+        start_time = time.perf_counter()
+        with span("tts.confirmation"):
+            self.prerender()
+            pieces, sample_rate = [], None
+            for literal, field in self._segments:
+                texts = [literal.strip(), str(slots[field]).strip() if field else ""]
+                for text in texts:
+                    if not text:
+                        continue
+                    pcm, sample_rate = self._static.get(text) or self._fragment(text)
+                    if pieces:
+                        pieces.append(np.zeros(int(self.join_pause_sec * sample_rate), dtype=np.int16))
+                    pieces.append(pcm)
+            audio = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.int16)
+        latency = time.perf_counter() - start_time
+        record("tts.render", latency)
+        return (audio, sample_rate), latency
+
+    def speak_to_file(self, slots: dict, output_path: str):
+        """Renders the confirmation and writes it as a 16-bit WAV. Returns latency (float)."""
+        import soundfile as sf
+        (audio, sample_rate), latency = self.render(slots)
+        sf.write(output_path, audio, sample_rate, format="WAV", subtype="PCM_16")
+        return latency
+
+
+_DEFAULT_CACHE = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def get_phrase_audio_cache():
+    """Returns the process-wide PhraseAudioCache, creating it on first use."""
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        with _DEFAULT_CACHE_LOCK:
+            if _DEFAULT_CACHE is None:
+                _DEFAULT_CACHE = PhraseAudioCache()
+    return _DEFAULT_CACHE
@@ -8,7 +8,8 @@ import os
 sys.path.append(os.path.dirname(__file__))
 
 # Import the necessary logic and setup models
-from models.llm_fallback import extract_context_and_summarize
+from main import run_hybrid_extraction_pipeline
+from models.lead_index import LeadIndex
 from models.schema import NoteSummary, VisitDetails # Import VisitDetails for schema dependency
 from config import MERCURY_API_KEY # Ensure the key is loaded
 
@@ -20,24 +21,38 @@ MOCK_CRM_LEADS = {
     "dr. patel": {"Lead_ID": "L789", "Status": "Active", "Last_Visit_ID": "V303", "Last_Visit_Date": "2025-10-29"},
 }
 
-def mock_database_lookup(name: str):
-    """Simulates searching the CRM database for a lead name (Context Linking)."""
-    # Simple, case-insensitive lookup, stripping common titles
-    clean_name = name.lower().replace("dr.", "").replace("mr.", "").replace("ms.", "").strip()
-    return MOCK_CRM_LEADS.get(clean_name, None)
+# Fuzzy index over the lead table. Set LEAD_INDEX_PATH to a file written by
+# LeadIndex.from_file("leads.csv").save(path) to memory-map the full CRM table instead of the mock.
+LEAD_INDEX_PATH = os.getenv("LEAD_INDEX_PATH")
+_LEAD_INDEX = None
+
+def get_lead_index():
+    global _LEAD_INDEX
+    if _LEAD_INDEX is None:
+        if LEAD_INDEX_PATH:
+            _LEAD_INDEX = LeadIndex.load(LEAD_INDEX_PATH)
+        else:
+            _LEAD_INDEX = LeadIndex.build({"name": name, **record} for name, record in MOCK_CRM_LEADS.items())
+    return _LEAD_INDEX
+
+def lookup_lead(name: str):
+    """Searches the CRM leads for a name, tolerating honorifics, misspellings and transliteration variants."""
+    return get_lead_index().lookup(name)
 
 def process_voice_note_log(transcript: str):
     """
     End-to-end pipeline for voice note logging and contextual look-up.
-    This replaces the need for a full scheduling form.
+    This replaces the need for a full scheduling form: the visit details and the note summary
+    come out of one hybrid pipeline run (at most one Mercury round trip).
     """
     print(f"\n--- Processing Voice Note ---")
     print(f"Transcript: \"{transcript[:70]}...\"")
     
-    # 1. LLM Context Extraction (The memory and summarization step)
-    summary_data, llm_latency = extract_context_and_summarize(transcript)
+    # 1. LLM Context Extraction (The memory and summarization step, plus the visit to schedule)
+    metrics = run_hybrid_extraction_pipeline(transcript, summarize=True)
+    summary_data, visit_data = metrics["note"], metrics["data"]
     
-    print(f"LLM Summarization Latency: {llm_latency:.4f}s")
+    print(f"LLM Summarization Latency: {metrics['latency_sec']:.4f}s ({metrics['method']})")
 
     if not summary_data:
         print(" FAILED: Could not extract structured context from the voice note.")
@@ -45,7 +60,7 @@ def process_voice_note_log(transcript: str):
 
     # 2. Contextual Database Lookup (Linking the note to the Lead)
     extracted_name = summary_data['lead_name']
-    lead_record = mock_database_lookup(extracted_name)
+    lead_record = lookup_lead(extracted_name)
 
     if lead_record:
         print(f"\n SUCCESS: Context Found for '{extracted_name}'.")
@@ -53,6 +68,8 @@ def process_voice_note_log(transcript: str):
         print(f"  - **Log Target (Before/After):** Last Visit ID {lead_record['Last_Visit_ID']}")
         print(f"  - **Summary:** {summary_data['summary_of_note']}")
         print(f"  - **Action Required:** {summary_data['action_required']}")
+        if visit_data and visit_data.get("date", "N/A") != "N/A":
+            print(f"  - **Next Visit:** {visit_data['visit_type']} on {visit_data['date']} at {visit_data['start_time']}")
     else:
         print(f"\n WARNING: Lead '{extracted_name}' mentioned, but no matching active record found. Note may require manual entry.")
 